@@ -1,6 +1,32 @@
-from database import SessionLocal, HousingNotice, AnalysisResult
-from real_estate import get_market_price
+from database import SessionLocal, HousingNotice, AnalysisResult, NoticeUnit
+from real_estate import get_market_stats, get_market_stats_bulk, aggregate_bucket
+from sqlalchemy import update, bindparam
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import os
 import math
+import hashlib
+import numpy as np
+
+MANWON = 10000 # market data is published in 만원, notices are in 원
+DEFAULT_AREA = 25.0 # m2, when the notice has no parsed area
+# Part of every input fingerprint: bump it when the scoring logic changes
+# so the next incremental run re-scores everything.
+ANALYSIS_VERSION = 2
+# Annual 전월세 전환율 used to turn a deposit into a monthly cost (e.g. 0.045 = 4.5%)
+JEONSE_CONVERSION_RATE = float(os.getenv("JEONSE_CONVERSION_RATE", "0.045"))
+
+def effective_monthly_cost(deposit, rent, rate=None):
+    """
+    Converts (deposit, monthly rent) in 원 into one effective monthly cost:
+    rent + deposit * annual conversion rate / 12.
+    Works on plain numbers and on NumPy arrays.
+    """
+    rate = JEONSE_CONVERSION_RATE if rate is None else rate
+    return rent + deposit * rate / 12
+
+def market_monthly_cost(median_deposit, median_rent):
+    # market_prices amounts are in 만원
+    return effective_monthly_cost(float(median_deposit or 0) * MANWON, float(median_rent or 0) * MANWON)
 
 def calculate_score(market_price, notice_price):
     """
@@ -38,50 +64,252 @@ def calculate_score(market_price, notice_price):
     
     return round(final_score, 2), diff_percent
 
-def analyze_notice(notice, target_area=25.0):
+def _round_like_python(values, ndigits):
+    """
+    np.round() rounds the scaled binary value, which can disagree with Python's
+    correctly rounded round() on values that sit right at a .5 tie; those few
+    elements are redone with round() so both paths agree exactly.
+    """
+    rounded = np.round(values, ndigits)
+    scaled = values * 10 ** ndigits
+    frac = np.abs(scaled - np.trunc(scaled))
+    ties = np.abs(frac - 0.5) <= 1e-7 * np.maximum(1.0, np.abs(scaled))
+    for i in np.flatnonzero(ties):
+        rounded.flat[i] = round(float(values.flat[i]), ndigits)
+    return rounded
+
+def calculate_scores(market_prices, notice_prices):
+    """
+    Vectorized calculate_score over arrays of (finite) prices.
+    Returns (scores, diffs) float arrays with the same clamping, rounding and
+    special cases (market <= 0 -> 2.50 / 0.00, notice <= 0 -> 4.50 / 100.00).
+    """
+    market, notice = np.broadcast_arrays(
+        np.asarray(market_prices, dtype=np.float64), np.asarray(notice_prices, dtype=np.float64)
+    )
+    no_market = market <= 0
+    free = ~no_market & (notice <= 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        diffs = _round_like_python(((market - notice) / market) * 100, 2)
+    scores = _round_like_python(np.clip(2.5 + (diffs / 20.0), 1.0, 5.0), 2)
+
+    scores[no_market], diffs[no_market] = 2.50, 0.00
+    scores[free], diffs[free] = 4.50, 100.00
+    return scores, diffs
+
+def parse_legal_dong(address):
+    # "서울시 강남구 삼성동 123" -> "삼성동"
     try:
-        legal_dong = notice.address.split(" ")[2]
-    except:
-        legal_dong = ""
+        return address.split(" ")[2]
+    except (AttributeError, IndexError):
+        return ""
+
+def analyze_notice(notice, target_area=25.0):
+    legal_dong = parse_legal_dong(notice.address)
         
-    market_data = get_market_price(legal_dong, target_area)
+    # One precomputed market_prices row; the median is robust to outlier deals
+    market_data = get_market_stats(legal_dong, target_area)
     
-    # Compare Rents (Monthly) for simplicity in this prototype
-    market_rent = float(market_data['avg_rent'])
-    notice_rent = float(notice.rent)
+    # Compare effective monthly costs (deposit converted at JEONSE_CONVERSION_RATE)
+    market_cost = (
+        market_monthly_cost(market_data['median_deposit'], market_data['median_rent'])
+        if market_data else 0.0
+    )
+    notice_cost = effective_monthly_cost(float(notice.deposit or 0), float(notice.rent or 0))
     
-    score, diff = calculate_score(market_rent, notice_rent)
+    score, diff = calculate_score(market_cost, notice_cost)
     return score, diff
 
-def run_analysis_job():
+def input_fingerprint(notice, units=(), unit_markets=()):
+    raw = (
+        f"{ANALYSIS_VERSION}|{JEONSE_CONVERSION_RATE}|"
+        f"{notice.rent}|{notice.deposit}|{notice.area}|{notice.address}"
+    )
+    # Units are scored against their own market rows, so those versions are inputs too
+    for unit, market_row in zip(units, unit_markets):
+        market = (market_row.id, market_row.version) if market_row else None
+        raw += f"|{unit.unit_type},{unit.rent},{unit.deposit},{unit.area},{market}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def upsert_results(db, rows):
+    """Bulk INSERT ... ON CONFLICT(notice_id) DO UPDATE of analysis rows (one compiled statement, executemany)."""
+    if not rows:
+        return
+    stmt = sqlite_insert(AnalysisResult)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["notice_id"],
+        set_={
+            "market_price_id": stmt.excluded.market_price_id,
+            "score": stmt.excluded.score,
+            "price_diff_percent": stmt.excluded.price_diff_percent,
+            "summary": stmt.excluded.summary,
+            "input_fingerprint": stmt.excluded.input_fingerprint,
+            "market_version": stmt.excluded.market_version,
+            "market_monthly_cost": stmt.excluded.market_monthly_cost,
+        },
+    )
+    db.connection().execute(stmt, rows)
+
+def update_notice_costs(db, costs):
+    """Writes precomputed HousingNotice.effective_monthly_cost values ({notice_id: cost}) in one executemany."""
+    if not costs:
+        return
+    stmt = (
+        update(HousingNotice.__table__)
+        .where(HousingNotice.__table__.c.id == bindparam("notice_id"))
+        .values(effective_monthly_cost=bindparam("cost"))
+    )
+    db.connection().execute(stmt, [{"notice_id": k, "cost": v} for k, v in costs.items()])
+
+def update_unit_scores(db, rows):
+    """Writes per-unit costs and scores (dicts keyed by unit_id) in one executemany."""
+    if not rows:
+        return
+    table = NoticeUnit.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("unit_id"))
+        .values(
+            effective_monthly_cost=bindparam("cost"),
+            market_monthly_cost=bindparam("market_cost"),
+            price_diff_percent=bindparam("diff"),
+            score=bindparam("unit_score"),
+        )
+    )
+    db.connection().execute(stmt, rows)
+
+def run_analysis_job(full=False):
+    """
+    Scores notices against the market aggregates.
+    Notices with rent table rows (notice_units) are scored per unit, each against the
+    market for its own area; the notice's result is its best unit. Others are scored
+    on the notice's own deposit / rent / area.
+    By default only notices whose inputs (rent, deposit, area, address, units) or market
+    aggregate versions changed since their last result are re-scored; full=True
+    recomputes everything.
+    """
     db = SessionLocal()
-    notices = db.query(HousingNotice).all() 
-    
-    print("Starting Strict Analysis Job...")
-    
+    print(f"Starting Strict Analysis Job ({'full' if full else 'incremental'})...")
+
+    # Only the columns scoring needs, as plain tuples
+    notices = db.query(
+        HousingNotice.id, HousingNotice.address, HousingNotice.rent,
+        HousingNotice.deposit, HousingNotice.area
+    ).all()
+    units = {}
+    for unit in db.query(
+        NoticeUnit.id, NoticeUnit.notice_id, NoticeUnit.unit_type,
+        NoticeUnit.rent, NoticeUnit.deposit, NoticeUnit.area, NoticeUnit.score
+    ).order_by(NoticeUnit.id):
+        units.setdefault(unit.notice_id, []).append(unit)
+    # All existing results in one query instead of one SELECT per notice
+    existing = {
+        r.notice_id: (r.input_fingerprint, r.market_price_id, r.market_version)
+        for r in db.query(
+            AnalysisResult.notice_id, AnalysisResult.input_fingerprint,
+            AnalysisResult.market_price_id, AnalysisResult.market_version
+        )
+    }
+
+    # Resolve every distinct (dong, area bucket) once
+    keys = {}
     for notice in notices:
-        # Check if already analyzed? (Skip for now to force update)
-        # existing = db.query(AnalysisResult).filter(AnalysisResult.notice_id == notice.id).first()
-        
-        # Pass default area or parsed area if available (Currently DB doesn't have area column, use safe default)
-        # TODO: Add area column to HousingNotice
-        score, diff = analyze_notice(notice, target_area=25.0)
-        
-        # Upsert logic
-        existing = db.query(AnalysisResult).filter(AnalysisResult.notice_id == notice.id).first()
-        if existing:
-            existing.score = score
-            existing.price_diff_percent = diff
-            existing.summary = f"Strict analysis: {diff}% cheaper"
+        dong = parse_legal_dong(notice.address)
+        keys[notice.id] = [
+            (dong, aggregate_bucket(entry.area or notice.area or DEFAULT_AREA))
+            for entry in units.get(notice.id) or [notice]
+        ]
+    market = get_market_stats_bulk({key for entry_keys in keys.values() for key in entry_keys}, db)
+
+    rows = []
+    entries = [] # (row index, unit id or None, market row) per scored deposit / rent pair
+    market_deposits, market_rents = [], []
+    entry_deposits, entry_rents = [], []
+    notice_deposits, notice_rents = [], []
+    skipped = 0
+    for notice in notices:
+        notice_units = units.get(notice.id, [])
+        market_rows = [market.get(key) for key in keys[notice.id]]
+        if notice_units:
+            fingerprint = input_fingerprint(notice, notice_units, market_rows)
+            current = fingerprint # Market versions are part of the fingerprint
+            stored = existing.get(notice.id, (None,))[0]
         else:
-            result = AnalysisResult(
-                notice_id=notice.id,
-                score=score,
-                summary=f"Strict analysis: {diff}% cheaper",
-                price_diff_percent=diff
-            )
-            db.add(result)
-    
+            market_row = market_rows[0]
+            fingerprint = input_fingerprint(notice)
+            current = (fingerprint, market_row.id if market_row else None, market_row.version if market_row else 0)
+            stored = existing.get(notice.id)
+
+        # Units rewritten since the last run have no score yet, whatever the fingerprint says
+        unscored = any(unit.score is None for unit in notice_units)
+        if not full and not unscored and stored == current:
+            skipped += 1
+            continue
+
+        for entry, market_row in zip(notice_units or [notice], market_rows):
+            entries.append((len(rows), entry.id if notice_units else None, market_row))
+            market_deposits.append(float(market_row.median_deposit or 0) * MANWON if market_row else 0.0)
+            market_rents.append(float(market_row.median_rent or 0) * MANWON if market_row else 0.0)
+            entry_deposits.append(float(entry.deposit or 0))
+            entry_rents.append(float(entry.rent or 0))
+        notice_deposits.append(float(notice.deposit or 0))
+        notice_rents.append(float(notice.rent or 0))
+        rows.append({
+            "notice_id": notice.id,
+            "input_fingerprint": fingerprint,
+            "units": len(notice_units),
+        })
+
+    # Deposit + rent -> one effective monthly cost on both sides, then score the whole batch at once
+    market_costs = effective_monthly_cost(np.array(market_deposits), np.array(market_rents))
+    entry_costs = effective_monthly_cost(np.array(entry_deposits), np.array(entry_rents))
+    notice_costs = effective_monthly_cost(np.array(notice_deposits), np.array(notice_rents))
+    scores, diffs = calculate_scores(market_costs, entry_costs)
+
+    unit_rows = []
+    best = {}
+    for (index, unit_id, market_row), market_cost, cost, score, diff in zip(
+        entries, market_costs.tolist(), entry_costs.tolist(), scores.tolist(), diffs.tolist()
+    ):
+        if unit_id is not None:
+            unit_rows.append({
+                "unit_id": unit_id, "cost": round(cost), "market_cost": round(market_cost),
+                "diff": diff, "unit_score": score,
+            })
+        if index not in best or score > best[index][0]:
+            best[index] = (score, diff, market_cost, market_row)
+
+    for index, row in enumerate(rows):
+        score, diff, market_cost, market_row = best[index]
+        row["market_price_id"] = market_row.id if market_row else None
+        row["market_version"] = market_row.version if market_row else 0
+        row["market_monthly_cost"] = round(market_cost)
+        row["score"] = score
+        row["price_diff_percent"] = diff
+        row["summary"] = f"Strict analysis: {diff}% cheaper"
+        if row.pop("units") > 1:
+            row["summary"] += " (best unit type)"
+
+    update_notice_costs(db, {
+        row["notice_id"]: round(cost) for row, cost in zip(rows, notice_costs.tolist())
+    })
+    update_unit_scores(db, unit_rows)
+    upsert_results(db, rows)
     db.commit()
     db.close()
-    print("Strict Analysis Completed.")
+
+    updated = sum(1 for r in rows if r["notice_id"] in existing)
+    print(f"Strict Analysis Completed. {len(rows) - updated} new, {updated} updated, {skipped} unchanged.")
+    return len(rows)
+
+if __name__ == "__main__":
+    import argparse
+    from database import init_db
+
+    arg_parser = argparse.ArgumentParser(description="Score notices against market prices")
+    arg_parser.add_argument("--full", action="store_true", help="Re-score every notice, even unchanged ones")
+    args = arg_parser.parse_args()
+
+    init_db()
+    run_analysis_job(full=args.full)
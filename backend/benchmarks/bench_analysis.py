@@ -0,0 +1,89 @@
+"""
+Benchmark: analyzer.run_analysis_job before/after batching.
+
+"before" replays the original per-notice loop (one market lookup, one
+AnalysisResult SELECT and one ORM add per notice); "after" is the batched job
+with full=True, which also re-scores every notice. "incremental" is the default
+daily run over the same unchanged notices, which skips them all.
+All run against a throwaway SQLite file filled with synthetic notices.
+
+    python benchmarks/bench_analysis.py --sizes 10000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from database import Base, SessionLocal, HousingNotice, AnalysisResult, MarketPrice
+import analyzer
+from real_estate import ALL_TYPES
+
+DONGS = [f"테스트{i}동" for i in range(400)]
+
+def seed(n):
+    db = SessionLocal()
+    db.bulk_insert_mappings(MarketPrice, [
+        {"legal_name": dong, "building_type": ALL_TYPES, "area_bucket": bucket, "count": 10,
+         "avg_rent": 80, "median_rent": 75, "avg_deposit": 5000, "median_deposit": 4500, "version": 1}
+        for dong in DONGS for bucket in range(1, 9)
+    ])
+    rnd = random.Random(42)
+    db.bulk_insert_mappings(HousingNotice, [
+        {"title": f"공고 {i}", "platform": "SH", "link": f"https://example.com/{i}",
+         "address": f"서울시 테스트구 {rnd.choice(DONGS)} {i}", "rent": rnd.randint(100000, 900000),
+         "deposit": rnd.randint(1000, 9000) * 10000, "area": rnd.uniform(15, 85)}
+        for i in range(n)
+    ])
+    db.commit()
+    db.close()
+
+def legacy_analysis_job():
+    db = SessionLocal()
+    for notice in db.query(HousingNotice).all():
+        score, diff = analyzer.analyze_notice(notice, target_area=25.0)
+        existing = db.query(AnalysisResult).filter(AnalysisResult.notice_id == notice.id).first()
+        if existing:
+            existing.score = score
+            existing.price_diff_percent = diff
+            existing.summary = f"Strict analysis: {diff}% cheaper"
+        else:
+            db.add(AnalysisResult(
+                notice_id=notice.id, score=score,
+                summary=f"Strict analysis: {diff}% cheaper", price_diff_percent=diff
+            ))
+    db.commit()
+    db.close()
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = arg_parser.parse_args()
+
+    print(f"{'notices':>8} {'before (s)':>11} {'after (s)':>10} {'speedup':>8} {'incremental (s)':>16}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            Base.metadata.create_all(bind=engine)
+            SessionLocal.configure(bind=engine)
+            seed(n)
+
+            # First pass inserts, so the timed runs below exercise the update path
+            analyzer.run_analysis_job()
+            before = timed(legacy_analysis_job)
+            after = timed(lambda: analyzer.run_analysis_job(full=True))
+            incremental = timed(analyzer.run_analysis_job)
+            engine.dispose()
+        print(f"{n:>8} {before:>11.2f} {after:>10.2f} {before / after:>7.1f}x {incremental:>16.2f}")
+
+if __name__ == "__main__":
+    main()
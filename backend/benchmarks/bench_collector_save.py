@@ -0,0 +1,88 @@
+"""
+Benchmark: saving scraped items, per-item title lookup vs bulk upsert.
+
+"before" replays the original collector loop (one SELECT ... WHERE title = ?
+and one ORM add per item); "after" is notice_store.upsert_notices. Geocoding is
+disabled in both so only the database work is measured. Each variant saves the
+batch twice: the first pass inserts, the second finds every item already stored.
+
+    python benchmarks/bench_collector_save.py --items 50000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from database import Base, SessionLocal, HousingNotice
+from notice_store import upsert_notices
+
+def synthetic_items(n):
+    return [{
+        "title": f"[서울] 매입임대주택 입주자 모집 {i}",
+        "date": "2026-02-01",
+        "link": f"https://www.i-sh.co.kr/main/view.do?seq={i}",
+        "start_date": datetime(2026, 2, 1),
+        "end_date": datetime(2026, 2, 15),
+        "platform": "SH",
+        "region": "Gangnam-gu",
+        "address": "서울시 Gangnam-gu청",
+        "area": 29.0,
+        "deposit": 10000000 + i,
+        "rent": 150000,
+        "qualifications": "무주택, 청년",
+        "income": "소득",
+        "assets": "N/A",
+    } for i in range(n)]
+
+def legacy_save(items):
+    db = SessionLocal()
+    for item in items:
+        exists = db.query(HousingNotice).filter(HousingNotice.title == item['title']).first()
+        if not exists:
+            db.add(HousingNotice(
+                title=item['title'], platform=item['platform'],
+                notice_date=datetime.strptime(item['date'], "%Y-%m-%d"), link=item['link'],
+                start_date=item['start_date'], end_date=item['end_date'], region=item['region'],
+                address=item['address'], deposit=item['deposit'], rent=item['rent'], area=item['area'],
+                lat=0.0, lng=0.0, summary_qualifications=item['qualifications'],
+                summary_income=item['income'], summary_assets=item['assets'],
+            ))
+    db.commit()
+    db.close()
+
+def bulk_save(items):
+    db = SessionLocal()
+    upsert_notices(db, items, geocode=None)
+    db.close()
+
+def measure(save, items):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        SessionLocal.configure(bind=engine)
+        timings = []
+        for _ in range(2):
+            started = time.perf_counter()
+            save(items)
+            timings.append(time.perf_counter() - started)
+        engine.dispose()
+    return timings
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--items", type=int, default=50000)
+    args = arg_parser.parse_args()
+
+    items = synthetic_items(args.items)
+    print(f"{args.items} items      first run (s)  repeat run (s)")
+    for name, save in (("before", legacy_save), ("after", bulk_save)):
+        first, repeat = measure(save, items)
+        print(f"{name:<16} {first:>13.2f} {repeat:>15.2f}")
+
+if __name__ == "__main__":
+    main()
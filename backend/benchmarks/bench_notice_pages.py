@@ -0,0 +1,80 @@
+"""
+Benchmark: GET /notices page latency by depth, OFFSET vs keyset cursor.
+
+"before" is the old endpoint's query with the latest-first order added:
+ORDER BY notice_date DESC, id DESC OFFSET n LIMIT 20. SQLite steps over all n
+skipped rows. "after" is notice_query.list_notices given the cursor of the notice
+just before that page, so it seeks straight to it in ix_housing_notices_notice_date.
+
+    python benchmarks/bench_notice_pages.py --notices 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker
+from database import HousingNotice, make_engine, migrate
+from notice_query import list_notices, encode_cursor
+
+PAGE = 20
+
+def rows(n):
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+    for i in range(n):
+        yield {
+            "title": f"[서울] 매입임대주택 입주자 모집 {i}",
+            "platform": rng.choice(["SH", "LH"]),
+            "region": rng.choice(["강남구", "마포구", "송파구", "노원구"]),
+            "notice_date": start + timedelta(days=rng.randrange(900)),
+            "end_date": start + timedelta(days=rng.randrange(900)),
+        }
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--notices", type=int, default=100000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        migrate(engine)
+        db = sessionmaker(bind=engine)()
+        db.execute(HousingNotice.__table__.insert(), list(rows(args.notices)))
+        db.commit()
+
+        order = db.query(HousingNotice.notice_date, HousingNotice.id).order_by(
+            HousingNotice.notice_date.desc(), HousingNotice.id.desc()
+        ).all()
+
+        def offset_page(skip):
+            return db.query(HousingNotice).order_by(
+                HousingNotice.notice_date.desc(), HousingNotice.id.desc()
+            ).offset(skip).limit(PAGE).all()
+
+        print(f"{'page depth':>12}{'offset ms':>12}{'cursor ms':>12}")
+        for depth in (0, 1000, 10000, 50000, args.notices - PAGE):
+            cursor = encode_cursor("latest", *order[depth - 1]) if depth else None
+            assert [n.id for n in offset_page(depth)] == [n["id"] for n in list_notices(db, cursor=cursor, limit=PAGE)[0]]
+            before = timed(lambda: offset_page(depth), args.repeat)
+            after = timed(lambda: list_notices(db, cursor=cursor, limit=PAGE), args.repeat)
+            print(f"{depth:>12}{before:>12.2f}{after:>12.2f}")
+        db.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
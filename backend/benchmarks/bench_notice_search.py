@@ -0,0 +1,85 @@
+"""
+Benchmark: notice search, substring scan vs the notice_search FTS5 index.
+
+"before" is what the dashboards do in the browser, done in SQL: every notice's
+title, address, region and summaries tested with LIKE '%term%', all matches
+returned. "after" is notice_search.search_notices: trigram MATCH, bm25 ranked,
+first 20. Ranking still scores every match, so common terms cost more than rare ones.
+
+    python benchmarks/bench_notice_search.py --notices 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from database import HousingNotice, SEARCH_COLUMNS, make_engine, migrate
+from notice_search import search_notices, like_pattern
+
+DISTRICTS = ["강남구", "마포구", "송파구", "노원구", "관악구", "은평구", "강서구", "성북구"]
+DONGS = ["삼성동", "상암동", "문정동", "중계동", "봉천동", "불광동", "화곡동", "정릉동"]
+KINDS = ["매입임대주택", "행복주택", "장기전세", "국민임대", "청년안심주택", "공공전세"]
+GROUPS = ["청년", "신혼부부", "고령자", "대학생", "다자녀"]
+QUERIES = ["상암동", "행복주택 마포구", "청년안심주택 송파구 문정동", "신혼부부 장기전세", "존재하지않는동"]
+
+def rows(n):
+    rng = random.Random(0)
+    for i in range(n):
+        d = rng.randrange(len(DISTRICTS))
+        yield {
+            "title": f"[서울] {DISTRICTS[d]} {rng.choice(KINDS)} 입주자 모집 {i}",
+            "region": DISTRICTS[d],
+            "address": f"서울특별시 {DISTRICTS[d]} {DONGS[d]} {rng.randrange(1, 999)}",
+            "summary_qualifications": f"{rng.choice(GROUPS)}, 무주택 세대구성원",
+            "summary_income": "도시근로자 월평균소득 100% 이하",
+            "summary_assets": "총자산 3억 4,500만원 이하",
+        }
+
+def like_scan(db, q):
+    clauses, params = [], {}
+    for n, term in enumerate(q.split()):
+        params[f"t{n}"] = like_pattern(term)
+        clauses.append("(" + " OR ".join(f"{c} LIKE :t{n} ESCAPE '\\'" for c in SEARCH_COLUMNS) + ")")
+    sql = f"SELECT * FROM housing_notices WHERE {' AND '.join(clauses)}"
+    return db.query(HousingNotice).from_statement(text(sql).bindparams(**params)).all()
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--notices", type=int, default=100000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        migrate(engine)
+        Session = sessionmaker(bind=engine)
+        db = Session()
+        started = time.perf_counter()
+        db.execute(HousingNotice.__table__.insert(), list(rows(args.notices)))
+        db.commit()
+        print(f"Inserted {args.notices} notices (FTS triggers included) in {time.perf_counter() - started:.1f}s")
+
+        print(f"{'query':<30}{'scan ms':>10}{'matches':>9}{'fts ms':>10}")
+        for q in QUERIES:
+            scan_ms, scanned = timed(lambda: like_scan(db, q), args.repeat)
+            fts_ms, found = timed(lambda: search_notices(db, q), args.repeat)
+            print(f"{q:<30}{scan_ms:>10.2f}{len(scanned):>9}{fts_ms:>10.2f}")
+        db.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
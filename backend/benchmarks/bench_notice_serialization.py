@@ -0,0 +1,105 @@
+"""
+Benchmark: building a GET /notices response body, ORM + jsonable_encoder vs tuples + orjson.
+
+"before" is what the old endpoint did: load HousingNotice objects and let FastAPI
+run them through jsonable_encoder and json.dumps. "pydantic" validates the same
+objects into NoticeOut and dumps them (FastAPI's response_model path). "after" is
+notice_query.list_notices (selected columns as tuples) encoded by orjson, with all
+fields and with the list-view projection (fields=LIST_FIELDS, no summary texts).
+
+    python benchmarks/bench_notice_serialization.py --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy.orm import sessionmaker
+from database import HousingNotice, AnalysisResult, make_engine, migrate
+from notice_query import list_notices, parse_fields
+from schemas import NoticeOut
+
+LIST_FIELDS = "title,platform,region,end_date,deposit,rent,area,lat,lng,score"
+
+def rows(n):
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+    for i in range(1, n + 1):
+        yield {
+            "id": i,
+            "title": f"[서울] 청년 매입임대주택 입주자 모집 공고 {i}",
+            "platform": rng.choice(["SH", "LH"]),
+            "link": f"https://www.i-sh.co.kr/main/lay2/program/S1T294C297/www/brd/m_247/view.do?seq={i}",
+            "dedup_key": f"SH:https://www.i-sh.co.kr/view.do?seq={i}",
+            "notice_date": start + timedelta(days=rng.randrange(900)),
+            "start_date": start + timedelta(days=rng.randrange(900)),
+            "end_date": start + timedelta(days=rng.randrange(900)),
+            "region": rng.choice(["강남구", "마포구", "송파구", "노원구"]),
+            "address": "서울특별시 강남구 삼성동 100-1",
+            "deposit": 10000000 + i, "rent": 150000, "area": 29.5, "effective_monthly_cost": 190000,
+            "lat": 37.5 + rng.random() / 10, "lng": 127.0 + rng.random() / 10,
+            "summary_qualifications": "무주택 세대구성원, 만 19세 이상 39세 이하 청년 또는 대학생 " * 4,
+            "summary_income": "전년도 도시근로자 가구원수별 가구당 월평균소득 100% 이하 " * 3,
+            "summary_assets": "총자산 3억 4,500만원 이하, 자동차 3,708만원 이하 " * 3,
+        }
+
+def timed(fn, repeat):
+    best, body = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, len(body)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    adapter = TypeAdapter(List[NoticeOut])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        migrate(engine)
+        db = sessionmaker(bind=engine)()
+        db.execute(HousingNotice.__table__.insert(), list(rows(max(args.sizes))))
+        db.execute(AnalysisResult.__table__.insert(), [
+            {"notice_id": i, "score": float(i % 5 + 1)} for i in range(1, max(args.sizes) + 1)
+        ])
+        db.commit()
+
+        def orm(n):
+            objects = db.query(HousingNotice).order_by(
+                HousingNotice.notice_date.desc(), HousingNotice.id.desc()
+            ).limit(n).all()
+            db.expunge_all()
+            return objects
+
+        variants = [
+            ("before: ORM + jsonable_encoder", lambda n: json.dumps(
+                jsonable_encoder(orm(n)), ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")),
+            ("pydantic: ORM -> NoticeOut", lambda n: adapter.dump_json(adapter.validate_python(orm(n), from_attributes=True))),
+            ("after: tuples + orjson", lambda n: orjson.dumps(list_notices(db, limit=n)[0])),
+            ("after: fields=list view", lambda n: orjson.dumps(list_notices(db, limit=n, fields=parse_fields(LIST_FIELDS))[0])),
+        ]
+        print(f"{'variant':<34}{'rows':>8}{'ms':>10}{'KiB':>10}")
+        for n in args.sizes:
+            for name, build in variants:
+                ms, size = timed(lambda: build(n), args.repeat)
+                print(f"{name:<34}{n:>8}{ms:>10.1f}{size / 1024:>10.0f}")
+        db.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: PDF text extraction and parsing over a generated corpus.
+
+"before" is the original parse_pdf (page texts joined with +=) followed by
+RegexParser.parse on the joined text; the other rows use iter_pdf_pages with
+RegexParser.parse_stream, sequentially, with page ranges split over a process
+pool, and with whole PDFs spread over a process pool (parse_pdfs).
+
+The corpus is written by hand as plain PDF 1.4 (Helvetica, ASCII text), so no
+PDF library beyond pdfplumber is needed.
+
+    python benchmarks/bench_pdf_parse.py --pdfs 8 --pages 60 --workers 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdfplumber
+from file_parser import RegexParser, iter_pdf_pages, parse_pdfs
+
+def page_lines(doc, page):
+    lines = [f"Notice {doc} - page {page + 1}"]
+    for i in range(40):
+        lines.append(
+            f"Unit {i}: period 2026-02-{i % 28 + 1:02d} ~ 2026.03.{i % 28 + 1:02d}, "
+            f"deposit {1000 + i * 10:,}0000, rent {150000 + i * 1000:,}, area {20 + i % 40}m2"
+        )
+    return lines
+
+def write_pdf(path, pages):
+    """Minimal PDF: one Helvetica text stream per page. `pages` is a list of line lists."""
+    def escape(line):
+        return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None, # Pages, filled in once the kids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for lines in pages:
+        body = "BT /F1 9 Tf 11 TL 40 800 Td " + " ".join(f"({escape(l)}) Tj T*" for l in lines) + " ET"
+        body = body.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(body), body))
+        content = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+def parse_pdf_before(file_path):
+    # Original implementation
+    full_text = ""
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text()
+            if text:
+                full_text += text + "\n"
+    return full_text
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pdfs", type=int, default=8)
+    ap.add_argument("--pages", type=int, default=60)
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    args = ap.parse_args()
+
+    parser = RegexParser()
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for doc in range(args.pdfs):
+            path = os.path.join(tmp, f"notice_{doc}.pdf")
+            write_pdf(path, [page_lines(doc, p) for p in range(args.pages)])
+            paths.append(path)
+
+        rows = []
+        before, elapsed = timed(lambda: [parser.parse(parse_pdf_before(p)) for p in paths])
+        rows.append(("before: += join, parse", elapsed))
+
+        after, elapsed = timed(lambda: [parser.parse_stream(iter_pdf_pages(p)) for p in paths])
+        rows.append(("stream, sequential", elapsed))
+
+        paged, elapsed = timed(lambda: [
+            parser.parse_stream(iter_pdf_pages(p, workers=args.workers)) for p in paths
+        ])
+        rows.append((f"stream, page ranges x{args.workers}", elapsed))
+
+        _, elapsed = timed(lambda: [parser.parse(text) for _, text in parse_pdfs(paths, workers=args.workers)])
+        rows.append((f"parse_pdfs x{args.workers}", elapsed))
+
+        for a, b, c in zip(before, after, paged):
+            assert a["dates"] == b["dates"] == c["dates"]
+            assert a["amounts"] == b["amounts"] == c["amounts"]
+
+    print(f"{args.pdfs} PDFs x {args.pages} pages")
+    print(f"{'variant':<32}{'seconds':>10}{'speedup':>10}")
+    for name, elapsed in rows:
+        print(f"{name:<32}{elapsed:>10.2f}{rows[0][1] / elapsed:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
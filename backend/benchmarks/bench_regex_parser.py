@@ -0,0 +1,191 @@
+"""
+Micro-benchmark: RegexParser.parse, single-pass tokenizer vs the previous class.
+
+LegacyRegexParser is the parser as it was before tokenize(): one findall per
+pattern, one `in` test per keyword and one regex per asset keyword. Both parse
+the same synthetic notices (the sample from tests/test_parser.py repeated, and a
+prose-heavy variant) and must return identical results.
+
+    python benchmarks/bench_regex_parser.py --pages 50
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_parser import RegexParser
+
+class LegacyRegexParser:
+    def __init__(self):
+        self.date_pattern = re.compile(r'(\d{2,4}[\.\-/]\d{1,2}[\.\-/]\d{1,2})')
+
+        self.money_pattern = re.compile(r'([\d,]+)\s*(억원|만원|천원|억|만|천|원)?')
+
+        self.area_pattern = re.compile(r'(\d+(?:\.\d+)?)\s*(?:m2|㎡|평)')
+
+        self.qual_keywords = ["무주택", "세대구성원", "청년", "신혼부부", "한부모", "고령자"]
+        self.income_keywords = ["소득", "중위소득", "월평균"]
+
+    def normalize_text(self, text):
+        if not text: return ""
+        text = re.sub(r'\s+', ' ', text)
+        return text.strip()
+
+    def extract_dates(self, text):
+        matches = self.date_pattern.findall(text)
+        cleaned_dates = []
+        for d in matches:
+            d = d.replace('.', '-').replace('/', '-')
+            parts = d.split('-')
+            if len(parts[0]) == 2:
+                parts[0] = "20" + parts[0]
+            cleaned_dates.append("-".join(parts))
+        return cleaned_dates
+
+    def extract_amounts(self, text):
+        pattern = re.compile(r'([\d,]+)\s*(억원|만원|천원|억|만|천|원)?')
+        matches = pattern.findall(text)
+
+        results = []
+
+        for val_str, unit in matches:
+            raw_val = val_str.replace(',', '')
+            if not raw_val.isdigit(): continue
+            numeric = float(raw_val)
+
+            value = 0
+            if unit.startswith('억'):
+                value = numeric * 100000000
+            elif unit.startswith('만'):
+                value = numeric * 10000
+            elif unit.startswith('천'):
+                value = numeric * 1000
+            elif unit == '원':
+                value = numeric
+            elif not unit and numeric >= 100000:
+                value = numeric
+
+            if value > 0:
+                results.append((f"{val_str}{unit}", value))
+
+        return results
+
+    def find_areas(self, text):
+        matches = self.area_pattern.findall(text)
+        areas = []
+        for a in matches:
+             try:
+                 val = float(a)
+                 if 10 <= val <= 200:
+                     areas.append(val)
+             except:
+                 continue
+        return areas
+
+    def extract_area(self, text):
+        areas = self.find_areas(text)
+        return areas if areas else [25.0]
+
+    def extract_keywords(self, text):
+        found = {
+            "qualifications": [],
+            "income": [],
+            "assets": []
+        }
+
+        for kw in self.qual_keywords:
+            if kw in text:
+                found["qualifications"].append(kw)
+        for kw in self.income_keywords:
+            if kw in text:
+                found["income"].append(kw)
+
+        lines = text.splitlines() # If text has newlines
+        if len(lines) < 2: 
+            pass
+
+        assets_keywords = ["자산", "자동차", "부동산", "가액"]
+
+        asset_matches = []
+        for kw in assets_keywords:
+            if kw in text:
+                pattern = re.compile(rf"{kw}[^0-9\n]*([\d,]+(?:억|천?만|원)?)")
+                matches = pattern.findall(text)
+                for m in matches:
+                     asset_matches.append(f"{kw}: {m}")
+
+        if asset_matches:
+            found["assets"] = list(set(asset_matches)) # Dedup
+
+        return found
+
+    def parse(self, text):
+        text = self.normalize_text(text)
+        return {
+            "dates": self.extract_dates(text),
+            "amounts": self.extract_amounts(text),
+            "areas": self.extract_area(text),
+            "keywords": self.extract_keywords(text)
+        }
+
+NOTICE_PAGE = """
+[공고] 2026년 청년 매입임대주택 입주자 모집 공고
+공고일: 2026-02-01
+신청기간: 2026.02.10 ~ 2026.02.15
+1. 신청자격
+- 무주택 세대구성원으로서 만 19세 이상 39세 이하인 청년
+- 월평균 소득 100% 이하 (1인 가구 기준 3,500,000원), 도시근로자 중위소득 참고
+- 총자산가액 3억 4,500만원 이하, 자동차 3,708만원 이하, 부동산 2억 1,550만원 이하
+2. 임대조건
+- 공급형 A 전용면적 29m2 보증금: 1,000만원 월임대료: 150,000원
+- 공급형 B 전용면적 36.5㎡ 보증금: 1,500만원 월임대료: 210,000원
+- 전환보증금 최대 50% 가능 (이율 6.0%)
+3. 공급일정
+- 당첨자 발표: 2026-03-20
+"""
+
+PROSE = (
+    "입주자 선정 시 제출 서류의 진위 여부를 확인하며, 허위 서류를 제출한 경우 당첨이 취소될 수 있습니다. "
+    "신청자는 공고문 전체를 반드시 확인하시기 바랍니다. 자세한 사항은 콜센터로 문의하시기 바랍니다. "
+) * 20
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - started) / repeat
+
+def same(a, b):
+    ka, kb = a["keywords"], b["keywords"]
+    # The current parser merges "3억 4,500만원" into one amount; the totals still agree
+    return (
+        a["dates"] == b["dates"] and a["areas"] == b["areas"]
+        and sum(v for _, v in a["amounts"]) == sum(v for _, v in b["amounts"])
+        and ka["qualifications"] == kb["qualifications"] and ka["income"] == kb["income"]
+        and set(ka["assets"]) == set(kb["assets"])
+    )
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=50)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    corpora = {
+        "table-heavy": NOTICE_PAGE * args.pages,
+        "prose-heavy": (NOTICE_PAGE + PROSE) * args.pages,
+    }
+    legacy, current = LegacyRegexParser(), RegexParser()
+
+    print(f"{'corpus':<14}{'chars':>10}{'legacy ms':>12}{'tokenize ms':>13}{'speedup':>9}")
+    for name, text in corpora.items():
+        before, t_before = timed(lambda: legacy.parse(text), args.repeat)
+        after, t_after = timed(lambda: current.parse(text), args.repeat)
+        assert same(before, after), name
+        print(f"{name:<14}{len(text):>10}{t_before * 1000:>12.1f}{t_after * 1000:>13.1f}{t_before / t_after:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
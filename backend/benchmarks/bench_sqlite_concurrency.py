@@ -0,0 +1,112 @@
+"""
+Benchmark: /notices-style reads while a background job writes.
+
+A writer thread keeps re-saving batches of notices through upsert_notices (as a
+scrape does) while reader threads run the /notices query and time each call.
+"before" is a plain SQLite engine (rollback journal, default pragmas); "after"
+is database.make_engine (WAL, synchronous=NORMAL, mmap, cache, busy_timeout).
+Each variant gets its own database file, since the journal mode is stored in it.
+
+    python benchmarks/bench_sqlite_concurrency.py --seconds 5 --readers 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from database import Base, HousingNotice, SessionLocal, SQLITE_PRAGMAS, make_engine
+from notice_store import upsert_notices
+from bench_collector_save import synthetic_items
+
+REGIONS = ["Gangnam-gu", "Mapo-gu", "Songpa-gu", "Nowon-gu"]
+
+def items(n, version):
+    rows = synthetic_items(n)
+    for i, item in enumerate(rows):
+        item["region"] = REGIONS[i % len(REGIONS)]
+        item["rent"] = 150000 + version
+    return rows
+
+def run(path, pragmas, args):
+    engine = make_engine(f"sqlite:///{path}", pragmas=pragmas)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    SessionLocal.configure(bind=engine)
+
+    db = Session()
+    upsert_notices(db, items(args.notices, 0), geocode=None)
+    db.close()
+
+    stop = threading.Event()
+    latencies, errors, writes = [], [0], [0]
+    lock = threading.Lock()
+
+    def writer():
+        version = 1
+        while not stop.is_set():
+            db = Session()
+            try:
+                upsert_notices(db, items(args.batch, version), geocode=None)
+                writes[0] += 1
+            except OperationalError:
+                db.rollback()
+            finally:
+                db.close()
+            version += 1
+
+    def reader(n):
+        region = REGIONS[n % len(REGIONS)]
+        while not stop.is_set():
+            started = time.perf_counter()
+            db = Session()
+            try:
+                db.query(HousingNotice).filter(HousingNotice.region == region).limit(100).all()
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+            except OperationalError:
+                with lock:
+                    errors[0] += 1
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(n,)) for n in range(args.readers)]
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    engine.dispose()
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else float("nan")
+    return len(latencies), pick(0.5), pick(0.99), pick(1.0), errors[0], writes[0]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=5)
+    ap.add_argument("--readers", type=int, default=4)
+    ap.add_argument("--notices", type=int, default=20000)
+    ap.add_argument("--batch", type=int, default=5000, help="Notices re-saved per write transaction")
+    args = ap.parse_args()
+
+    variants = [
+        ("before: default engine", {name: None for name in SQLITE_PRAGMAS}),
+        ("after: make_engine", None),
+    ]
+    print(f"{args.readers} readers + 1 writer for {args.seconds:.0f}s, {args.notices} notices, {args.batch} per write")
+    print(f"{'variant':<26}{'reads':>8}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'locked':>8}{'writes':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n, (name, pragmas) in enumerate(variants):
+            reads, p50, p99, worst, errors, writes = run(os.path.join(tmp, f"bench_{n}.db"), pragmas, args)
+            print(f"{name:<26}{reads:>8}{p50:>9.1f}{p99:>9.1f}{worst:>9.1f}{errors:>8}{writes:>8}")
+
+if __name__ == "__main__":
+    main()
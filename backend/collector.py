@@ -1,86 +1,106 @@
-from database import SessionLocal, HousingNotice, Base, engine
-from geocoder import get_coordinates
-from scrapers.sh_scraper import SHScraper
+from database import SessionLocal, init_db
+from notice_store import upsert_notices, backfill_dedup_keys
+from geocoder import cache_stats
+from scrapers.sh_scraper import AsyncSHScraper
 from scrapers.lh_scraper import LHScraper
-from scrapers.myhome_scraper import MyHomeScraper
-from datetime import datetime
-# MyHome to be added later
+from collections import namedtuple
+import os
+import queue
+import threading
+import time
+try:
+    from scrapers.myhome_scraper import MyHomeScraper
+except ImportError:
+    MyHomeScraper = None # MyHome to be added later
 
-def run_collection_job():
-    print("Job Started: Data Collection (All Sources)")
-    
-    # Ensure DB tables exist
-    Base.metadata.create_all(bind=engine)
-    
-    scrapers = [
-        SHScraper(),
-        LHScraper(),
-        MyHomeScraper()
-    ]
-    
-    all_data = []
-    
-    # 1. Collect
-    for scraper in scrapers:
+# Seconds a scraper may run before its results are given up on.
+# A scraper class can override it with a `timeout` attribute.
+SCRAPER_TIMEOUT = float(os.getenv("SCRAPER_TIMEOUT", "300"))
+
+ScraperRun = namedtuple("ScraperRun", ["name", "items", "elapsed", "error"])
+
+def run_scrapers_concurrently(scrapers, timeout=SCRAPER_TIMEOUT):
+    """
+    Runs every BaseScraper on its own thread and yields a ScraperRun as each one finishes,
+    so results can be saved while slower scrapers are still running.
+    A scraper that raises or exceeds its timeout yields an empty run with the error set
+    and never affects the others. Threads are daemons, so a hung browser session can't
+    block process exit.
+    """
+    finished = queue.Queue()
+
+    def worker(scraper):
+        started = time.perf_counter()
         try:
-            data = scraper.scrape()
-            all_data.extend(data)
+            items, error = scraper.scrape() or [], None
         except Exception as e:
-            print(f"Scraper Error: {e}")
-            
-    # 2. Save / Deduplicate
+            items, error = [], e
+        finished.put((scraper, items, time.perf_counter() - started, error))
+
+    started = time.perf_counter()
+    deadlines = {}
+    for scraper in scrapers:
+        deadlines[scraper] = started + getattr(scraper, "timeout", timeout)
+        threading.Thread(
+            target=worker, args=(scraper,), name=f"scraper-{type(scraper).__name__}", daemon=True
+        ).start()
+
+    while deadlines:
+        wait = max(0.0, min(deadlines.values()) - time.perf_counter())
+        try:
+            scraper, items, elapsed, error = finished.get(timeout=wait)
+        except queue.Empty:
+            now = time.perf_counter()
+            for scraper, deadline in list(deadlines.items()):
+                if deadline <= now:
+                    del deadlines[scraper]
+                    yield ScraperRun(
+                        type(scraper).__name__, [], now - started,
+                        TimeoutError(f"timed out after {deadline - started:.0f}s"),
+                    )
+            continue
+
+        if scraper not in deadlines:
+            continue # Finished after its timeout was already reported
+        del deadlines[scraper]
+        yield ScraperRun(type(scraper).__name__, items, elapsed, error)
+
+def save_items(db, items):
+    """Upserts scraped items in bulk. Returns the number of new notices."""
+    inserted, updated = upsert_notices(db, items)
+    print(f"Saved {inserted} new notices, refreshed {updated}.")
+    return inserted
+
+def run_collection_job(scrapers=None):
+    print("Job Started: Data Collection (All Sources)")
+
+    # Create missing tables and apply schema migrations (existing databases included)
+    init_db()
+
+    if scrapers is None:
+        scrapers = [AsyncSHScraper(), LHScraper()]
+        if MyHomeScraper is not None:
+            scrapers.append(MyHomeScraper())
+
+    # Collect concurrently; each scraper's items are saved as soon as it finishes
     db = SessionLocal()
     saved_count = 0
-    
-    for item in all_data:
-        # Deduplication Key: Title + Region (Simple)
-        # In real world, might need fuzzy match.
-        exists = db.query(HousingNotice).filter(
-            HousingNotice.title == item['title']
-        ).first()
-        
-        if not exists:
-            # Geocoding if needed
-            lat, lng = 0.0, 0.0
-            if item.get('address'):
-                lat, lng = get_coordinates(item['address'])
-            
-            # Parse notice_date if it's a string
-            notice_date_val = item['date']
-            if isinstance(notice_date_val, str):
-                try:
-                    notice_date_val = datetime.strptime(notice_date_val, "%Y-%m-%d")
-                except ValueError:
-                    notice_date_val = datetime.utcnow() # Fallback
-            
-            notice = HousingNotice(
-                title=item['title'],
-                platform=item['platform'],
-                notice_date=notice_date_val, 
-                link=item['link'],
-                start_date=item['start_date'],
-                end_date=item['end_date'],
-                region=item['region'],
-                address=item['address'],
-                deposit=item['deposit'], 
-                rent=item['rent'], 
-                area=item['area'],
-                lat=lat,
-                lng=lng,
-                summary_qualifications=item['qualifications'],
-                summary_income=item['income'],
-                summary_assets=item['assets']
-            )
-            db.add(notice)
-            saved_count += 1
-            print(f"Saved [{item['platform']}]: {item['title']}")
-        else:
-            # Update updated_at?
-            pass
-            
-    db.commit()
-    db.close()
-    print(f"Job Finished. Saved {saved_count} new notices.")
+    job_started = time.perf_counter()
+
+    try:
+        backfill_dedup_keys(db)
+        for run in run_scrapers_concurrently(scrapers):
+            if run.error:
+                print(f"Scraper Error [{run.name}] after {run.elapsed:.1f}s: {run.error}")
+                continue
+            print(f"Scraper [{run.name}] finished in {run.elapsed:.1f}s with {len(run.items)} items.")
+            saved_count += save_items(db, run.items)
+    finally:
+        db.close()
+
+    print(f"Job Finished in {time.perf_counter() - job_started:.1f}s. Saved {saved_count} new notices.")
+    print(f"Geocoding cache: {cache_stats()}")
+    return saved_count
 
 if __name__ == "__main__":
     run_collection_job()
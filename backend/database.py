@@ -1,24 +1,82 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean
+from sqlalchemy import create_engine, event, DDL, Column, Integer, String, Float, DateTime, Text, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from concurrent.futures import ThreadPoolExecutor
 import datetime
+import threading
 
 import os
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, 'housing.db')}"
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(BASE_DIR, 'housing.db')}")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Applied to every new SQLite connection. WAL lets the API keep reading while a job
+# writes; NORMAL sync is safe with WAL (a power cut can only lose the last commits).
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")), # Wait for a lock instead of failing
+    "cache_size": -int(os.getenv("SQLITE_CACHE_KB", "65536")), # Negative = KiB per connection
+    "mmap_size": int(os.getenv("SQLITE_MMAP_MB", "256")) * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+def make_engine(url=DATABASE_URL, pragmas=None, **kwargs):
+    """
+    Engine for `url`. SQLite connections get SQLITE_PRAGMAS (overridden by `pragmas`;
+    a None value skips that pragma) as soon as they are opened.
+    """
+    if not url.startswith("sqlite"):
+        return create_engine(url, **kwargs)
+
+    kwargs.setdefault("connect_args", {}).setdefault("check_same_thread", False)
+    engine = create_engine(url, **kwargs)
+    settings = dict(SQLITE_PRAGMAS, **(pragmas or {}))
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in settings.items():
+            if value is not None:
+                cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+    return engine
+
+engine = make_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Background jobs that write (scrape, market ingest, analysis) run here one at a time,
+# so they never contend for SQLite's single write lock; readers are unaffected under WAL.
+_writer = None
+_writer_lock = threading.Lock()
+
+def run_serialized(job, *args, **kwargs):
+    """Queues a writing job on the single database writer thread. Returns its Future."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        return _writer.submit(job, *args, **kwargs)
+
 Base = declarative_base()
 
 class HousingNotice(Base):
     __tablename__ = "housing_notices"
+    __table_args__ = (
+        # /notices by region (deadline order), per-platform listings by date, map bounds
+        Index("ix_housing_notices_region_end_date", "region", "end_date"),
+        Index("ix_housing_notices_platform_notice_date", "platform", "notice_date"),
+        Index("ix_housing_notices_lat_lng", "lat", "lng"),
+        # GET /notices keyset walks: latest first / nearest deadline first (id is the rowid)
+        Index("ix_housing_notices_notice_date", "notice_date"),
+        Index("ix_housing_notices_end_date", "end_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
     platform = Column(String)  # SH or LH
-    link = Column(String, unique=True, index=True)
+    link = Column(String, index=True) # Not unique: dedup_key identifies a notice
+    dedup_key = Column(String, unique=True, index=True) # platform + normalized link (or content hash)
     notice_date = Column(DateTime)
     start_date = Column(DateTime)
     end_date = Column(DateTime)
@@ -31,6 +89,7 @@ class HousingNotice(Base):
     deposit = Column(Integer)
     rent = Column(Integer)
     area = Column(Float, nullable=True) # Size in m2
+    effective_monthly_cost = Column(Integer, nullable=True) # rent + deposit converted at the jeonse rate (원)
     # New fields
     lat = Column(Float, nullable=True)
     lng = Column(Float, nullable=True)
@@ -39,36 +98,285 @@ class HousingNotice(Base):
     summary_assets = Column(Text, nullable=True) # 요약된 자산 요건 (New)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
+# Full-text search (notice_search.py): an external-content FTS5 table holding only a
+# trigram index over these columns; the text itself is read from housing_notices.
+# Triggers keep it in step with every insert, upsert and delete.
+SEARCH_COLUMNS = ["title", "address", "region", "summary_qualifications", "summary_income", "summary_assets"]
+
+def _notice_search_ddl():
+    columns = ", ".join(SEARCH_COLUMNS)
+    new = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+    old = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+    changed = " OR ".join(f"old.{c} IS NOT new.{c}" for c in SEARCH_COLUMNS)
+    insert = f"INSERT INTO notice_search (rowid, {columns}) VALUES (new.id, {new});"
+    delete = f"INSERT INTO notice_search (notice_search, rowid, {columns}) VALUES ('delete', old.id, {old});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS notice_search USING fts5({columns}, "
+        "content='housing_notices', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS notice_search_ai AFTER INSERT ON housing_notices BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS notice_search_ad AFTER DELETE ON housing_notices BEGIN {delete} END",
+        # Re-scrapes rewrite every column; only reindex when searchable text changed
+        f"CREATE TRIGGER IF NOT EXISTS notice_search_au AFTER UPDATE ON housing_notices "
+        f"WHEN {changed} BEGIN {delete} {insert} END",
+    ]
+
+for statement in _notice_search_ddl():
+    event.listen(HousingNotice.__table__, "after_create", DDL(statement))
+
+class NoticeUnit(Base):
+    # One rent table row of a notice (공급형), as found by RegexParser.extract_units.
+    # Scored against the market on its own; the notice's result is its best unit.
+    __tablename__ = "notice_units"
+
+    id = Column(Integer, primary_key=True, index=True)
+    notice_id = Column(Integer, index=True)
+    unit_type = Column(String, nullable=True) # "26A"
+    area = Column(Float, nullable=True) # Exclusive area, m2
+    deposit = Column(Integer, nullable=True) # 원
+    rent = Column(Integer, nullable=True) # 원
+    effective_monthly_cost = Column(Integer, nullable=True)
+    market_monthly_cost = Column(Integer, nullable=True)
+    price_diff_percent = Column(Float, nullable=True)
+    score = Column(Float, nullable=True)
+
 class GeocodingLog(Base):
     __tablename__ = "geocoding_logs"
 
+    # One row per address; repeated failures bump count / last_seen
     id = Column(Integer, primary_key=True, index=True)
-    address = Column(String, index=True)
+    address = Column(String, unique=True, index=True)
     status = Column(String) # SUCCESS, FAILED
-    error_message = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    error_message = Column(Text, nullable=True) # Latest error
+    count = Column(Integer, default=1)
+    first_seen = Column(DateTime, default=datetime.datetime.utcnow)
+    last_seen = Column(DateTime, default=datetime.datetime.utcnow)
+
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+
+    address_key = Column(String, primary_key=True) # Normalized address
+    lat = Column(Float, nullable=True) # NULL for negative entries
+    lng = Column(Float, nullable=True)
+    expires_at = Column(DateTime, nullable=True) # Negative entries only; positive ones never expire
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)
 
 class MarketPrice(Base):
+    # Materialized per (dong, building type, area bucket) aggregate of market_transactions.
+    # Amounts are in 만원 like the source data. building_type "ALL" rolls up every type.
     __tablename__ = "market_prices"
+    __table_args__ = (
+        Index("ux_market_prices_key", "legal_name", "building_type", "area_bucket", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     region_code = Column(String, index=True)
     legal_name = Column(String, index=True) # Dong
     building_type = Column(String) # Apartment, Officetel, etc.
+    area_bucket = Column(Integer) # floor(area / AGGREGATE_BUCKET_SIZE)
+    count = Column(Integer)
     avg_deposit = Column(Integer)
     avg_rent = Column(Integer)
+    median_deposit = Column(Integer)
+    p25_deposit = Column(Integer)
+    p75_deposit = Column(Integer)
+    median_rent = Column(Integer)
+    p25_rent = Column(Integer)
+    p75_rent = Column(Integer)
+    version = Column(Integer, default=1) # Bumped whenever the stats change
     updated_at = Column(DateTime, default=datetime.datetime.utcnow)
 
+class MarketTransaction(Base):
+    __tablename__ = "market_transactions"
+    __table_args__ = (
+        Index("ix_market_tx_dong_type_bucket", "legal_dong", "house_type", "area_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    row_key = Column(String, unique=True) # Hash of the raw API row (dedup)
+    region_code = Column(String) # SGG_CD
+    legal_dong = Column(String) # BJDONG_NM
+    house_type = Column(String) # 아파트, 오피스텔, 연립다세대, 단독다가구
+    area = Column(Float) # m2
+    area_bucket = Column(Integer) # floor(area / AREA_BUCKET_SIZE)
+    deposit = Column(Integer) # RENT_GTN (만원)
+    rent = Column(Integer) # RENT_FEE (만원)
+    deal_ymd = Column(String) # YYYYMMDD
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+class AttachmentDownload(Base):
+    # Validators of the last successful download per attachment URL (conditional GETs)
+    __tablename__ = "attachment_downloads"
+
+    url = Column(String, primary_key=True)
+    path = Column(String) # Local file
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True) # HTTP date, sent back verbatim
+    sha256 = Column(String, nullable=True) # Content hash (same key as the parse cache)
+    size = Column(Integer, nullable=True)
+    fetched_at = Column(DateTime, default=datetime.datetime.utcnow) # Last 200
+    checked_at = Column(DateTime, default=datetime.datetime.utcnow) # Last 200 or 304
+
+class IngestState(Base):
+    __tablename__ = "ingest_state"
+
+    name = Column(String, primary_key=True) # e.g. tbLnOpendataRtmsV
+    watermark = Column(String) # Newest DEAL_YMD stored
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
 class AnalysisResult(Base):
     __tablename__ = "analysis_results"
+    __table_args__ = (
+        # Conflict target of the analyzer's bulk upsert: one result per notice
+        Index("ux_analysis_results_notice_id", "notice_id", unique=True),
+        # GET /notices?sort=score walks this in (score, notice_id) order
+        Index("ix_analysis_results_score_notice_id", "score", "notice_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    notice_id = Column(Integer, index=True)
+    notice_id = Column(Integer)
     market_price_id = Column(Integer, index=True)
     price_diff_percent = Column(Float)
     score = Column(Float) # 1-5
     summary = Column(Text)
+    input_fingerprint = Column(String, nullable=True) # Hash of the scored notice inputs
+    market_version = Column(Integer, nullable=True) # market_prices.version used (0 = no market data)
+    market_monthly_cost = Column(Integer, nullable=True) # Market effective monthly cost compared against (원)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+
+# Schema migrations
+#
+# create_all only creates missing tables; it never alters one that exists. Changes to
+# existing tables are listed here in order, and PRAGMA user_version records how many
+# have been applied. Each step checks before it changes anything, so databases created
+# by any earlier version (whatever their user_version) end up with the same schema.
+# Append new steps; never edit or reorder released ones.
+
+def _columns(conn, table):
+    return {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+
+def _add_columns(conn, table, columns):
+    existing = _columns(conn, table)
+    for name, ddl in columns:
+        if name not in existing:
+            conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+
+def _migrate_notice_columns(conn):
+    _add_columns(conn, "housing_notices", [("dedup_key", "VARCHAR"), ("effective_monthly_cost", "INTEGER")])
+    # Old rows keep a NULL key until notice_store.backfill_dedup_keys runs on the next scrape
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_housing_notices_dedup_key ON housing_notices (dedup_key)"
+    )
+    _add_columns(conn, "analysis_results", [
+        ("input_fingerprint", "VARCHAR"), ("market_version", "INTEGER"), ("market_monthly_cost", "INTEGER"),
+    ])
+
+def _migrate_geocoding_logs(conn):
+    # One row per attempt -> one row per address with count / first_seen / last_seen
+    if "count" in _columns(conn, "geocoding_logs"):
+        return
+    conn.exec_driver_sql("ALTER TABLE geocoding_logs RENAME TO geocoding_logs_old")
+    for index in ("ix_geocoding_logs_id", "ix_geocoding_logs_address"):
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index}")
+    GeocodingLog.__table__.create(conn)
+    conn.exec_driver_sql(
+        "INSERT INTO geocoding_logs (address, status, error_message, count, first_seen, last_seen) "
+        "SELECT l.address, l.status, l.error_message, g.n, g.first_seen, g.last_seen "
+        "FROM geocoding_logs_old l JOIN ("
+        "  SELECT MAX(id) AS id, COUNT(*) AS n, MIN(created_at) AS first_seen, MAX(created_at) AS last_seen"
+        "  FROM geocoding_logs_old GROUP BY address"
+        ") g ON l.id = g.id"
+    )
+    conn.exec_driver_sql("DROP TABLE geocoding_logs_old")
+
+def _migrate_market_prices(conn):
+    # The old per-dong averages have no area bucket or percentiles. They are derived
+    # data, so the table is recreated and refilled by the next market ingest.
+    if "area_bucket" in _columns(conn, "market_prices"):
+        return
+    conn.exec_driver_sql("DROP TABLE market_prices")
+    MarketPrice.__table__.create(conn)
+
+def _migrate_analysis_index(conn):
+    # notice_id becomes unique (the analyzer's upsert target), keeping the newest
+    # result per notice; the old non-unique index is redundant then.
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ux_analysis_results_notice_id'"
+    ).first()
+    if not exists:
+        conn.exec_driver_sql(
+            "DELETE FROM analysis_results WHERE id NOT IN "
+            "(SELECT MAX(id) FROM analysis_results GROUP BY notice_id)"
+        )
+        conn.exec_driver_sql(
+            "CREATE UNIQUE INDEX ux_analysis_results_notice_id ON analysis_results (notice_id)"
+        )
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_analysis_results_notice_id")
+
+def _migrate_notice_indexes(conn):
+    # Region / deadline, per-platform listing by date, map bounds
+    for ddl in (
+        "CREATE INDEX IF NOT EXISTS ix_housing_notices_region_end_date ON housing_notices (region, end_date)",
+        "CREATE INDEX IF NOT EXISTS ix_housing_notices_platform_notice_date ON housing_notices (platform, notice_date)",
+        "CREATE INDEX IF NOT EXISTS ix_housing_notices_lat_lng ON housing_notices (lat, lng)",
+    ):
+        conn.exec_driver_sql(ddl)
+
+def _migrate_listing_indexes(conn):
+    # GET /notices keyset walks: latest, deadline and score order
+    for ddl in (
+        "CREATE INDEX IF NOT EXISTS ix_housing_notices_notice_date ON housing_notices (notice_date)",
+        "CREATE INDEX IF NOT EXISTS ix_housing_notices_end_date ON housing_notices (end_date)",
+        "CREATE INDEX IF NOT EXISTS ix_analysis_results_score_notice_id ON analysis_results (score, notice_id)",
+    ):
+        conn.exec_driver_sql(ddl)
+
+def _migrate_notice_search(conn):
+    for statement in _notice_search_ddl():
+        conn.exec_driver_sql(statement)
+    conn.exec_driver_sql("INSERT INTO notice_search (notice_search) VALUES ('rebuild')") # Index existing rows
+
+def _migrate_notice_link_index(conn):
+    # link was UNIQUE; notices with different dedup keys may share one (e.g. the
+    # same fallback link on two platforms), so it becomes a plain index
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_housing_notices_link")
+    conn.exec_driver_sql("CREATE INDEX ix_housing_notices_link ON housing_notices (link)")
+
+MIGRATIONS = [
+    _migrate_notice_columns,
+    _migrate_geocoding_logs,
+    _migrate_market_prices,
+    _migrate_analysis_index,
+    _migrate_notice_indexes,
+    _migrate_notice_search,
+    _migrate_listing_indexes,
+    _migrate_notice_link_index,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def migrate(bind):
+    """
+    Brings the database at `bind` to the current schema: creates missing tables, then
+    applies the MIGRATIONS after PRAGMA user_version. A new database starts at SCHEMA_VERSION.
+    Returns the number of migrations applied.
+    """
+    with bind.connect() as conn:
+        fresh = not conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'housing_notices'"
+        ).first()
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+    Base.metadata.create_all(bind=bind)
+    if fresh:
+        version = SCHEMA_VERSION
+
+    applied = 0
+    for number, step in enumerate(MIGRATIONS[version:], start=version + 1):
+        with bind.begin() as conn:
+            step(conn)
+        applied += 1
+        print(f"Applied schema migration {number}: {step.__name__}")
+    with bind.begin() as conn:
+        conn.exec_driver_sql(f"PRAGMA user_version = {max(version, SCHEMA_VERSION)}")
+    return applied
@@ -0,0 +1,175 @@
+import requests
+from requests.adapters import HTTPAdapter
+import datetime
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, unquote
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from database import SessionLocal, AttachmentDownload
+
+DOWNLOAD_DIR = os.getenv(
+    "DOWNLOAD_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "downloads")
+)
+CHUNK_SIZE = 64 * 1024
+DOWNLOAD_TIMEOUT = float(os.getenv("DOWNLOAD_TIMEOUT", "30")) # seconds (connect / between bytes)
+# Downloads in flight at once across every caller (scrapers run on their own threads)
+MAX_CONCURRENT_DOWNLOADS = int(os.getenv("MAX_CONCURRENT_DOWNLOADS", "4"))
+LOOKUP_BATCH_SIZE = 500
+
+DOWNLOADED = "downloaded"
+NOT_MODIFIED = "not_modified"
+FAILED = "failed"
+
+DownloadResult = namedtuple("DownloadResult", ["url", "path", "status", "error"])
+
+_session = None
+_session_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(MAX_CONCURRENT_DOWNLOADS)
+
+def get_session():
+    """Shared keep-alive session; its pool holds one connection per download slot."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_DOWNLOADS)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+def attachment_path(url, response=None, directory=DOWNLOAD_DIR):
+    """
+    Stable local path for a URL: <sha1(url)[:16]><ext>. The extension comes from the
+    Content-Disposition filename ("fileDown.do?seq=..." links), else from the URL path.
+    """
+    ext = os.path.splitext(unquote(urlsplit(url).path))[1].lower()
+    if response is not None:
+        disposition = response.headers.get("Content-Disposition", "")
+        match = re.search(r"filename\*?=(?:[\w-]+'[^']*')?\"?([^\";]+)", disposition, re.IGNORECASE)
+        if match:
+            ext = os.path.splitext(unquote(match.group(1)))[1].lower() or ext
+    return os.path.join(directory, hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + ext)
+
+def _write_atomic(response, path):
+    # Stream into a temp file next to the target and rename it over the target when complete,
+    # so a failed or partial download never replaces a good file. Returns (sha256, size).
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return digest.hexdigest(), size
+
+def _load_records(urls):
+    """{url: AttachmentDownload row tuple} for the URLs fetched before."""
+    records = {}
+    db = SessionLocal()
+    try:
+        for i in range(0, len(urls), LOOKUP_BATCH_SIZE):
+            rows = db.query(
+                AttachmentDownload.url, AttachmentDownload.path, AttachmentDownload.etag,
+                AttachmentDownload.last_modified, AttachmentDownload.sha256,
+                AttachmentDownload.size, AttachmentDownload.fetched_at,
+            ).filter(AttachmentDownload.url.in_(urls[i:i + LOOKUP_BATCH_SIZE]))
+            for row in rows:
+                records[row.url] = row
+    finally:
+        db.close()
+    return records
+
+def _store_records(rows):
+    if not rows:
+        return
+    stmt = sqlite_insert(AttachmentDownload)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["url"],
+        set_={k: stmt.excluded[k] for k in ("path", "etag", "last_modified", "sha256", "size", "fetched_at", "checked_at")},
+    )
+    db = SessionLocal()
+    try:
+        db.connection().execute(stmt, rows)
+        db.commit()
+    finally:
+        db.close()
+
+def _fetch(url, record, save_path, directory):
+    """
+    One GET under a download slot, conditional when the previous copy is still on disk.
+    Returns (DownloadResult, attachment_downloads row or None).
+    """
+    headers = {}
+    if record and os.path.exists(record.path) and save_path in (None, record.path):
+        if record.etag:
+            headers["If-None-Match"] = record.etag
+        if record.last_modified:
+            headers["If-Modified-Since"] = record.last_modified
+
+    now = datetime.datetime.utcnow()
+    with _slots:
+        try:
+            with get_session().get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+                if response.status_code == 304 and headers:
+                    row = dict(record._asdict(), checked_at=now)
+                    return DownloadResult(url, record.path, NOT_MODIFIED, None), row
+                if response.status_code != 200:
+                    return DownloadResult(url, None, FAILED, f"HTTP {response.status_code}"), None
+                path = save_path or attachment_path(url, response, directory)
+                sha256, size = _write_atomic(response, path)
+        except (requests.RequestException, OSError) as e:
+            return DownloadResult(url, None, FAILED, str(e)), None
+
+    row = {
+        "url": url, "path": path,
+        "etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified"),
+        "sha256": sha256, "size": size, "fetched_at": now, "checked_at": now,
+    }
+    return DownloadResult(url, path, DOWNLOADED, None), row
+
+def download_many(urls, save_paths=None, directory=DOWNLOAD_DIR, max_workers=MAX_CONCURRENT_DOWNLOADS):
+    """
+    Downloads attachments concurrently (at most MAX_CONCURRENT_DOWNLOADS in flight) over
+    the shared connection pool. URLs fetched before are requested with their stored
+    ETag / Last-Modified, so an unchanged attachment costs one 304 and no body.
+    Duplicate URLs are fetched once. save_paths optionally maps a URL to its local path
+    (default: attachment_path). Returns {url: DownloadResult}.
+    """
+    save_paths = save_paths or {}
+    urls = list(dict.fromkeys(url for url in urls if url))
+    if not urls:
+        return {}
+    records = _load_records(urls)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        outcomes = list(pool.map(
+            lambda url: _fetch(url, records.get(url), save_paths.get(url), directory), urls
+        ))
+    _store_records([row for _, row in outcomes if row])
+
+    results = {result.url: result for result, _ in outcomes}
+    for result in results.values():
+        if result.status == FAILED:
+            print(f"Download failed [{result.url}]: {result.error}")
+    counts = {status: sum(1 for r in results.values() if r.status == status) for status in (DOWNLOADED, NOT_MODIFIED, FAILED)}
+    print(f"Downloads: {counts[DOWNLOADED]} downloaded, {counts[NOT_MODIFIED]} unchanged, {counts[FAILED]} failed.")
+    return results
+
+def download(url, save_path=None):
+    return download_many([url], {url: save_path} if save_path else None)[url]
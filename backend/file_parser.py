@@ -2,7 +2,31 @@ import re
 import platform
 import subprocess
 import os
+import heapq
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 import pdfplumber
+from hwp_parser import iter_hwp_sections
+
+# PDFs with at least this many pages are split across worker processes
+PARALLEL_MIN_PAGES = 16
+
+MONEY_UNITS = {"억": 100000000, "만": 10000, "천": 1000, "원": 1}
+
+# Rent table labels -> unit field. A label only counts at the start of a word,
+# so "전환보증금" is not a deposit and "공급면적" is not the exclusive area.
+UNIT_LABELS = {
+    "임대보증금": "deposit", "보증금": "deposit",
+    "월임대료": "rent", "임대료": "rent", "월세": "rent",
+    "주거전용면적": "area", "전용면적": "area", "주거전용": "area", "전용": "area", "면적": "area",
+    "공급형": "unit_type", "주택형": "unit_type", "주택유형": "unit_type", "타입": "unit_type",
+}
+
+# One scan token: kind is "date", "amount", "area", "keyword" or "asset".
+# value is the normalized date, the amount in won, the area, the keyword's category
+# ("qualifications" / "income" / "assets") or the "keyword: limit" asset string.
+# extract_units also uses "label" (value: the UNIT_LABELS field) and "unit_type" tokens.
+Token = namedtuple("Token", ["kind", "start", "end", "text", "value"])
 
 class RegexParser:
     def __init__(self):
@@ -19,6 +43,80 @@ class RegexParser:
         # Keywords
         self.qual_keywords = ["무주택", "세대구성원", "청년", "신혼부부", "한부모", "고령자"]
         self.income_keywords = ["소득", "중위소득", "월평균"]
+        self.asset_keywords = ["자산", "자동차", "부동산", "가액"]
+        # Limit after an asset keyword, e.g. "자동차 3,708만원 이하" -> "3,708만"
+        self.asset_limit_pattern = re.compile(r'[^0-9\n]*([\d,]+(?:억|천?만|원)?)')
+        # The same on normalized text, where line breaks are already spaces
+        self.joined_asset_limit_pattern = re.compile(r'[^0-9]*([\d,]+(?:억|천?만|원)?)')
+        # Rest of a compound amount after "N억": "1억 2000만원", "1억 2천만원", "3억 4,500" (만 implied).
+        # Not when the number goes on as a decimal, date, percentage or area. The number and
+        # its units are matched inside a lookahead and then consumed with a backreference:
+        # a lookahead never backtracks, so "2000만 평" can't fall back to "2000" (an atomic
+        # group without the Python 3.11 syntax).
+        compound_tail = (
+            r'(?=(?P<tail>(?P<num>\d[\d,]*){space}*(?P<unit>천만|만)?(?P<won>원)?))(?P=tail)'
+            r'(?![.\-/]?\d|%|{space}*(?:m2|㎡|평|억|천))'
+        )
+        self.compound_tail_pattern = re.compile(r'[^\S\n]*' + compound_tail.format(space=r'[^\S\n]'))
+        self.joined_compound_tail_pattern = re.compile(r'\s*' + compound_tail.format(space=r'\s'))
+
+        # Rent table labels and unit types written as "26A형" / "A형"
+        labels = "|".join(sorted(UNIT_LABELS, key=len, reverse=True))
+        self.unit_event_pattern = re.compile(
+            rf'(?<![가-힣])(?P<label>{labels})|(?<![\w.])(?P<type>\d{{1,3}}[A-Za-z]{{0,2}}|[A-Za-z]{{1,2}})형(?!\w)'
+        )
+        # Unit type after a 공급형 label, or in the first cell of a table row: "A", "26A형", "59"
+        unit_type = r'(\d{1,3}(?:\.\d+)?[A-Za-z]{0,2}|[A-Za-z]{1,2}\d{0,3})(?:형|타입)?(?![\w.])'
+        self.labelled_type_pattern = re.compile(r'[^\S\n]*[:：]?[^\S\n]*' + unit_type)
+        self.row_type_pattern = re.compile(r'[^\S\n]*[-·*]?[^\S\n]*' + unit_type)
+
+        categories = {}
+        for category, keywords in (
+            ("qualifications", self.qual_keywords),
+            ("income", self.income_keywords),
+            ("assets", self.asset_keywords),
+        ):
+            for kw in keywords:
+                categories[kw] = category
+        self.keyword_categories = categories
+
+        # Keywords are matched (and consumed) longest first, so those inside a longer hit
+        # are reported with it: 중위소득 -> 중위소득 + 소득 at offset 2
+        self.contained_keywords = {
+            kw: [(k, i) for k in categories for i in range(len(kw)) if kw.startswith(k, i)]
+            for kw in categories
+        }
+        # A keyword whose tail starts another one ("청년" + "년...") is matched zero-width
+        # instead, so the scan still sees the keyword beginning inside it
+        overlapping = [
+            kw for kw in categories
+            if any(other.startswith(kw[i:]) for other in categories for i in range(1, len(kw)))
+        ]
+        consumed = [kw for kw in categories if kw not in overlapping]
+
+        def tails(keywords):
+            # "중위소득" -> "(?<=중)위소득": the first character is consumed by the leading class
+            return "|".join(
+                f"(?<={re.escape(kw[0])}){re.escape(kw[1:])}" for kw in sorted(keywords, key=len, reverse=True)
+            )
+
+        # One scan emits every token. The pattern opens with a character class so the regex
+        # engine can skip ahead to the next candidate character by itself. A number is only
+        # reported when it can be something: it has a money unit, is long enough to be a
+        # bare amount (>= 100,000), or is followed by a date separator or an area unit.
+        # Numbers are whole digit/comma runs, exactly how money_pattern.findall splits them.
+        # Plain quantifiers (no possessive ones, Python 3.10): a shorter run can never pass
+        # the checks after it, since the next character is then a digit or comma.
+        first_chars = "".join(sorted({re.escape(kw[0]) for kw in categories}))
+        branches = [
+            r"(?<=[\d,])(?<![\d,].)(?P<num>[\d,]*)(?P<unit>\s*(?:억원|만원|천원|억|만|천|원))?"
+            r"(?(unit)|(?:(?<=[\d,]{6})|(?=[.\-/]\d)|(?=(?:\.\d+)?\s*(?:m2|㎡|평))))"
+        ]
+        if consumed:
+            branches.append(rf"(?P<kw>{tails(consumed)})")
+        if overlapping:
+            branches.append(rf"(?=(?P<kw_overlap>{tails(overlapping)}))")
+        self.scan_pattern = re.compile(rf"[{first_chars}\d,](?:{'|'.join(branches)})")
 
     def normalize_text(self, text):
         if not text: return ""
@@ -26,144 +124,384 @@ class RegexParser:
         text = re.sub(r'\s+', ' ', text)
         return text.strip()
 
+    def tokenize(self, text, joined=False):
+        """
+        Yields Tokens for dates, amounts, areas, keyword hits and asset limits in one scan.
+        Each kind comes out in text order and matches what date_pattern / money_pattern /
+        area_pattern findall and the keyword checks find on their own. Areas and amounts
+        are reported when extract_amounts would keep them; areas are unfiltered
+        (extract_area applies the 10-200 range).
+
+        joined=True gives the tokens of normalize_text(text) without building it (asset
+        limits may then cross line breaks); positions still refer to `text`.
+        """
+        text = text or ""
+        date_resume = area_resume = 0
+        length = len(text)
+        categories = self.keyword_categories
+        contained = self.contained_keywords
+        date_match = self.date_pattern.match
+        area_match = self.area_pattern.match
+        limit_match = (self.joined_asset_limit_pattern if joined else self.asset_limit_pattern).match
+        tail_match = (self.joined_compound_tail_pattern if joined else self.compound_tail_pattern).match
+        amount_resume = 0 # End of the last compound amount; its tail is not reported again
+
+        for m in self.scan_pattern.finditer(text):
+            start = m.start()
+            end = m.end("num")
+            if end < 0: # Keyword
+                if m.group("kw") is not None:
+                    kw = text[start:m.end()]
+                else:
+                    kw = text[start] + m.group("kw_overlap")
+                for hit, offset in contained[kw]:
+                    hit_start = start + offset
+                    hit_end = hit_start + len(hit)
+                    yield Token("keyword", hit_start, hit_end, hit, categories[hit])
+                    if categories[hit] == "assets":
+                        limit = limit_match(text, hit_end)
+                        if limit:
+                            yield Token("asset", hit_start, limit.end(), text[hit_start:limit.end()], f"{hit}: {limit.group(1)}")
+                continue
+
+            num = text[start:end]
+            if end < length:
+                # Dates and areas start in the last digit group of a run
+                # (and not inside the previous match of the same kind)
+                after = text[end]
+                if after in ".-/":
+                    q = max(start + num.rfind(",") + 1, end - 4, date_resume)
+                    if end - q >= 2:
+                        d = date_match(text, q)
+                        if d:
+                            date_resume = d.end()
+                            yield Token("date", q, date_resume, d.group(), d.group())
+                if after in ".m㎡평" or after.isspace():
+                    q = max(start + num.rfind(",") + 1, area_resume)
+                    if q < end:
+                        a = area_match(text, q)
+                        if a:
+                            area_resume = a.end()
+                            yield Token("area", q, area_resume, a.group(), float(a.group(1)))
+
+            if start < amount_resume:
+                continue
+            unit = m.group("unit")
+            if unit:
+                unit = unit.lstrip()
+                raw = num.replace(",", "")
+                if raw.isdigit():
+                    value = float(raw) * MONEY_UNITS[unit[0]]
+                    amount_end = m.end()
+                    if unit == "억":
+                        tail = tail_match(text, amount_end)
+                        extra = self._compound_tail_value(tail) if tail else None
+                        if extra is not None:
+                            value += extra
+                            amount_end = amount_resume = max(tail.end("num"), tail.end("unit"), tail.end("won"))
+                            unit = f"{unit} {text[tail.start('num'):amount_end]}"
+                    if value > 0: # "0원" is nothing
+                        yield Token("amount", start, amount_end, f"{num}{unit}", value)
+            elif end - start >= 6:
+                # Bare numbers only count from 100,000 (likely money in tables)
+                raw = num.replace(",", "")
+                if raw.isdigit() and float(raw) >= 100000:
+                    yield Token("amount", start, end, num, float(raw))
+
+    def _compound_tail_value(self, tail):
+        # Won value of the part after "N억", or None when it can't be one (e.g. "1억 20000만원")
+        raw = tail.group("num").replace(",", "")
+        if not raw.isdigit():
+            return None
+        number = int(raw)
+        unit = tail.group("unit")
+        if unit == "천만":
+            return number * 10000000 if number <= 9 else None
+        if unit or not tail.group("won"):
+            return number * 10000 if number <= 9999 else None # "만" (written or implied)
+        return number if number < 100000000 else None
+
+    def _clean_date(self, d):
+        d = d.replace('.', '-').replace('/', '-')
+        parts = d.split('-')
+        if len(parts[0]) == 2:
+            parts[0] = "20" + parts[0]
+        return "-".join(parts)
+
     def extract_dates(self, text):
-        matches = self.date_pattern.findall(text)
-        cleaned_dates = []
-        for d in matches:
-            d = d.replace('.', '-').replace('/', '-')
-            parts = d.split('-')
-            if len(parts[0]) == 2:
-                parts[0] = "20" + parts[0]
-            cleaned_dates.append("-".join(parts))
-        return cleaned_dates
+        return [self._clean_date(t.value) for t in self.tokenize(text) if t.kind == "date"]
 
     def extract_amounts(self, text):
-        # Regex to capture number and optional unit
-        pattern = re.compile(r'([\d,]+)\s*(억원|만원|천원|억|만|천|원)?')
-        matches = pattern.findall(text)
-        
-        results = []
-        
-        for val_str, unit in matches:
-            raw_val = val_str.replace(',', '')
-            if not raw_val.isdigit(): continue
-            numeric = float(raw_val)
-            
-            value = 0
-            if unit.startswith('억'):
-                value = numeric * 100000000
-            elif unit.startswith('만'):
-                value = numeric * 10000
-            elif unit.startswith('천'):
-                value = numeric * 1000
-            elif unit == '원':
-                value = numeric
-            elif not unit and numeric >= 100000:
-                # Fallback for raw numbers >= 100,000 (likely money in tables)
-                value = numeric
-            
-            if value > 0:
-                results.append((f"{val_str}{unit}", value))
-                
-        # Simple merging logic for "1억 2000" cases could go here
-        # For now, return all found values
-        return results
+        # Compound amounts ("1억 2000만원") come out as one value
+        return [(t.text, t.value) for t in self.tokenize(text) if t.kind == "amount"]
+
+    def find_areas(self, text):
+        return [t.value for t in self.tokenize(text) if t.kind == "area" and 10 <= t.value <= 200]
 
     def extract_area(self, text):
-        matches = self.area_pattern.findall(text)
-        areas = []
-        for a in matches:
-             try:
-                 val = float(a)
-                 if 10 <= val <= 200:
-                     areas.append(val)
-             except:
-                 continue
+        areas = self.find_areas(text)
         return areas if areas else [25.0]
 
     def extract_keywords(self, text):
-        found = {
-            "qualifications": [],
-            "income": [],
-            "assets": []
-        }
-        
-        # Simple keyword matching
-        for kw in self.qual_keywords:
-            if kw in text:
-                found["qualifications"].append(kw)
-        for kw in self.income_keywords:
-            if kw in text:
-                found["income"].append(kw)
-                
-        # Asset Extraction Logic
-        # Look for sentences containing "자산", "자동차", "부동산" and extract the whole line or segment
-        lines = text.splitlines() # If text has newlines
-        if len(lines) < 2: 
-            # If text is normalized, split by sentences? 
-            # Or just regex find.
-            # "총자산가액 3억 이하"
-            pass
-            
-        assets_keywords = ["자산", "자동차", "부동산", "가액"]
-        # Regex to find phrases like "자산 X억 이하", "자동차 X만원 이하"
-        # Since text might be dense, let's just grab sentences with these keywords.
-        
-        # Naive approach: check if keywords exist, if so try to grab context
-        # Better: Regex for "자산.*?이하" or similar
-        
-        # Let's try to extract specific asset limits if possible
-        # Pattern: (자산|자동차|부동산).*?([\d,]+(?:억|천?만)?원?)
-        
-        asset_matches = []
-        for kw in assets_keywords:
-            if kw in text:
-                # Find the sentence or immediate context
-                # Find kw and next 20 chars? 
-                # Let's find regex matches of "Keyword .... value"
-                pattern = re.compile(rf"{kw}[^0-9\n]*([\d,]+(?:억|천?만|원)?)")
-                matches = pattern.findall(text)
-                for m in matches:
-                     asset_matches.append(f"{kw}: {m}")
-        
-        if asset_matches:
-            found["assets"] = list(set(asset_matches)) # Dedup
-            
-        return found
-    
-    def parse(self, text):
-        text = self.normalize_text(text)
+        return self._collect(self.tokenize(text))["keywords"]
+
+    def _unit_events(self, text):
+        # Label and unit type tokens in text order; a 공급형 label is followed by its value
+        search = self.unit_event_pattern.search
+        type_match = self.labelled_type_pattern.match
+        pos = 0
+        while True:
+            m = search(text, pos)
+            if m is None:
+                return
+            pos = m.end()
+            label = m.group("label")
+            if label is None:
+                yield Token("unit_type", m.start(), pos, m.group(), m.group("type"))
+                continue
+            field = UNIT_LABELS[label]
+            yield Token("label", m.start(), pos, label, field)
+            if field == "unit_type":
+                value = type_match(text, pos)
+                if value:
+                    yield Token("unit_type", value.start(1), value.end(), value.group(1), value.group(1))
+                    pos = value.end()
+
+    def extract_units(self, text):
+        """
+        Rent table rows of a notice: [{"unit_type", "area", "deposit", "rent"}, ...]
+        (None where a field wasn't found). Values are tied to their labels by position:
+
+        - a line with two or more labels and no values is a table header; the lines
+          below it are rows whose amounts fill the header's deposit / rent columns in
+          order ("16A 16.5㎡ 1,200만원 15만원"), until a line that can't fill them all;
+        - anywhere else a label takes the next value of its kind on the same line
+          ("26A형 전용면적 26㎡ 보증금 1억 2000만원 월임대료 35만원"); a new unit type,
+          or a field that is already filled, starts the next unit.
+
+        Labels, unit types and tokens are each found in one scan and merged by
+        position, so this is linear in the text. Units without a deposit or rent are dropped.
+        """
+        text = text or ""
+        values = (t for t in self.tokenize(text) if t.kind == "amount" or (t.kind == "area" and 10 <= t.value <= 200))
+        events = heapq.merge(self._unit_events(text), values, key=lambda t: t.start)
+
+        units = []
+        state = {"columns": None, "unit": {}, "pending": None}
+        line_start = 0
+        line_end = text.find("\n")
+        line = []
+        for event in events:
+            while line_end != -1 and event.start > line_end:
+                self._unit_line(text, line_start, line, state, units)
+                line = []
+                line_start = line_end + 1
+                line_end = text.find("\n", line_start)
+            line.append(event)
+        self._unit_line(text, line_start, line, state, units)
+        self._flush_unit(state, units)
+        return units
+
+    def _flush_unit(self, state, units):
+        unit = state["unit"]
+        if unit.get("deposit") is not None or unit.get("rent") is not None:
+            units.append({field: unit.get(field) for field in ("unit_type", "area", "deposit", "rent")})
+        state["unit"] = {}
+
+    def _unit_line(self, text, line_start, line, state, units):
+        labels = [t.value for t in line if t.kind == "label"]
+        has_values = any(t.kind in ("amount", "area") for t in line)
+
+        if len(labels) >= 2 and not has_values:
+            # Table header
+            self._flush_unit(state, units)
+            columns = list(dict.fromkeys(labels))
+            state["columns"] = columns if "deposit" in columns or "rent" in columns else None
+            return
+
+        columns = state["columns"]
+        money_columns = [field for field in columns or () if field in ("deposit", "rent")]
+        amounts = [t.value for t in line if t.kind == "amount"]
+        if columns and (labels or len(amounts) < len(money_columns)):
+            state["columns"] = None # Table ended: this line is not a full row
+        elif columns:
+            # Table row
+            unit_type = None
+            if "unit_type" in columns:
+                m = self.row_type_pattern.match(text, line_start)
+                unit_type = m.group(1) if m else None
+            unit_type = next((t.value for t in line if t.kind == "unit_type"), unit_type)
+            areas = [t.value for t in line if t.kind == "area"]
+            row = {"unit_type": unit_type, "area": areas[0] if areas else None}
+            row.update(zip(money_columns, amounts))
+            state["unit"] = row
+            self._flush_unit(state, units)
+            return
+
+        # Labelled values
+        unit = state["unit"]
+        pending = None
+        for t in line:
+            if t.kind == "label":
+                pending = t.value
+                continue
+            if t.kind == "unit_type":
+                field = "unit_type"
+            elif t.kind == "area" and (pending == "area" or (pending is None and "unit_type" in unit)):
+                field = "area"
+            elif t.kind == "amount" and pending in ("deposit", "rent"):
+                field = pending
+            else:
+                pending = None
+                continue
+            if unit.get(field) is not None:
+                self._flush_unit(state, units)
+                unit = state["unit"]
+            unit[field] = t.value
+            pending = None
+
+    def _collect(self, tokens):
+        dates, amounts, areas = [], [], []
+        hits, assets = set(), set()
+        for t in tokens:
+            kind = t.kind
+            if kind == "amount":
+                amounts.append((t.text, t.value))
+            elif kind == "date":
+                dates.append(self._clean_date(t.value))
+            elif kind == "keyword":
+                hits.add(t.text)
+            elif kind == "area":
+                if 10 <= t.value <= 200:
+                    areas.append(t.value)
+            else:
+                assets.add(t.value)
         return {
-            "dates": self.extract_dates(text),
-            "amounts": self.extract_amounts(text),
-            "areas": self.extract_area(text),
-            "keywords": self.extract_keywords(text)
+            "dates": dates,
+            "amounts": amounts,
+            "areas": areas,
+            "keywords": {
+                # Reported in keyword-list order, assets deduplicated
+                "qualifications": [kw for kw in self.qual_keywords if kw in hits],
+                "income": [kw for kw in self.income_keywords if kw in hits],
+                "assets": list(assets),
+            }
         }
 
-def parse_pdf(file_path):
+    def parse(self, text):
+        # Tokens of the normalized text, without normalizing it first
+        result = self._collect(self.tokenize(text, joined=True))
+        if not result["areas"]:
+            result["areas"] = [25.0]
+        return result
+
+    def parse_stream(self, chunks):
+        """
+        Same result as parse() for text arriving in pieces (e.g. iter_pdf_pages),
+        consumed one chunk at a time instead of joined first. A match never spans
+        two chunks, so pass page-sized pieces rather than arbitrary byte slices.
+        """
+        result = self._collect(
+            token for chunk in chunks for token in self.tokenize(chunk, joined=True)
+        )
+        if not result["areas"]:
+            result["areas"] = [25.0]
+        return result
+
+def _page_count(file_path):
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+def _extract_page_range(args):
+    # Runs in a worker process: opens the PDF itself and returns the texts of pages [start, stop)
+    file_path, start, stop = args
+    texts = []
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages[start:stop]:
+            texts.append(page.extract_text() or "")
+            page.close()
+    return texts
+
+def iter_pdf_pages(file_path, workers=1):
+    """
+    Yields the text of each page in order, so parsing can start before the whole
+    document is extracted. With workers > 1, PDFs of PARALLEL_MIN_PAGES or more are
+    split into page ranges extracted by a process pool (pdfplumber is CPU-bound).
+    Pages without text are skipped.
+    """
+    if workers > 1:
+        count = _page_count(file_path)
+        if count >= PARALLEL_MIN_PAGES:
+            step = -(-count // workers)
+            ranges = [(file_path, start, min(start + step, count)) for start in range(0, count, step)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for texts in pool.map(_extract_page_range, ranges):
+                    yield from (text for text in texts if text)
+            return
+
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text()
+            page.close() # Drop the page's cached layout objects; memory stays flat on long notices
+            if text:
+                yield text
+
+def parse_pdf(file_path, workers=1):
     if not os.path.exists(file_path):
         return ""
-    
-    full_text = ""
+
     try:
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    full_text += text + "\n"
+        pages = list(iter_pdf_pages(file_path, workers=workers))
     except Exception as e:
         print(f"Error parsing PDF {file_path}: {e}")
         return ""
-        
-    return full_text
+
+    return "".join(text + "\n" for text in pages)
+
+def parse_pdfs(file_paths, workers=None):
+    """Extracts many PDFs in parallel, one per worker process. Yields (path, text) in input order."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from zip(file_paths, pool.map(parse_pdf, file_paths))
 
 def parse_hwp(file_path):
+    """Text of an HWP 5.x or HWPX announcement, one section at a time (pure Python, no office suite)."""
+    if not os.path.exists(file_path):
+        return ""
+
+    try:
+        sections = list(iter_hwp_sections(file_path))
+    except Exception as e:
+        print(f"Error parsing HWP {file_path}: {e}")
+        return ""
+
+    return "".join(text + "\n" for text in sections if text)
+
+# Bump whenever parse_document / extract_sections output changes (file_parser or
+# hwp_parser), so cached results from the old parsers are not served again
+PARSER_VERSION = 1
+
+def parse_document(file_path):
+    """Text of a downloaded announcement, by file extension ("" when unsupported)."""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".pdf":
+        return parse_pdf(file_path)
+    if ext in (".hwp", ".hwpx"):
+        return parse_hwp(file_path)
     return ""
 
+def parse_files(file_paths, workers=None):
+    """parse_pdfs for mixed PDF / HWP / HWPX downloads: one document per worker process."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from zip(file_paths, pool.map(parse_document, file_paths))
+
 def extract_sections(text):
-    parser = RegexParser()
-    result = parser.parse(text)
-    
+    return summarize_sections(RegexParser().parse(text))
+
+def extract_sections_from_pages(pages):
+    """extract_sections over a page stream (e.g. iter_pdf_pages) without joining it."""
+    return summarize_sections(RegexParser().parse_stream(pages))
+
+def summarize_sections(result):
     max_area = max(result['areas']) if result['areas'] else 25.0
     
     summary_qual = ", ".join(result["keywords"]["qualifications"])
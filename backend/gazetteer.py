@@ -0,0 +1,81 @@
+import csv
+import os
+import re
+
+# Bundled representative points (district offices / dong centres) for Seoul.
+# Add rows to the CSV to teach the collector more dongs; no code change needed.
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "seoul_gazetteer.csv")
+
+CITY_PREFIXES = ("서울특별시", "서울시", "서울")
+
+_gu = {} # "강남구" / "gangnam-gu" -> (lat, lng)
+_gu_names = {} # "gangnam-gu" -> "강남구"
+_dong = {} # ("강남구", "자곡동") -> (lat, lng)
+_city = None
+
+def load(path=GAZETTEER_PATH):
+    """Reads the CSV into the lookup dicts (done once on import)."""
+    global _city
+    _gu.clear()
+    _gu_names.clear()
+    _dong.clear()
+    with open(path, encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            point = (float(row["lat"]), float(row["lng"]))
+            if row["level"] == "city":
+                _city = point
+            elif row["level"] == "gu":
+                _gu[row["gu"]] = point
+                _gu[row["gu_en"].lower()] = point
+                _gu_names[row["gu_en"].lower()] = row["gu"]
+            else:
+                _dong[(row["gu"], row["name"])] = point
+
+def _tokens(address):
+    """Address words after the city prefix, e.g. "서울특별시 강남구 자곡동" -> ["강남구", "자곡동"]."""
+    address = re.sub(r"\s+", " ", address or "").strip()
+    for prefix in CITY_PREFIXES:
+        if address.startswith(prefix):
+            address = address[len(prefix):]
+            break
+    else:
+        return None # Not a Seoul address
+    return address.split()
+
+def _gu_name(token):
+    # "강남구청" / "Gangnam-gu청" -> "강남구"
+    if token.endswith("청"):
+        token = token[:-1]
+    if token in _gu:
+        return _gu_names.get(token.lower(), token)
+    return _gu_names.get(token.lower())
+
+def lookup(address):
+    """
+    Coordinates for a city / gu / dong level address ("서울시청", "서울시 Mapo-gu청",
+    "서울시 강남구 자곡동"). Returns None for street-level or unknown addresses,
+    which need the live geocoder.
+    """
+    tokens = _tokens(address)
+    if tokens is None:
+        return None
+    if tokens in ([], ["청"]):
+        return _city
+    gu = _gu_name(tokens[0])
+    if gu is None:
+        return None
+    if len(tokens) == 1:
+        return _gu[gu]
+    if len(tokens) == 2:
+        return _dong.get((gu, tokens[1]))
+    return None
+
+def district_centroid(address):
+    """Gu point for any Seoul address naming a gu; used when the live geocoder can't answer."""
+    tokens = _tokens(address)
+    if not tokens:
+        return _city if tokens == [] else None
+    gu = _gu_name(tokens[0])
+    return _gu[gu] if gu else None
+
+load()
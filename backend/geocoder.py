@@ -1,44 +1,330 @@
 import requests
+from requests.adapters import HTTPAdapter
 import os
-from database import SessionLocal, GeocodingLog
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, Counter
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from database import SessionLocal, GeocodingLog, GeocodeCache
+import gazetteer
 import datetime
 
 KAKAO_API_KEY = os.getenv("KAKAO_API_KEY", "")
+KAKAO_API_URL = os.getenv("KAKAO_API_URL", "https://dapi.kakao.com/v2/local/search/address.json")
 
-def get_coordinates(address):
-    if not KAKAO_API_KEY:
-        log_failure(address, "Kakao API Key missing")
-        return None, None
+REQUEST_TIMEOUT = 10 # seconds
+MAX_WORKERS = 8 # Concurrent lookups (and pooled keep-alive connections)
+RATE_PER_SECOND = float(os.getenv("KAKAO_RATE_PER_SECOND", "10"))
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 0.5 # Doubled after every retry
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+MEMORY_CACHE_SIZE = 4096
+FAILURE_FLUSH_SIZE = 200 # Buffered failure addresses written per bulk upsert
+# "No results" answers are remembered this long before the API is asked again
+NEGATIVE_TTL = datetime.timedelta(hours=float(os.getenv("GEOCODE_NEGATIVE_TTL_HOURS", "24")))
+NO_RESULTS = "No results found"
+
+class LRUCache:
+    """Small thread-safe in-process LRU (address_key -> (lat, lng, expires_at))."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+_memory_cache = LRUCache(MEMORY_CACHE_SIZE)
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+def cache_stats():
+    """Hit/miss counters since process start (or the last reset_cache_stats)."""
+    with _stats_lock:
+        stats = {
+            name: _stats[name]
+            for name in ("gazetteer_hits", "memory_hits", "db_hits", "negative_hits", "misses", "api_calls")
+        }
+    hits = stats["gazetteer_hits"] + stats["memory_hits"] + stats["db_hits"]
+    lookups = hits + stats["misses"]
+    stats["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+    return stats
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+def normalize_address(address):
+    """Cache key: trimmed, single-spaced, "서울특별시" spelled as "서울시"."""
+    if not address:
+        return ""
+    key = re.sub(r"\s+", " ", address).strip()
+    return key.replace("서울특별시", "서울시")
+
+class TokenBucket:
+    """Allows `rate` calls per second on average, with bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+_session = None
+_session_lock = threading.Lock()
+_rate_limiter = TokenBucket(RATE_PER_SECOND)
+
+def get_session():
+    """Shared keep-alive session; its pool holds one connection per worker."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+def _entry_hit(entry, now):
+    return entry is not None and (entry[2] is None or entry[2] > now)
+
+def _cached_many(keys):
+    """
+    Looks keys up in the LRU, then the remainder in geocode_cache with one query.
+    Returns {key: (lat, lng)} for cached keys ((None, None) for live negative entries).
+    """
+    now = datetime.datetime.utcnow()
+    found = {}
+    pending = []
+    for key in keys:
+        entry = _memory_cache.get(key)
+        if _entry_hit(entry, now):
+            _count("memory_hits")
+            found[key] = entry
+        else:
+            pending.append(key)
+
+    if pending:
+        db = SessionLocal()
+        try:
+            rows = db.query(GeocodeCache).filter(GeocodeCache.address_key.in_(pending)).all()
+        finally:
+            db.close()
+        for row in rows:
+            entry = (row.lat, row.lng, row.expires_at)
+            if _entry_hit(entry, now):
+                _memory_cache.put(row.address_key, entry)
+                _count("db_hits")
+                found[row.address_key] = entry
+        for key in pending:
+            if key not in found:
+                _count("misses")
 
-    url = "https://dapi.kakao.com/v2/local/search/address.json"
+    result = {}
+    for key, entry in found.items():
+        if entry[0] is None:
+            _count("negative_hits")
+        result[key] = (entry[0], entry[1])
+    return result
+
+def _store_many(results):
+    """Caches {key: (lat, lng)} answers; (None, None) becomes a negative entry."""
+    if not results:
+        return
+    now = datetime.datetime.utcnow()
+    rows = []
+    for key, (lat, lng) in results.items():
+        expires_at = None if lat is not None else now + NEGATIVE_TTL
+        _memory_cache.put(key, (lat, lng, expires_at))
+        rows.append({"address_key": key, "lat": lat, "lng": lng, "expires_at": expires_at, "updated_at": now})
+
+    stmt = sqlite_insert(GeocodeCache)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["address_key"],
+        set_={k: stmt.excluded[k] for k in ("lat", "lng", "expires_at", "updated_at")},
+    )
+    db = SessionLocal()
+    try:
+        db.connection().execute(stmt, rows)
+        db.commit()
+    finally:
+        db.close()
+
+def _request_coordinates(address):
+    """
+    Calls the Kakao address API with rate limiting and retries (exponential backoff
+    on connection errors, 429 and 5xx). Returns (lat, lng, error); error is NO_RESULTS
+    for a definitive empty answer.
+    """
     headers = {"Authorization": f"KakaoAK {KAKAO_API_KEY}"}
     params = {"query": address}
+    error = None
 
-    try:
-        response = requests.get(url, headers=headers, params=params)
-        if response.status_code == 200:
-            data = response.json()
-            if data['documents']:
-                lat = data['documents'][0]['y']
-                lng = data['documents'][0]['x']
-                return float(lat), float(lng)
-            else:
-                log_failure(address, "No results found")
-                return None, None
+    for attempt in range(MAX_RETRIES + 1):
+        _rate_limiter.acquire()
+        _count("api_calls")
+        try:
+            response = get_session().get(KAKAO_API_URL, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            error = str(e)
         else:
-            log_failure(address, f"API Error: {response.status_code}")
-            return None, None
-    except Exception as e:
-        log_failure(address, str(e))
+            if response.status_code == 200:
+                try:
+                    documents = response.json()['documents']
+                    if documents:
+                        return float(documents[0]['y']), float(documents[0]['x']), None
+                    return None, None, NO_RESULTS
+                except (ValueError, KeyError, IndexError, TypeError) as e:
+                    # Malformed body: a per-address failure, never an exception for the batch
+                    error = f"Invalid API response: {e!r}"
+                    break
+            error = f"API Error: {response.status_code}"
+            if response.status_code not in RETRY_STATUSES:
+                break
+        if attempt < MAX_RETRIES:
+            time.sleep(BACKOFF_SECONDS * 2 ** attempt)
+
+    return None, None, error
+
+def geocode_batch(addresses, max_workers=MAX_WORKERS):
+    """
+    Resolves many addresses at once: duplicates are collapsed, gu/dong level addresses
+    come from the bundled gazetteer, cached answers from the LRU / geocode_cache, and
+    the remaining (street-level) addresses are looked up concurrently over the shared
+    connection pool. Addresses the API can't resolve fall back to their gu centroid.
+    Returns {address: (lat, lng)} for every input address ((None, None) when unresolved).
+    """
+    keys = {}
+    resolved = {}
+    for address in addresses:
+        key = normalize_address(address)
+        if not key or key in keys:
+            continue
+        keys[key] = address
+        point = gazetteer.lookup(key)
+        if point:
+            _count("gazetteer_hits")
+            resolved[key] = point
+
+    resolved.update(_cached_many([key for key in keys if key not in resolved]))
+    missing = [key for key in keys if key not in resolved]
+
+    if missing and not KAKAO_API_KEY:
+        for key in missing:
+            log_failure(keys[key], "Kakao API Key missing")
+            resolved[key] = (None, None) # Still gets the gu centroid below
+    elif missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            answers = list(pool.map(lambda key: _request_coordinates(keys[key]), missing))
+
+        to_store = {}
+        for key, (lat, lng, error) in zip(missing, answers):
+            if error:
+                log_failure(keys[key], error)
+            if error is None or error == NO_RESULTS:
+                # Negative entry for NO_RESULTS; transient errors are not cached
+                to_store[key] = (lat, lng)
+            resolved[key] = (lat, lng)
+        _store_many(to_store)
+
+    flush_failures()
+    for key, point in resolved.items():
+        if point[0] is None:
+            resolved[key] = gazetteer.district_centroid(key) or point
+    return {
+        address: resolved.get(normalize_address(address), (None, None))
+        for address in addresses
+    }
+
+def get_coordinates(address):
+    if not normalize_address(address):
         return None, None
+    return geocode_batch([address])[address]
+
+_failures = {} # address -> [error_message, count, first_seen, last_seen]
+_failures_lock = threading.Lock()
 
 def log_failure(address, error_message):
-    db = SessionLocal()
-    log = GeocodingLog(
-        address=address,
-        status="FAILED",
-        error_message=error_message
+    """Buffers a failure; the buffer is written by flush_failures (every FAILURE_FLUSH_SIZE addresses)."""
+    now = datetime.datetime.utcnow()
+    with _failures_lock:
+        entry = _failures.get(address)
+        if entry:
+            entry[0] = error_message
+            entry[1] += 1
+            entry[3] = now
+        else:
+            _failures[address] = [error_message, 1, now, now]
+        full = len(_failures) >= FAILURE_FLUSH_SIZE
+    if full:
+        flush_failures()
+
+def flush_failures():
+    """
+    Writes buffered failures with one INSERT ... ON CONFLICT(address) DO UPDATE,
+    adding to the stored count. Returns the number of addresses written.
+    """
+    with _failures_lock:
+        pending = dict(_failures)
+        _failures.clear()
+    if not pending:
+        return 0
+
+    rows = [
+        {"address": address, "status": "FAILED", "error_message": error, "count": count,
+         "first_seen": first_seen, "last_seen": last_seen}
+        for address, (error, count, first_seen, last_seen) in pending.items()
+    ]
+    stmt = sqlite_insert(GeocodingLog)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["address"],
+        set_={
+            "status": stmt.excluded.status,
+            "error_message": stmt.excluded.error_message,
+            "count": GeocodingLog.count + stmt.excluded["count"],
+            "last_seen": stmt.excluded.last_seen,
+        },
     )
-    db.add(log)
-    db.commit()
-    db.close()
+    db = SessionLocal()
+    try:
+        db.connection().execute(stmt, rows)
+        db.commit()
+    finally:
+        db.close()
+    return len(rows)
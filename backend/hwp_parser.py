@@ -0,0 +1,374 @@
+import re
+import struct
+import zipfile
+import zlib
+import xml.etree.ElementTree as ET
+
+# Pure-Python text extraction for Hancom documents: HWP 5.x (OLE compound file with
+# zlib-compressed BodyText/SectionN record streams) and HWPX (zip of OWPML XML sections).
+# Both are read one section at a time, so memory follows the largest section, not the file.
+
+CFB_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_SIGNATURE = b"PK\x03\x04"
+HWP_SIGNATURE = b"HWP Document File"
+
+# Special sector numbers of the compound file allocation table
+ENDOFCHAIN = 0xFFFFFFFE
+NOSTREAM = 0xFFFFFFFF
+READ_CHUNK_SECTORS = 64 # Contiguous sectors read per call
+
+# FileHeader properties
+FLAG_COMPRESSED = 0x1
+FLAG_PASSWORD = 0x2
+FLAG_DISTRIBUTION = 0x4
+
+# Record tags (HWPTAG_BEGIN + n)
+TAG_PARA_TEXT = 0x10 + 51
+TAG_CTRL_HEADER = 0x10 + 55
+TAG_LIST_HEADER = 0x10 + 56
+TABLE_CTRL_ID = b" lbt" # 'tbl ' as a little-endian 4-char id
+
+# Paragraph text: controls 1-9, 11-12 and 14-23 take 8 UTF-16 units (code, 6 units of
+# payload, code); the rest of 0-31 take one. Tabs become "\t", other controls nothing.
+EXTENDED_CONTROL = re.compile(r"[\x01-\x09\x0b\x0c\x0e-\x17][\s\S]{7}")
+CHAR_CONTROLS = {0x09: "\t", 0x0a: " ", 0x18: "-", 0x1e: " ", 0x1f: " "}
+CHAR_CONTROLS.update({c: None for c in range(0x20) if c not in CHAR_CONTROLS})
+
+class CompoundFile:
+    """
+    Minimal reader for OLE2 / Compound File Binary files (the HWP 5 container).
+    Streams are looked up by path ("BodyText/Section0") and read lazily sector by sector.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        header = f.read(512)
+        if header[:8] != CFB_SIGNATURE:
+            raise ValueError("not a compound file")
+        self.sector_size = 1 << struct.unpack_from("<H", header, 0x1E)[0]
+        self.mini_sector_size = 1 << struct.unpack_from("<H", header, 0x20)[0]
+        (fat_count, dir_start, _, self.mini_cutoff, minifat_start, minifat_count,
+         difat_start, difat_count) = struct.unpack_from("<IIIIIIII", header, 0x2C)
+
+        # FAT sector numbers: 109 in the header, the rest in a chain of DIFAT sectors
+        fat_sectors = list(struct.unpack_from("<109I", header, 0x4C))
+        per_sector = self.sector_size // 4
+        sector = difat_start
+        for _ in range(difat_count):
+            if sector >= ENDOFCHAIN:
+                break
+            entries = struct.unpack(f"<{per_sector}I", self._sector(sector))
+            fat_sectors.extend(entries[:-1])
+            sector = entries[-1]
+        fat_sectors = [s for s in fat_sectors[:fat_count] if s < ENDOFCHAIN]
+        self.fat = []
+        for sector in fat_sectors:
+            self.fat.extend(struct.unpack(f"<{per_sector}I", self._sector(sector)))
+
+        self.entries = self._read_directory(b"".join(self._chain_data(dir_start)))
+        root = self.entries[0]
+        self.mini_stream_start = root["start"]
+        minifat = b"".join(self._chain_data(minifat_start)) if minifat_count else b""
+        self.minifat = list(struct.unpack(f"<{len(minifat) // 4}I", minifat[:len(minifat) // 4 * 4]))
+        self._mini_stream = None
+        self.paths = {}
+        self._index(root["child"], "")
+
+    def _sector(self, sector):
+        self.f.seek((sector + 1) * self.sector_size)
+        return self.f.read(self.sector_size)
+
+    def _chain(self, start, table):
+        # Sector numbers of a chain; bounded by the table size so a corrupt loop can't hang
+        sector = start
+        for _ in range(len(table) + 1):
+            if sector >= ENDOFCHAIN or sector >= len(table):
+                return
+            yield sector
+            sector = table[sector]
+        raise ValueError("sector chain loops")
+
+    def _chain_data(self, start):
+        # Chain contents in runs of contiguous sectors (one read per run)
+        run_start = previous = None
+        for sector in self._chain(start, self.fat):
+            if previous is not None and sector == previous + 1 and sector - run_start < READ_CHUNK_SECTORS:
+                previous = sector
+                continue
+            if run_start is not None:
+                yield self._read_run(run_start, previous)
+            run_start = previous = sector
+        if run_start is not None:
+            yield self._read_run(run_start, previous)
+
+    def _read_run(self, first, last):
+        self.f.seek((first + 1) * self.sector_size)
+        return self.f.read((last - first + 1) * self.sector_size)
+
+    def _read_directory(self, data):
+        entries = []
+        for offset in range(0, len(data) - 127, 128):
+            name_length, kind = struct.unpack_from("<HB", data, offset + 64)
+            left, right, child = struct.unpack_from("<III", data, offset + 68)
+            start, size = struct.unpack_from("<IQ", data, offset + 116)
+            if self.sector_size == 512:
+                size &= 0xFFFFFFFF # Version 3 files leave the high half undefined
+            name = data[offset:offset + max(0, name_length - 2)].decode("utf-16-le", "replace")
+            entries.append({
+                "name": name, "type": kind, "left": left, "right": right,
+                "child": child, "start": start, "size": size,
+            })
+        return entries
+
+    def _index(self, node, prefix):
+        # Walks each storage's sibling tree (iteratively; trees may be deep)
+        pending = [(node, prefix)]
+        seen = set()
+        while pending:
+            node, prefix = pending.pop()
+            if node == NOSTREAM or node >= len(self.entries) or node in seen:
+                continue
+            seen.add(node)
+            entry = self.entries[node]
+            path = prefix + entry["name"]
+            if entry["type"] == 2:
+                self.paths[path] = entry
+            elif entry["type"] == 1:
+                pending.append((entry["child"], path + "/"))
+            pending.append((entry["left"], prefix))
+            pending.append((entry["right"], prefix))
+
+    def listdir(self, storage):
+        """Stream names directly inside a storage, e.g. listdir("BodyText")."""
+        prefix = storage.rstrip("/") + "/"
+        return [path[len(prefix):] for path in self.paths if path.startswith(prefix) and "/" not in path[len(prefix):]]
+
+    def iter_stream(self, path):
+        """Yields the bytes of a stream in chunks."""
+        entry = self.paths.get(path)
+        if entry is None:
+            raise KeyError(path)
+        remaining = entry["size"]
+        if remaining < self.mini_cutoff:
+            if self._mini_stream is None:
+                self._mini_stream = b"".join(self._chain_data(self.mini_stream_start))
+            size = self.mini_sector_size
+            for sector in self._chain(entry["start"], self.minifat):
+                if remaining <= 0:
+                    return
+                chunk = self._mini_stream[sector * size:sector * size + min(size, remaining)]
+                remaining -= len(chunk)
+                yield chunk
+            return
+        for chunk in self._chain_data(entry["start"]):
+            if remaining <= 0:
+                return
+            chunk = chunk[:remaining]
+            remaining -= len(chunk)
+            yield chunk
+
+    def read(self, path):
+        return b"".join(self.iter_stream(path))
+
+def _inflate(chunks):
+    # Raw deflate, decompressed as the compressed chunks arrive
+    inflater = zlib.decompressobj(-15)
+    for chunk in chunks:
+        data = inflater.decompress(chunk)
+        if data:
+            yield data
+    data = inflater.flush()
+    if data:
+        yield data
+
+def _records(chunks):
+    """Yields (tag, level, payload) from a stream of record bytes."""
+    buffer = bytearray()
+    pos = 0
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            if len(buffer) - pos < 4:
+                break
+            header = int.from_bytes(buffer[pos:pos + 4], "little")
+            size = header >> 20
+            start = pos + 4
+            if size == 0xFFF:
+                if len(buffer) - start < 4:
+                    break
+                size = int.from_bytes(buffer[start:start + 4], "little")
+                start += 4
+            if len(buffer) - start < size:
+                break
+            yield header & 0x3FF, (header >> 10) & 0x3FF, bytes(buffer[start:start + size])
+            pos = start + size
+        del buffer[:pos]
+        pos = 0
+
+def _para_text(payload):
+    text = payload.decode("utf-16-le", "surrogatepass")
+    text = EXTENDED_CONTROL.sub(lambda m: "\t" if m.group()[0] == "\x09" else "", text)
+    text = text.translate(CHAR_CONTROLS)
+    return text.encode("utf-16-le", "surrogatepass").decode("utf-16-le", "replace").strip()
+
+class _TableText:
+    """Collects the cells of one table: cells of a row joined by tabs, one row per line."""
+
+    def __init__(self, level):
+        self.level = level
+        self.rows = []
+        self.row = None
+        self.cells = []
+        self.parts = None
+
+    def start_cell(self, row):
+        self.end_cell()
+        if row != self.row:
+            self.end_row()
+            self.row = row
+        self.parts = []
+
+    def end_cell(self):
+        if self.parts is not None:
+            self.cells.append(" ".join(p for p in self.parts if p))
+            self.parts = None
+
+    def end_row(self):
+        if self.cells:
+            self.rows.append("\t".join(self.cells))
+        self.cells = []
+
+    def add(self, text):
+        if self.parts is None:
+            self.parts = []
+        self.parts.append(text)
+
+    def text(self):
+        self.end_cell()
+        self.end_row()
+        return "\n".join(self.rows)
+
+def _section_lines(records):
+    """Text lines of one BodyText section; tables come out one row per line."""
+    tables = []
+    for tag, level, payload in records:
+        # Records at or above a table's control level close it
+        while tables and level <= tables[-1].level:
+            text = tables.pop().text()
+            if tables:
+                tables[-1].add(text.replace("\n", " "))
+            elif text:
+                yield from text.split("\n")
+        if tag == TAG_CTRL_HEADER and payload[:4] == TABLE_CTRL_ID:
+            tables.append(_TableText(level))
+        elif tag == TAG_LIST_HEADER and tables and level == tables[-1].level + 1:
+            # Table cell: paragraph list header, then column / row address
+            row = struct.unpack_from("<H", payload, 10)[0] if len(payload) >= 12 else None
+            tables[-1].start_cell(row)
+        elif tag == TAG_PARA_TEXT:
+            text = _para_text(payload)
+            if tables:
+                tables[-1].add(text)
+            elif text:
+                yield text
+    while tables:
+        text = tables.pop().text()
+        if tables:
+            tables[-1].add(text.replace("\n", " "))
+        elif text:
+            yield from text.split("\n")
+
+def _section_number(name):
+    match = re.search(r"(\d+)", name)
+    return int(match.group(1)) if match else 0
+
+def iter_hwp5_sections(file_path):
+    """Yields the text of each BodyText section of an HWP 5.x file, in order."""
+    with open(file_path, "rb") as f:
+        cfb = CompoundFile(f)
+        header = cfb.read("FileHeader")
+        if not header.startswith(HWP_SIGNATURE):
+            raise ValueError("not an HWP 5 document")
+        flags = struct.unpack_from("<I", header, 36)[0]
+        if flags & (FLAG_PASSWORD | FLAG_DISTRIBUTION):
+            # Distribution (배포용) and password-protected documents keep their text encrypted
+            raise ValueError("encrypted HWP document")
+
+        for name in sorted(cfb.listdir("BodyText"), key=_section_number):
+            chunks = cfb.iter_stream(f"BodyText/{name}")
+            if flags & FLAG_COMPRESSED:
+                chunks = _inflate(chunks)
+            yield "\n".join(_section_lines(_records(chunks)))
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+def _run_text(t):
+    # <hp:t> text with its inline children: <hp:tab/>, <hp:lineBreak/>, markers with tails
+    parts = [t.text or ""]
+    for child in t:
+        name = _local(child.tag)
+        if name == "tab":
+            parts.append("\t")
+        elif name == "lineBreak":
+            parts.append(" ")
+        else:
+            parts.append("".join(child.itertext()))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+def _hwpx_section_lines(source):
+    """Text lines of one HWPX section XML; tables come out one row per line."""
+    paragraphs = [] # Run texts of the open (possibly nested) paragraphs
+    tables = []
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        name = _local(elem.tag)
+        if event == "start":
+            if name == "p":
+                paragraphs.append([])
+            elif name == "tbl":
+                tables.append(_TableText(len(paragraphs)))
+            elif name == "tc" and tables:
+                tables[-1].start_cell(None)
+            elif name == "tr" and tables:
+                tables[-1].end_cell()
+                tables[-1].end_row()
+            continue
+
+        if name == "t" and paragraphs:
+            paragraphs[-1].append(_run_text(elem))
+        elif name == "p" and paragraphs:
+            text = "".join(paragraphs.pop()).strip()
+            if tables and len(paragraphs) >= tables[-1].level:
+                tables[-1].add(text)
+            elif text:
+                yield text
+            if not paragraphs:
+                elem.clear() # Top-level paragraph done; keep memory flat
+        elif name == "tbl" and tables:
+            text = tables.pop().text()
+            if tables:
+                tables[-1].add(text.replace("\n", " "))
+            elif text:
+                yield from text.split("\n")
+
+def iter_hwpx_sections(file_path):
+    """Yields the text of each Contents/sectionN.xml of an HWPX file, in order."""
+    with zipfile.ZipFile(file_path) as archive:
+        names = [
+            name for name in archive.namelist()
+            if re.fullmatch(r"Contents/section\d+\.xml", name, re.IGNORECASE)
+        ]
+        for name in sorted(names, key=_section_number):
+            with archive.open(name) as source:
+                yield "\n".join(_hwpx_section_lines(source))
+
+def iter_hwp_sections(file_path):
+    """Section texts of an HWP 5.x or HWPX file, whichever the file's signature says it is."""
+    with open(file_path, "rb") as f:
+        signature = f.read(8)
+    if signature == CFB_SIGNATURE:
+        return iter_hwp5_sections(file_path)
+    if signature.startswith(ZIP_SIGNATURE):
+        return iter_hwpx_sections(file_path)
+    raise ValueError("not an HWP or HWPX document")
@@ -1,9 +1,15 @@
-from fastapi import FastAPI, Depends, BackgroundTasks
+from fastapi import FastAPI, Depends, Query, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from database import init_db, SessionLocal, HousingNotice
+from database import init_db, SessionLocal, run_serialized
+from notice_search import search_notices
+from notice_query import list_notices, parse_fields, MAX_LIMIT
+from schemas import NoticeOut, NoticePage
 from scheduler import start_scheduler
+from typing import List, Literal
 import contextlib
+import orjson
+import traceback
 
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,22 +38,55 @@ def get_db():
 def read_root():
     return {"message": "Seoul Rental Housing Analysis Server"}
 
-@app.get("/notices")
+@app.get("/notices", response_model=NoticePage)
 def get_notices(
-    skip: int = 0, 
-    limit: int = 100, 
+    cursor: str = None,
+    limit: int = Query(20, ge=1, le=MAX_LIMIT),
+    sort: Literal["latest", "score", "deadline"] = "latest",
+    region: str = None,
+    platform: str = None,
+    target_group: str = None,
+    active: bool = False,
+    min_score: float = None,
+    max_score: float = None,
+    fields: str = Query(None, description="Comma-separated NoticeOut fields, e.g. id,title,region,score"),
     db: Session = Depends(get_db),
-    region: str = None
 ):
-    query = db.query(HousingNotice)
-    if region:
-        query = query.filter(HousingNotice.region == region)
-    
-    notices = query.offset(skip).limit(limit).all()
-    return notices
+    # Keyset pages: pass next_cursor back (with the same sort) for the following page
+    try:
+        items, next_cursor = list_notices(
+            db, sort=sort, cursor=cursor, limit=limit, region=region, platform=platform,
+            target_group=target_group, active=active, min_score=min_score, max_score=max_score,
+            fields=parse_fields(fields),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Rows are already plain dicts of column values: encoded by orjson in one call instead
+    # of validated field by field (NoticePage documents the shape)
+    return Response(orjson.dumps({"items": items, "next_cursor": next_cursor}), media_type="application/json")
+
+@app.get("/notices/search", response_model=List[NoticeOut])
+def search(
+    q: str = Query(..., min_length=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    # Ranked substring / keyword search; replaces filtering the whole dataset in the browser.
+    # Plain row dicts like /notices, so encoded the same way
+    return Response(orjson.dumps(search_notices(db, q, limit=limit, offset=skip)), media_type="application/json")
+
+def log_job_failure(future):
+    # Nobody waits on a job queued by a request, so its exception is reported here
+    if future.cancelled() or future.exception() is None:
+        return
+    error = future.exception()
+    print(f"Background job failed: {error!r}")
+    traceback.print_exception(type(error), error, error.__traceback__)
 
 @app.post("/force-scrape")
-def force_scrape(background_tasks: BackgroundTasks):
+def force_scrape():
     from scraper import run_scraping_job
-    background_tasks.add_task(run_scraping_job)
+    # Queued behind any running job on the database writer thread
+    run_serialized(run_scraping_job).add_done_callback(log_job_failure)
     return {"message": "Scraping job started in background"}
@@ -0,0 +1,119 @@
+import base64
+import binascii
+import json
+from datetime import datetime, time
+from sqlalchemy import DateTime, tuple_
+from database import HousingNotice, AnalysisResult
+from schemas import NOTICE_FIELDS
+
+# GET /notices sort orders: (key, tie-break id, descending). The tie-break is the
+# notice id, taken from the table whose index holds (key, id) so SQLite walks it
+# without sorting. Notices without a key (no deadline, not scored yet) come last.
+SORTS = {
+    "latest": (HousingNotice.notice_date, HousingNotice.id, True),
+    "deadline": (HousingNotice.end_date, HousingNotice.id, False),
+    "score": (AnalysisResult.score, AnalysisResult.notice_id, True),
+}
+MAX_LIMIT = 100
+
+def encode_cursor(sort, value, notice_id):
+    """Opaque next-page token: the sort key and id of the last notice returned."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, value, notice_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(token, sort):
+    """(sort key, id) of a cursor made by encode_cursor for the same sort. ValueError otherwise."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        name, value, notice_id = json.loads(raw)
+        if name != sort:
+            raise ValueError(f"cursor is for sort={name}")
+        if value is not None and isinstance(SORTS[sort][0].type, DateTime):
+            value = datetime.fromisoformat(value)
+        return value, int(notice_id)
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+def parse_fields(value):
+    """fields= query value ("id,title,score") -> list of NOTICE_FIELDS, id first. ValueError if unknown."""
+    if not value:
+        return list(NOTICE_FIELDS)
+    requested = [f.strip() for f in value.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in NOTICE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return ["id"] + [f for f in dict.fromkeys(requested) if f != "id"]
+
+def list_notices(
+    db, sort="latest", cursor=None, limit=20, region=None, platform=None,
+    target_group=None, active=False, min_score=None, max_score=None, now=None, fields=None,
+):
+    """
+    One page of notices as dicts and the cursor of the next page (None on the last
+    page). Filters run in SQL; pages are keyset-paginated on (sort key, id), so page
+    1000 costs the same index seek as page 1.
+
+    Only the columns in `fields` (default: all NOTICE_FIELDS; must include "id") are
+    selected, as plain tuples; analysis_results is joined only when the score is
+    shown, sorted or filtered.
+
+    region is a prefix ("강남" matches "강남구"); active keeps notices whose end_date
+    is today or later; min_score / max_score bound the analysis score.
+    """
+    if sort not in SORTS:
+        raise ValueError(f"Unknown sort: {sort}")
+    key, tiebreak, descending = SORTS[sort]
+    after = decode_cursor(cursor, sort) if cursor else None
+    fields = fields or NOTICE_FIELDS
+    names = [f for f in fields if f != "score"]
+    columns = [getattr(HousingNotice, f) for f in names]
+    if "score" in fields:
+        names.append("score")
+        columns.append(AnalysisResult.score)
+
+    # Rows are (fields..., sort_key) tuples
+    query = db.query(*columns, key.label("sort_key"))
+    if "score" in fields or sort == "score" or min_score is not None or max_score is not None:
+        query = query.outerjoin(AnalysisResult, AnalysisResult.notice_id == HousingNotice.id)
+    if region:
+        # Range instead of LIKE so an index on region can serve it
+        query = query.filter(HousingNotice.region >= region, HousingNotice.region < region + "\uffff")
+    if platform:
+        query = query.filter(HousingNotice.platform == platform.upper())
+    if target_group:
+        query = query.filter(HousingNotice.target_group == target_group)
+    if active:
+        today = datetime.combine((now or datetime.now()).date(), time.min)
+        query = query.filter(HousingNotice.end_date >= today)
+    if min_score is not None:
+        query = query.filter(AnalysisResult.score >= min_score)
+    if max_score is not None:
+        query = query.filter(AnalysisResult.score <= max_score)
+
+    def direction(column):
+        return column.desc() if descending else column.asc()
+
+    def past(left, right):
+        return left < right if descending else left > right
+
+    # Notices with a key, in key order, then the ones without, in id order
+    rows = []
+    if after is None or after[0] is not None:
+        keyed = query.filter(key.isnot(None))
+        if after:
+            keyed = keyed.filter(past(tuple_(key, tiebreak), tuple_(*after)))
+        rows = keyed.order_by(direction(key), direction(tiebreak)).limit(limit + 1).all()
+    if len(rows) <= limit:
+        unkeyed = query.filter(key.is_(None))
+        if after and after[0] is None:
+            unkeyed = unkeyed.filter(past(HousingNotice.id, after[1]))
+        rows += unkeyed.order_by(direction(HousingNotice.id)).limit(limit + 1 - len(rows)).all()
+
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor(sort, last.sort_key, last.id)
+    return [dict(zip(names, row)) for row in page], next_cursor
@@ -0,0 +1,70 @@
+from sqlalchemy import text
+from database import HousingNotice, AnalysisResult, SEARCH_COLUMNS
+from schemas import NOTICE_FIELDS
+
+# bm25 weights in SEARCH_COLUMNS order: a hit in the title counts most
+COLUMN_WEIGHTS = [10.0, 4.0, 4.0, 1.0, 1.0, 1.0]
+MIN_TRIGRAM_LENGTH = 3 # Shorter terms cannot be looked up in a trigram index
+MAX_TERMS = 8
+
+# Same row shape as notice_query.list_notices: NoticeOut's fields, score from analysis_results
+RESULT_FIELDS = [f for f in NOTICE_FIELDS if f != "score"] + ["score"]
+RESULT_COLUMNS = [HousingNotice.__table__.c[f] for f in RESULT_FIELDS[:-1]] + [AnalysisResult.__table__.c.score]
+SELECT_LIST = ", ".join(f"{c.table.name}.{c.name}" for c in RESULT_COLUMNS)
+SCORE_JOIN = "LEFT JOIN analysis_results ON analysis_results.notice_id = housing_notices.id"
+
+def split_terms(q):
+    """Whitespace-separated terms -> (indexed terms, short terms), duplicates dropped."""
+    terms = list(dict.fromkeys(q.split()))[:MAX_TERMS]
+    return (
+        [t for t in terms if len(t) >= MIN_TRIGRAM_LENGTH],
+        [t for t in terms if len(t) < MIN_TRIGRAM_LENGTH],
+    )
+
+def match_expression(terms):
+    # Each term is a quoted string (substring match under trigram); all must occur
+    return " AND ".join('"%s"' % t.replace('"', '""') for t in terms)
+
+def like_pattern(term):
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def search_notices(db, q, limit=20, offset=0):
+    """
+    Notices containing every term of `q` in the title, address, region or summaries,
+    best match first (bm25 over the notice_search FTS5 index), as dicts of NoticeOut
+    fields with the analysis score.
+
+    Terms of 3+ characters are looked up in the trigram index as substrings. 1-2
+    character terms ("강남", "LH") have no trigram, so they filter with LIKE; if the
+    query has only such terms, notices are scanned and the newest come first.
+    """
+    indexed, short = split_terms(q or "")
+    if not indexed and not short:
+        return []
+
+    params = {"limit": limit, "offset": offset}
+    where = []
+    for n, term in enumerate(short):
+        params[f"short_{n}"] = like_pattern(term)
+        where.append("(" + " OR ".join(
+            f"housing_notices.{c} LIKE :short_{n} ESCAPE '\\'" for c in SEARCH_COLUMNS
+        ) + ")")
+
+    if indexed:
+        params["match"] = match_expression(indexed)
+        weights = ", ".join(str(w) for w in COLUMN_WEIGHTS)
+        sql = (
+            f"SELECT {SELECT_LIST} FROM notice_search "
+            f"JOIN housing_notices ON housing_notices.id = notice_search.rowid {SCORE_JOIN} "
+            f"WHERE notice_search MATCH :match {''.join(' AND ' + w for w in where)} "
+            f"ORDER BY bm25(notice_search, {weights}), housing_notices.id DESC "
+            "LIMIT :limit OFFSET :offset"
+        )
+    else:
+        sql = (
+            f"SELECT {SELECT_LIST} FROM housing_notices {SCORE_JOIN} WHERE {' AND '.join(where)} "
+            "ORDER BY housing_notices.id DESC LIMIT :limit OFFSET :offset"
+        )
+    rows = db.execute(text(sql).bindparams(**params).columns(*RESULT_COLUMNS))
+    return [dict(zip(RESULT_FIELDS, row)) for row in rows]
@@ -0,0 +1,195 @@
+from database import HousingNotice, NoticeUnit
+from geocoder import geocode_batch
+from analyzer import effective_monthly_cost
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from datetime import datetime
+import hashlib
+
+# Scrapers fall back to these when a row has no real detail link,
+# so the link says nothing about identity and the content is hashed instead.
+SYNTHETIC_LINK_PREFIXES = (
+    "https://www.google.com/search",
+    "https://www.i-sh.co.kr/mock/",
+)
+LOOKUP_BATCH_SIZE = 500 # Keys per IN (...) lookup
+
+# Columns refreshed when an already stored notice is scraped again
+UPDATE_COLUMNS = [
+    "title", "link", "notice_date", "start_date", "end_date", "region", "address",
+    "deposit", "rent", "area", "effective_monthly_cost", "lat", "lng",
+    "summary_qualifications", "summary_income", "summary_assets",
+]
+
+def normalize_link(link):
+    """Lowercases scheme/host, drops the fragment and trailing slash, sorts the query."""
+    parts = urlsplit(link.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+def notice_dedup_key(item):
+    """
+    Dedup key of a scraped item: platform + normalized link, or platform + a hash
+    of (title, region) when the link is missing or a synthetic fallback.
+    """
+    platform = (item.get("platform") or "").upper()
+    link = (item.get("link") or "").strip()
+    if link and not link.startswith(SYNTHETIC_LINK_PREFIXES):
+        return f"{platform}:{normalize_link(link)}"
+    content = f"{item.get('title', '').strip()}|{item.get('region') or ''}"
+    return f"{platform}:sha1:{hashlib.sha1(content.encode('utf-8')).hexdigest()}"
+
+def parse_notice_date(value):
+    # Parse notice_date if it's a string
+    if isinstance(value, str):
+        try:
+            return datetime.strptime(value, "%Y-%m-%d")
+        except ValueError:
+            return datetime.utcnow() # Fallback
+    return value or datetime.utcnow()
+
+def load_existing(db, keys):
+    """{dedup_key: (address, lat, lng)} for the keys already stored, in batched IN lookups."""
+    keys = list(keys)
+    existing = {}
+    for i in range(0, len(keys), LOOKUP_BATCH_SIZE):
+        rows = db.query(
+            HousingNotice.dedup_key, HousingNotice.address, HousingNotice.lat, HousingNotice.lng
+        ).filter(HousingNotice.dedup_key.in_(keys[i:i + LOOKUP_BATCH_SIZE]))
+        for key, address, lat, lng in rows:
+            existing[key] = (address, lat, lng)
+    return existing
+
+def backfill_dedup_keys(db):
+    """Gives rows stored before dedup_key existed their key, so they match new scrapes."""
+    rows = db.query(
+        HousingNotice.id, HousingNotice.platform, HousingNotice.link,
+        HousingNotice.title, HousingNotice.region
+    ).filter(HousingNotice.dedup_key.is_(None)).all()
+    if rows:
+        db.bulk_update_mappings(HousingNotice, [
+            {"id": r.id, "dedup_key": notice_dedup_key(r._asdict())} for r in rows
+        ])
+    return len(rows)
+
+def replace_units(db, units_by_key):
+    """
+    Stores the rent table rows of saved notices ({dedup_key: [unit dict, ...]}),
+    replacing the ones stored before. A notice whose units are unchanged keeps its
+    rows (and their scores). Returns the number of unit rows written.
+    """
+    keys = list(units_by_key)
+    ids = {}
+    for i in range(0, len(keys), LOOKUP_BATCH_SIZE):
+        rows = db.query(HousingNotice.dedup_key, HousingNotice.id).filter(
+            HousingNotice.dedup_key.in_(keys[i:i + LOOKUP_BATCH_SIZE])
+        )
+        ids.update(rows)
+
+    notice_ids = list(ids.values())
+    stored = {}
+    for i in range(0, len(notice_ids), LOOKUP_BATCH_SIZE):
+        for unit in db.query(
+            NoticeUnit.notice_id, NoticeUnit.unit_type, NoticeUnit.area, NoticeUnit.deposit, NoticeUnit.rent
+        ).filter(NoticeUnit.notice_id.in_(notice_ids[i:i + LOOKUP_BATCH_SIZE])).order_by(NoticeUnit.id):
+            stored.setdefault(unit.notice_id, []).append(tuple(unit[1:]))
+
+    rows = []
+    changed = []
+    for key, units in units_by_key.items():
+        notice_rows = []
+        for unit in units:
+            deposit = round(unit["deposit"]) if unit.get("deposit") is not None else None
+            rent = round(unit["rent"]) if unit.get("rent") is not None else None
+            notice_rows.append({
+                "notice_id": ids[key],
+                "unit_type": unit.get("unit_type"),
+                "area": unit.get("area"),
+                "deposit": deposit,
+                "rent": rent,
+                "effective_monthly_cost": round(effective_monthly_cost(deposit or 0, rent or 0)),
+            })
+        content = [(r["unit_type"], r["area"], r["deposit"], r["rent"]) for r in notice_rows]
+        if content != stored.get(ids[key], []):
+            changed.append(ids[key])
+            rows += notice_rows
+
+    for i in range(0, len(changed), LOOKUP_BATCH_SIZE):
+        db.query(NoticeUnit).filter(
+            NoticeUnit.notice_id.in_(changed[i:i + LOOKUP_BATCH_SIZE])
+        ).delete(synchronize_session=False)
+    if rows:
+        db.connection().execute(NoticeUnit.__table__.insert(), rows)
+    return len(rows)
+
+def upsert_notices(db, items, geocode=geocode_batch):
+    """
+    Saves a batch of scraped items with one existence lookup and one
+    INSERT ... ON CONFLICT(dedup_key) DO UPDATE, so changed notices are refreshed
+    instead of skipped. Only new notices (or ones whose address changed) are geocoded,
+    all in one `geocode(addresses) -> {address: (lat, lng)}` call before the insert.
+    Items carrying a "units" list (rent table rows) get their stored units replaced.
+    Returns (inserted, updated).
+    """
+    # Last occurrence wins for duplicates inside the batch
+    by_key = {}
+    for item in items:
+        by_key[notice_dedup_key(item)] = item
+    if not by_key:
+        return 0, 0
+
+    existing = load_existing(db, by_key.keys())
+
+    to_geocode = [
+        item.get("address") for key, item in by_key.items()
+        if item.get("address") and (key not in existing or existing[key][0] != item.get("address"))
+    ]
+    coordinates = geocode(to_geocode) if geocode and to_geocode else {}
+
+    rows = []
+    for key, item in by_key.items():
+        address = item.get("address")
+        stored = existing.get(key)
+        if stored and stored[0] == address:
+            lat, lng = stored[1], stored[2]
+        elif address in coordinates:
+            lat, lng = coordinates[address]
+        else:
+            lat, lng = 0.0, 0.0
+
+        rows.append({
+            "dedup_key": key,
+            "title": item["title"],
+            "platform": item["platform"],
+            "link": item["link"],
+            "notice_date": parse_notice_date(item.get("date")),
+            "start_date": item.get("start_date"),
+            "end_date": item.get("end_date"),
+            "region": item.get("region"),
+            "address": address,
+            "deposit": item.get("deposit"),
+            "rent": item.get("rent"),
+            "area": item.get("area"),
+            "effective_monthly_cost": round(effective_monthly_cost(item.get("deposit") or 0, item.get("rent") or 0)),
+            "lat": lat,
+            "lng": lng,
+            "summary_qualifications": item.get("qualifications"),
+            "summary_income": item.get("income"),
+            "summary_assets": item.get("assets"),
+            "created_at": datetime.utcnow(),
+        })
+
+    stmt = sqlite_insert(HousingNotice)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["dedup_key"],
+        set_={col: stmt.excluded[col] for col in UPDATE_COLUMNS},
+    )
+    db.connection().execute(stmt, rows)
+    units = {key: item["units"] for key, item in by_key.items() if item.get("units") is not None}
+    if units:
+        replace_units(db, units)
+    db.commit()
+
+    updated = len(existing)
+    return len(rows) - updated, updated
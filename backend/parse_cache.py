@@ -0,0 +1,122 @@
+from file_parser import PARSER_VERSION, parse_document, extract_sections
+import hashlib
+import json
+import os
+import tempfile
+
+# Parsed announcements, keyed by the SHA-256 of the file bytes and PARSER_VERSION
+PARSE_CACHE_DIR = os.getenv(
+    "PARSE_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "parse_cache")
+)
+PARSE_CACHE_MAX_BYTES = int(float(os.getenv("PARSE_CACHE_MAX_MB", "256")) * 1024 * 1024)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def file_sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ParseCache:
+    """
+    On-disk cache of {"text", "sections"} per document content. Entries are JSON files
+    under <directory>/<sha[:2]>/<sha>.v<PARSER_VERSION>.json, so a parser change misses
+    the old entries; reading one bumps its mtime, and the least recently used entries
+    (old versions included) are deleted once the directory exceeds max_bytes.
+    Hit / miss counters cover the lifetime of the instance (one collection run).
+    """
+
+    def __init__(self, directory=PARSE_CACHE_DIR, max_bytes=PARSE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None # Total bytes on disk, computed on first write
+
+    def _path(self, digest):
+        return os.path.join(self.directory, digest[:2], f"{digest}.v{PARSER_VERSION}.json")
+
+    def get(self, digest):
+        path = self._path(digest)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(path) # Recently used
+        return entry
+
+    def put(self, digest, entry):
+        path = self._path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+        # Write to a temp file and rename, so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if self._size is None:
+            self._size = self._disk_usage()
+        elif os.path.exists(path):
+            self._size -= os.path.getsize(path)
+        os.replace(tmp, path)
+        self._size += len(data)
+
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    stat = os.stat(path)
+                    yield stat.st_mtime, stat.st_size, path
+
+    def _disk_usage(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Deletes least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self._entries())
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            os.remove(path)
+            self._size -= size
+
+    def parse(self, file_path):
+        """{"text", "sections"} for a document, from the cache when its bytes were seen before."""
+        digest = file_sha256(file_path)
+        entry = self.get(digest)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        text = parse_document(file_path)
+        entry = {"text": text, "sections": extract_sections(text)}
+        if text.strip():
+            # Empty text is an unsupported or failed parse; retry it next run
+            self.put(digest, entry)
+        return entry
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+def parse_documents(file_paths, cache=None):
+    """
+    Parses downloaded announcements through the cache and reports this run's hit rate.
+    Library entry point: no collection job downloads announcement files yet.
+    """
+    cache = cache or ParseCache()
+    results = {path: cache.parse(path) for path in file_paths}
+    print(f"Parse cache: {cache.stats()}")
+    return results
@@ -2,88 +2,378 @@ import requests
 import os
 import datetime
 import math
+import json
+import hashlib
+import statistics
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from database import SessionLocal, MarketTransaction, MarketPrice, IngestState
 
 # SEOUL_DATA_KEY should be set in environment variables
 SEOUL_DATA_KEY = os.getenv("SEOUL_DATA_KEY", "")
+SEOUL_API_BASE = os.getenv("SEOUL_API_BASE", "http://openapi.seoul.go.kr:8088")
+SERVICE_NAME = "tbLnOpendataRtmsV"
+
+PAGE_SIZE = 1000 # API maximum per request
+INSERT_BATCH_SIZE = 500
+AREA_BUCKET_SIZE = 5 # m2 per bucket
+AGGREGATE_BUCKET_SIZE = 10 # m2 per market_prices bucket (a multiple of AREA_BUCKET_SIZE)
+ALL_TYPES = "ALL" # market_prices.building_type of the all-types rollup
+AREA_TOLERANCE = 0.2 # +/- 20% around the target area
+
+# HOUSE_TYPE values published by the API. Querying with an explicit IN list keeps the
+# (legal_dong, house_type, area_bucket) index usable when no type is requested.
+HOUSE_TYPES = ("아파트", "오피스텔", "연립다세대", "단독다가구")
+
+def area_bucket(area_m2):
+    return int(float(area_m2) // AREA_BUCKET_SIZE)
+
+def aggregate_bucket(area_m2):
+    return int(float(area_m2) // AGGREGATE_BUCKET_SIZE)
+
+def build_request_url(start, end, key=None):
+    """
+    Builds a paged request URL for tbLnOpendataRtmsV (1-based, inclusive range).
+    e.g. http://openapi.seoul.go.kr:8088/{KEY}/json/tbLnOpendataRtmsV/1/1000/
+    """
+    key = key or SEOUL_DATA_KEY
+    return f"{SEOUL_API_BASE}/{key}/json/{SERVICE_NAME}/{start}/{end}/"
+
+def fetch_page(start, end, session=None):
+    """
+    Fetches one page from the API.
+    Returns (rows, total_count). Raises on HTTP or payload errors so that
+    ingest jobs never record a partial run as complete.
+    """
+    http = session or requests
+    response = http.get(build_request_url(start, end), timeout=30)
+    response.raise_for_status()
+    data = response.json()
+    if SERVICE_NAME not in data:
+        # e.g. {"RESULT": {"CODE": "INFO-200", "MESSAGE": "해당하는 데이터가 없습니다."}}
+        result = data.get("RESULT", {})
+        if result.get("CODE") == "INFO-200":
+            return [], 0
+        raise ValueError(f"Unexpected API response: {result}")
+    body = data[SERVICE_NAME]
+    return body.get("row", []), int(body.get("list_total_count", 0))
+
+def iter_api_pages(page_size=PAGE_SIZE, session=None):
+    """Pages through the whole transaction dataset, newest first."""
+    start = 1
+    while True:
+        rows, total = fetch_page(start, start + page_size - 1, session=session)
+        if not rows:
+            return
+        yield rows
+        start += page_size
+        if start > total:
+            return
+
+def iter_fixture_pages(path):
+    """
+    Reads a recorded dump of API responses for offline runs.
+    The file holds either one response object or a list of them.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = [data]
+    for page in data:
+        yield page.get(SERVICE_NAME, {}).get("row", [])
+
+def _to_int(value):
+    try:
+        return int(str(value).replace(",", "").strip() or 0)
+    except ValueError:
+        return 0
+
+def _deal_ymd(item):
+    return str(item.get("DEAL_YMD") or item.get("CNTRCT_DE") or "")
+
+def normalize_row(item):
+    """
+    Converts a raw API row into MarketTransaction column values.
+    Returns None for rows that can't be matched against notices (no dong / area).
+    """
+    legal_dong = (item.get("BJDONG_NM") or "").strip()
+    try:
+        area = float(item.get("BLDG_AREA") or item.get("RENT_AREA") or 0)
+    except ValueError:
+        return None
+    if not legal_dong or area <= 0:
+        return None
+
+    row_key = hashlib.sha1(
+        json.dumps(item, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+    return {
+        "row_key": row_key,
+        "region_code": item.get("SGG_CD"),
+        "legal_dong": legal_dong,
+        "house_type": (item.get("HOUSE_TYPE") or item.get("HOUSE_GBN_NM") or "").strip(),
+        "area": area,
+        "area_bucket": area_bucket(area),
+        "deposit": _to_int(item.get("RENT_GTN", 0)), # 보증금
+        "rent": _to_int(item.get("RENT_FEE", 0)), # 월세
+        "deal_ymd": _deal_ymd(item),
+    }
+
+def upsert_transactions(db, rows):
+    """Inserts normalized rows in batches, ignoring rows that are already stored."""
+    saved = 0
+    for i in range(0, len(rows), INSERT_BATCH_SIZE):
+        batch = rows[i:i + INSERT_BATCH_SIZE]
+        stmt = sqlite_insert(MarketTransaction).values(batch)
+        stmt = stmt.on_conflict_do_nothing(index_elements=["row_key"])
+        saved += db.execute(stmt).rowcount
+    return saved
+
+def pages_until_watermark(pages, watermark):
+    """
+    Filters newest-first pages down to rows at or after the watermark and stops
+    consuming (i.e. stops fetching) at the first page that reaches it.
+    Rows on the watermark date itself are re-read; the row_key upsert drops the ones already stored.
+    """
+    for rows in pages:
+        newer = [item for item in rows if _deal_ymd(item) >= watermark]
+        if newer:
+            yield newer
+        if len(newer) < len(rows):
+            return
+
+def get_watermark(db):
+    state = db.query(IngestState).filter(IngestState.name == SERVICE_NAME).first()
+    return state.watermark if state else None
+
+def set_watermark(db, watermark):
+    stmt = sqlite_insert(IngestState).values(
+        name=SERVICE_NAME, watermark=watermark, updated_at=datetime.datetime.utcnow()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"watermark": stmt.excluded.watermark, "updated_at": stmt.excluded.updated_at},
+    )
+    db.execute(stmt)
+
+def _summarize(rows):
+    """count / mean / median / p25 / p75 of deposit and rent for a list of transactions."""
+    stats = {"count": len(rows), "region_code": rows[0].region_code}
+    for field in ("deposit", "rent"):
+        values = sorted(getattr(r, field) for r in rows)
+        if len(values) > 1:
+            p25, median, p75 = statistics.quantiles(values, n=4, method="inclusive")
+        else:
+            p25 = median = p75 = values[0]
+        stats[f"avg_{field}"] = round(statistics.fmean(values))
+        stats[f"median_{field}"] = round(median)
+        stats[f"p25_{field}"] = round(p25)
+        stats[f"p75_{field}"] = round(p75)
+    return stats
+
+def refresh_aggregates(db, keys):
+    """
+    Recomputes market_prices for the given (legal_dong, house_type, aggregate bucket) keys
+    and their "ALL" rollups, so an ingest only touches the dongs/buckets it received.
+    Returns the number of aggregate rows created or changed.
+    """
+    ratio = AGGREGATE_BUCKET_SIZE // AREA_BUCKET_SIZE
+    targets = set(keys) | {(dong, ALL_TYPES, bucket) for dong, _, bucket in keys}
+    refreshed = 0
+
+    for legal_dong, building_type, bucket in targets:
+        types = list(HOUSE_TYPES) if building_type == ALL_TYPES else [building_type]
+        rows = db.query(
+            MarketTransaction.region_code, MarketTransaction.deposit, MarketTransaction.rent
+        ).filter(
+            MarketTransaction.legal_dong == legal_dong,
+            MarketTransaction.house_type.in_(types),
+            MarketTransaction.area_bucket.between(bucket * ratio, bucket * ratio + ratio - 1),
+        ).all()
+        if not rows:
+            continue
+
+        stats = _summarize(rows)
+        existing = db.query(MarketPrice).filter(
+            MarketPrice.legal_name == legal_dong,
+            MarketPrice.building_type == building_type,
+            MarketPrice.area_bucket == bucket,
+        ).first()
+
+        if existing is None:
+            db.add(MarketPrice(
+                legal_name=legal_dong, building_type=building_type, area_bucket=bucket, version=1, **stats
+            ))
+        elif any(getattr(existing, k) != v for k, v in stats.items()):
+            for k, v in stats.items():
+                setattr(existing, k, v)
+            existing.version = (existing.version or 0) + 1
+            existing.updated_at = datetime.datetime.utcnow()
+        else:
+            continue
+        refreshed += 1
+
+    return refreshed
+
+def ingest_transactions(pages, db=None):
+    """
+    Stores every page of raw rows into market_transactions and refreshes the
+    market_prices aggregates of every key the pages touched.
+    Returns (number of newly inserted rows, newest DEAL_YMD seen).
+    """
+    own_session = db is None
+    db = db or SessionLocal()
+    saved = 0
+    newest = ""
+    touched = set()
+    try:
+        for rows in pages:
+            normalized = [r for r in (normalize_row(item) for item in rows) if r]
+            saved += upsert_transactions(db, normalized)
+            db.commit()
+            newest = max([newest] + [r["deal_ymd"] for r in normalized])
+            touched.update(
+                (r["legal_dong"], r["house_type"], aggregate_bucket(r["area"])) for r in normalized
+            )
+
+        if saved:
+            refreshed = refresh_aggregates(db, touched)
+            db.commit()
+            print(f"Refreshed {refreshed} market aggregates.")
+    finally:
+        if own_session:
+            db.close()
+    return saved, newest
+
+def run_market_ingest_job(fixture_path=None, incremental=False):
+    """
+    Bulk-loads the transaction dataset into the local store.
+    With fixture_path the run works fully offline against a recorded dump.
+    With incremental=True only rows newer than the stored watermark are fetched.
+    """
+    print("Job Started: Market Transaction Ingest")
+    if fixture_path:
+        pages = iter_fixture_pages(fixture_path)
+    else:
+        if not SEOUL_DATA_KEY:
+            print("SEOUL_DATA_KEY is missing. Skipping ingest.")
+            return 0
+        pages = iter_api_pages()
+
+    db = SessionLocal()
+    try:
+        watermark = get_watermark(db) if incremental else None
+        if watermark:
+            print(f"Incremental mode: fetching rows since {watermark}")
+            pages = pages_until_watermark(pages, watermark)
+
+        saved, newest = ingest_transactions(pages, db=db)
+        if newest and newest > (get_watermark(db) or ""):
+            set_watermark(db, newest)
+            db.commit()
+    finally:
+        db.close()
+
+    print(f"Job Finished. Stored {saved} new transactions.")
+    return saved
+
+def get_market_price(legal_dong, area_m2, house_type=None, db=None):
+    """
+    Returns average deposit/rent (만원) for similar area in the legal dong.
+    Answers from the local market_transactions store filled by run_market_ingest_job,
+    using the (legal_dong, house_type, area_bucket) index.
+    """
+    empty = {"avg_deposit": 0, "avg_rent": 0}
+    if not legal_dong:
+        return empty
 
-def get_market_price(legal_dong, area_m2):
-    """
-    Fetches real estate transaction data from Seoul Open Data Plaza.
-    Service: tbLnOpendataRtmsV (Seoul Real Estate Actual Transaction Price)
-    Returns dictionary with average deposit/rent for similar area in the region.
-    API: http://openapi.seoul.go.kr:8088/{KEY}/json/tbLnOpendataRtmsV/1/1000/
-    """
-    if not SEOUL_DATA_KEY:
-        print("SEOUL_DATA_KEY is missing. Returning 0.")
-        return {"avg_deposit": 0, "avg_rent": 0}
-
-    # API Request
-    # Note: The API does not allow filtering by dong directly in the URL efficiently for all years.
-    # However, we can fetch recent data. For efficiency in this demo, we fetch a batch.
-    # In production, we'd need a better strategy or a pre-collected DB.
-    # Here, we will try to fetch recent 1000 records and filter in memory (Optimization needed later)
-    
-    url = f"http://openapi.seoul.go.kr:8088/{SEOUL_DATA_KEY}/json/tbLnOpendataRtmsV/1/1000/"
-    
     try:
-        response = requests.get(url)
-        if response.status_code != 200:
-            print(f"API Error: {response.status_code}")
-            return {"avg_deposit": 0, "avg_rent": 0}
-            
-        data = response.json()
-        if 'tbLnOpendataRtmsV' not in data:
-            return {"avg_deposit": 0, "avg_rent": 0}
-            
-        rows = data['tbLnOpendataRtmsV']['row']
-        
-        # Filter Logic
-        # 1. Match Legal Dong (BJDONG_NM) - e.g. "삼성동"
-        # 2. Match Area (BLDG_AREA) - +/- 10% tolerance
-        # 3. Match Year (DEAL_YMD) - recent 1 year (optional, data usually sorted)
-        
-        relevant_items = []
         target_area = float(area_m2)
-        
-        for item in rows:
-            # Check Dong
-            if item.get('BJDONG_NM') != legal_dong:
-                continue
-                
-            # Check Area
-            try:
-                item_area = float(item.get('BLDG_AREA', 0))
-                if not (target_area * 0.8 <= item_area <= target_area * 1.2):
-                    continue
-            except:
-                continue
-                
-            # Check Type (Apartment / Officetel / Multi-household)
-            # HOUSE_TYPE: '아파트', '오피스텔', '연립다세대', '단독다가구'
-            # For simplicity, we include all relevant types or filter if needed
-            
-            rent_money = int(item.get('RENT_GTN', '0').replace(',', '')) # 보증금
-            monthly_money = int(item.get('RENT_FEE', '0').replace(',', '')) # 월세
-            
-            # Simple conversion to "Jeonse Equivalent" could be done, 
-            # but for now we just return avg of deposit/rent separately.
-            
-            relevant_items.append({
-                "deposit": rent_money,
-                "rent": monthly_money
-            })
-            
-        if not relevant_items:
-            return {"avg_deposit": 0, "avg_rent": 0}
-            
-        avg_deposit = sum(i['deposit'] for i in relevant_items) / len(relevant_items)
-        avg_rent = sum(i['rent'] for i in relevant_items) / len(relevant_items)
-        
-        return {
-            "avg_deposit": round(avg_deposit),
-            "avg_rent": round(avg_rent)
-        }
-        
-    except Exception as e:
-        print(f"Real Estate API Exception: {e}")
-        return {"avg_deposit": 0, "avg_rent": 0}
+    except (TypeError, ValueError):
+        return empty
+
+    low = target_area * (1 - AREA_TOLERANCE)
+    high = target_area * (1 + AREA_TOLERANCE)
+    types = [house_type] if house_type else list(HOUSE_TYPES)
+
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        rows = db.query(MarketTransaction.deposit, MarketTransaction.rent).filter(
+            MarketTransaction.legal_dong == legal_dong,
+            MarketTransaction.house_type.in_(types),
+            MarketTransaction.area_bucket.between(area_bucket(low), area_bucket(high)),
+            MarketTransaction.area.between(low, high),
+        ).all()
+    finally:
+        if own_session:
+            db.close()
+
+    if not rows:
+        return empty
+
+    avg_deposit = sum(r.deposit for r in rows) / len(rows)
+    avg_rent = sum(r.rent for r in rows) / len(rows)
+
+    return {
+        "avg_deposit": round(avg_deposit),
+        "avg_rent": round(avg_rent)
+    }
+
+def get_market_stats(legal_dong, area_m2, building_type=None, db=None):
+    """
+    Returns the precomputed market_prices row (as a dict, amounts in 만원) for the
+    dong / building type / area bucket, or None when there is no market data.
+    """
+    if not legal_dong:
+        return None
+    try:
+        bucket = aggregate_bucket(area_m2)
+    except (TypeError, ValueError):
+        return None
+
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        row = db.query(MarketPrice).filter(
+            MarketPrice.legal_name == legal_dong,
+            MarketPrice.building_type == (building_type or ALL_TYPES),
+            MarketPrice.area_bucket == bucket,
+        ).first()
+        if row is None:
+            return None
+        return {c.name: getattr(row, c.name) for c in MarketPrice.__table__.columns}
+    finally:
+        if own_session:
+            db.close()
+
+def get_market_stats_bulk(keys, db):
+    """
+    Resolves many (legal_dong, aggregate bucket) keys with a single query against the
+    "ALL" rollup. Returns {key: market_prices row}; keys without market data are absent.
+    """
+    keys = set(keys)
+    dongs = {dong for dong, _ in keys if dong}
+    if not dongs:
+        return {}
+    rows = db.query(MarketPrice).filter(
+        MarketPrice.building_type == ALL_TYPES,
+        MarketPrice.legal_name.in_(dongs),
+    ).all()
+    return {
+        (row.legal_name, row.area_bucket): row
+        for row in rows
+        if (row.legal_name, row.area_bucket) in keys
+    }
+
+if __name__ == "__main__":
+    import argparse
+    from database import init_db
+
+    arg_parser = argparse.ArgumentParser(description="Ingest Seoul rent transactions")
+    arg_parser.add_argument("--fixture", help="Path to a recorded API dump (offline run)")
+    arg_parser.add_argument("--incremental", action="store_true", help="Only fetch rows newer than the stored watermark")
+    args = arg_parser.parse_args()
+
+    init_db()
+    run_market_ingest_job(fixture_path=args.fixture, incremental=args.incremental)
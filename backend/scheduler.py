@@ -1,5 +1,6 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from database import run_serialized
 import time
 
 scheduler = BackgroundScheduler()
@@ -8,10 +9,13 @@ def daily_task():
     print("Running daily task: Scraper & Analysis")
     from scraper import run_scraping_job
     from analyzer import run_analysis_job
+    from real_estate import run_market_ingest_job
     
     run_scraping_job()
+    run_market_ingest_job(incremental=True)
     run_analysis_job()
 
 def start_scheduler():
-    scheduler.add_job(daily_task, CronTrigger(hour=9, minute=0))
+    # Through the serialized writer, so a concurrent /force-scrape waits its turn
+    scheduler.add_job(lambda: run_serialized(daily_task).result(), CronTrigger(hour=9, minute=0))
     scheduler.start()
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+
+class NoticeOut(BaseModel):
+    """A notice as the API returns it (no dedup_key or other bookkeeping columns)."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: Optional[str] = None
+    platform: Optional[str] = None
+    link: Optional[str] = None
+    notice_date: Optional[datetime] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    announcement_date: Optional[datetime] = None
+    target_group: Optional[str] = None
+    income_requirement: Optional[str] = None
+    region: Optional[str] = None
+    address: Optional[str] = None
+    deposit: Optional[int] = None
+    rent: Optional[int] = None
+    area: Optional[float] = None
+    effective_monthly_cost: Optional[int] = None
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    summary_qualifications: Optional[str] = None
+    summary_income: Optional[str] = None
+    summary_assets: Optional[str] = None
+    score: Optional[float] = None # Analysis score (1-5), None until analyzed
+
+class NoticePage(BaseModel):
+    # With fields=, each item only has the requested keys (plus id)
+    items: List[NoticeOut]
+    next_cursor: Optional[str] = None
+
+NOTICE_FIELDS = list(NoticeOut.model_fields)
@@ -1,23 +1,15 @@
 from playwright.sync_api import sync_playwright
-from database import SessionLocal, HousingNotice
+from database import SessionLocal
 from datetime import datetime
-from geocoder import get_coordinates
+from notice_store import upsert_notices, backfill_dedup_keys
 from file_parser import parse_hwp, extract_sections
+from downloader import download, FAILED
 import time
 import os
-import requests
 
 def download_file(url, save_path):
-    try:
-        response = requests.get(url, stream=True)
-        if response.status_code == 200:
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(1024):
-                    f.write(chunk)
-            return True
-    except Exception as e:
-        print(f"Download failed: {e}")
-    return False
+    # Conditional, atomic download through the shared downloader (see downloader.py)
+    return download(url, save_path).status != FAILED
 
 def scrape_sh():
     print("Starting SH Scraping (Deep Mode)...")
@@ -257,36 +249,9 @@ def run_scraping_job():
     print("Job Started: Scraping")
     data = scrape_sh()
     
-    # Save to DB
+    # Save to DB: one existence lookup + one bulk upsert for the whole batch
     db = SessionLocal()
-    for item in data:
-        # Check dup
-        exists = db.query(HousingNotice).filter(HousingNotice.title == item['title']).first()
-        if not exists:
-            # Geocoding
-            lat, lng = get_coordinates(item['address'])
-            
-            notice = HousingNotice(
-                title=item['title'],
-                platform="SH",
-                notice_date=datetime.utcnow(), 
-                link=item['link'],
-                start_date=item['start_date'],
-                end_date=item['end_date'],
-                region=item['region'],
-                address=item['address'],
-                deposit=item['deposit'], 
-                rent=item['rent'], 
-                area=item['area'],
-                lat=lat,
-                lng=lng,
-                summary_qualifications=item['qualifications'],
-                summary_income=item['income'],
-                summary_assets=item['assets']
-            )
-            db.add(notice)
-            print(f"Saved: {item['title']}")
-            
-    db.commit()
+    backfill_dedup_keys(db)
+    inserted, updated = upsert_notices(db, data)
     db.close()
-    print("Job Finished: Scraping")
+    print(f"Job Finished: Scraping. Saved {inserted} new notices, refreshed {updated}.")
@@ -0,0 +1,155 @@
+import asyncio
+import contextlib
+from abc import abstractmethod
+from typing import List, Dict, Any
+from urllib.parse import urlsplit
+from .base_scraper import BaseScraper
+
+class BrowserPool:
+    """
+    One shared Chromium process handing out pages from a bounded pool.
+    At most `max_pages` pages are open at once, and at most `per_host` of them
+    talk to the same host, so concurrent scrapers stay polite to each site.
+    Pages are reused across fetches instead of being opened per request.
+    """
+
+    def __init__(self, max_pages=8, per_host=2, headless=True, user_agent="Mozilla/5.0", browser=None):
+        self.max_pages = max_pages
+        self.per_host = per_host
+        self.headless = headless
+        self.user_agent = user_agent
+        self._browser = browser # Injected browsers are not owned (not closed) by the pool
+        self._owns_browser = browser is None
+        self._playwright = None
+        self._context = None
+        self._slots = asyncio.Semaphore(max_pages)
+        self._host_slots = {}
+        self._idle_pages = []
+
+    async def start(self):
+        if self._browser is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+            try:
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            except Exception:
+                await self._playwright.stop()
+                self._playwright = None
+                raise
+        self._context = await self._browser.new_context(user_agent=self.user_agent)
+        return self
+
+    async def close(self):
+        for page in self._idle_pages:
+            await page.close()
+        self._idle_pages = []
+        if self._context is not None:
+            await self._context.close()
+            self._context = None
+        if self._owns_browser and self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host)
+        return self._host_slots[host]
+
+    @contextlib.asynccontextmanager
+    async def page(self, url):
+        """Borrows a page for `url` (whose host decides the per-host slot)."""
+        async with self._host_limit(url), self._slots:
+            page = self._idle_pages.pop() if self._idle_pages else await self._context.new_page()
+            try:
+                yield page
+            except BaseException:
+                # A page in an unknown state (e.g. navigation timeout) is not reused
+                await page.close()
+                raise
+            else:
+                self._idle_pages.append(page)
+
+    async def fetch(self, url, timeout=30000, wait_ms=0):
+        """Navigates a pooled page to `url` and returns the rendered HTML."""
+        async with self.page(url) as page:
+            await page.goto(url, timeout=timeout)
+            if wait_ms:
+                await page.wait_for_timeout(wait_ms)
+            return await page.content()
+
+class AsyncBaseScraper(BaseScraper):
+    """
+    Async variant of BaseScraper: list pages are fetched concurrently, then every
+    detail page is fetched concurrently, all through a shared BrowserPool.
+    Subclasses only parse HTML.
+    """
+    list_urls: List[str] = []
+    list_wait_ms = 0
+    detail_wait_ms = 0
+
+    @abstractmethod
+    def parse_list(self, html: str, url: str) -> List[Dict[str, Any]]:
+        """Returns the notice items found on one list page (each with a "link")."""
+
+    def parse_detail(self, html: str, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Enriches an item from its detail page. Default: keep the list data."""
+        return item
+
+    def has_detail(self, item: Dict[str, Any]) -> bool:
+        """Whether the item's link is a detail page worth fetching."""
+        return bool(item.get("link"))
+
+    async def _fetch_detail(self, pool, item):
+        if not self.has_detail(item):
+            return item
+        try:
+            html = await pool.fetch(item["link"], wait_ms=self.detail_wait_ms)
+        except Exception as e:
+            print(f"Detail fetch failed for {item['link']}: {e}")
+            return item
+        return self.parse_detail(html, item)
+
+    async def scrape_async(self, pool: BrowserPool) -> List[Dict[str, Any]]:
+        pages = await asyncio.gather(
+            *(pool.fetch(url, wait_ms=self.list_wait_ms) for url in self.list_urls),
+            return_exceptions=True,
+        )
+        items = []
+        for url, html in zip(self.list_urls, pages):
+            if isinstance(html, Exception):
+                print(f"Failed to load list page {url}: {html}")
+                continue
+            items.extend(self.parse_list(html, url))
+
+        return list(await asyncio.gather(*(self._fetch_detail(pool, item) for item in items)))
+
+    def scrape(self) -> List[Dict[str, Any]]:
+        # BaseScraper interface: run on a private pool (collector threads have no event loop)
+        return asyncio.run(run_async_scrapers([self]))[0]
+
+async def run_async_scrapers(scrapers, **pool_options):
+    """
+    Runs several AsyncBaseScrapers on one shared browser process.
+    Returns one result list per scraper; a failing scraper returns [].
+    """
+    async with BrowserPool(**pool_options) as pool:
+        results = await asyncio.gather(
+            *(scraper.scrape_async(pool) for scraper in scrapers), return_exceptions=True
+        )
+    out = []
+    for scraper, result in zip(scrapers, results):
+        if isinstance(result, Exception):
+            print(f"Scraper Error [{type(scraper).__name__}]: {result}")
+            result = []
+        out.append(result)
+    return out
@@ -1,16 +1,136 @@
 from playwright.sync_api import sync_playwright
-from datetime import datetime
+from datetime import datetime, timedelta
 import hashlib
+import re
+from bs4 import BeautifulSoup
 from .base_scraper import BaseScraper
+from .async_base_scraper import AsyncBaseScraper
 # Import locally to avoid circular dependency if needed, or adjust python path
 # Assuming backend is in path
 try:
-    from file_parser import RegexParser
+    from file_parser import RegexParser, extract_sections
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from file_parser import RegexParser
+    from file_parser import RegexParser, extract_sections
+
+# Real SH List URL
+SH_LIST_URL = "https://www.i-sh.co.kr/main/lay2/program/S1T294C295/www/brd/m_241/list.do"
+SH_VIEW_URL = "https://www.i-sh.co.kr/main/lay2/program/S1T294C295/www/brd/m_241/view.do?seq={seq}"
+MAX_ROWS = 10
+
+REGION_MATCHES = {
+    "강남": "Gangnam-gu", "서초": "Seocho-gu", "송파": "Songpa-gu", "강동": "Gangdong-gu",
+    "마포": "Mapo-gu", "용산": "Yongsan-gu", "성동": "Seongdong-gu", "광진": "Gwangjin-gu",
+    "강북": "Gangbuk-gu", "도봉": "Dobong-gu", "노원": "Nowon-gu", "은평": "Eunpyeong-gu",
+    "서대문": "Seodaemun-gu", "동대문": "Dongdaemun-gu", "중랑": "Jungnang-gu", "성북": "Seongbuk-gu",
+    "양천": "Yangcheon-gu", "강서": "Gangseo-gu", "구로": "Guro-gu", "금천": "Geumcheon-gu",
+    "영등포": "Yeongdeungpo-gu", "동작": "Dongjak-gu", "관악": "Gwanak-gu", "종로": "Jongno-gu",
+    "중구": "Jung-gu"
+}
+
+# Mock Sections (used until the announcement text itself is parsed)
+MOCK_SECTIONS = {
+    "qualifications": "무주택 세대구성원, 소득 100% 이하",
+    "income": "월평균 소득 70% 이하 (1인 가구 300만원)",
+    "assets": "총자산 3.4억 이하, 자동차 3,708만원 이하"
+}
+
+def is_rental_title(title):
+    return "임대" in title or "모집" in title
+
+def resolve_detail_url(title, href, onclick):
+    onclick = onclick or ""
+    # Case 1: Direct Link (Rare)
+    if href and "http" in href:
+        return href
+    # Case 2: Relative Link
+    if href and "javascript" not in href and href != "#":
+        return "https://www.i-sh.co.kr" + href
+    # Case 3: Onclick with getDetailView (or fn_view fallback)
+    if "getDetailView" in onclick or "fn_view" in onclick:
+        # Match getDetailView('123') or fn_view('123')
+        match = re.search(r"(?:getDetailView|fn_view)\s*\(\s*['\"]?(\d+)", onclick)
+        if match:
+            # Construct View URL
+            return SH_VIEW_URL.format(seq=match.group(1))
+        return f"https://www.google.com/search?q={title}"
+    print(f"DEBUG: No recognizable link pattern. Href: {href}, Onclick: {onclick}")
+    # Final Fallback
+    return f"https://www.google.com/search?q={title}"
+
+def build_notice(title, date_str, detail_url, sections=None):
+    """Turns one list row (title, list date, link) into a collector item."""
+    # Region Logic
+    region = "Seoul"
+    for key, val in REGION_MATCHES.items():
+        if key in title:
+            region = val
+            break
+
+    if region == "Seoul":
+        addr = "서울시청"
+    else:
+        addr = f"서울시 {region}청"
+
+    # Parser Logic
+    parser = RegexParser()
+    title_parsed = parser.parse(title)
+
+    area = max(title_parsed['areas']) if title_parsed['areas'] else 25.0
+
+    deposit = 0
+    rent = 0
+    if title_parsed['amounts']:
+         vals = [v for _, v in title_parsed['amounts']]
+         if vals:
+             deposit = max(vals)
+             rent = min(vals) if len(vals) > 1 else 0
+
+    # Date Logic
+    start_date = datetime.utcnow()
+    end_date = datetime.utcnow()
+
+    parsed_dates = title_parsed['dates']
+    if parsed_dates:
+        try:
+            p_dates = sorted([datetime.strptime(d, "%Y-%m-%d") for d in parsed_dates])
+            if len(p_dates) >= 2:
+                start_date = p_dates[0]
+                end_date = p_dates[-1]
+            elif len(p_dates) == 1:
+                start_date = p_dates[0]
+                end_date = start_date + timedelta(days=14)
+        except:
+            pass
+
+    # Fallback Dates
+    if not parsed_dates and date_str:
+         try:
+             start_date = datetime.strptime(date_str, "%Y-%m-%d")
+             end_date = start_date + timedelta(days=14)
+         except:
+             pass
+
+    sections = sections or MOCK_SECTIONS
+
+    return {
+        "title": title,
+        "date": date_str,
+        "link": detail_url,
+        "start_date": start_date,
+        "end_date": end_date,
+        "platform": "SH",
+        "region": region,
+        "address": addr,
+        "area": area,
+        "deposit": deposit,
+        "rent": rent,
+        "qualifications": sections['qualifications'],
+        "income": sections['income'],
+        "assets": sections['assets']
+    }
 
 class SHScraper(BaseScraper):
     def scrape(self):
@@ -20,11 +140,9 @@ class SHScraper(BaseScraper):
             browser = p.chromium.launch(headless=True)
             context = browser.new_context(user_agent="Mozilla/5.0")
             page = context.new_page()
-            
-            # Real SH List URL
-            url = "https://www.i-sh.co.kr/main/lay2/program/S1T294C295/www/brd/m_241/list.do" 
+
             try:
-                page.goto(url, timeout=30000)
+                page.goto(SH_LIST_URL, timeout=30000)
                 page.wait_for_timeout(2000)
             except:
                 print("Failed to load SH page")
@@ -34,31 +152,31 @@ class SHScraper(BaseScraper):
                 # Find target table
                 tables = page.locator("table").all()
                 target_table = None
-                
+
                 for tbl in tables:
                     if tbl.locator("tbody tr").count() > 3 and "번호" in tbl.inner_text():
                         target_table = tbl
                         break
-                
+
                 if not target_table:
                     if len(tables) > 1: target_table = tables[1]
                     else: target_table = tables[0]
 
                 # Iterate first 10 rows
-                count = 0 
+                count = 0
                 rows = target_table.locator("tbody tr").all()
-                
+
                 for row in rows:
-                    if count > 10: break
-                    
+                    if count > MAX_ROWS: break
+
                     try:
                         title_el = row.locator("a").first
                         title = title_el.inner_text().strip()
-                        
-                        if "임대" in title or "모집" in title:
+
+                        if is_rental_title(title):
                             count += 1
                             print(f"Processing: {title}")
-                            
+
                             # Extract Date
                             date_str = datetime.utcnow().strftime("%Y-%m-%d")
                             try:
@@ -72,124 +190,84 @@ class SHScraper(BaseScraper):
                                 pass
 
                             # Get Link
-                            href = title_el.get_attribute("href")
-                            onclick = title_el.get_attribute("onclick") or ""
-                            detail_url = ""
-                            
-                            # Case 1: Direct Link (Rare)
-                            if href and "http" in href:
-                                detail_url = href
-                            # Case 2: Relative Link
-                            elif href and "javascript" not in href and href != "#":
-                                detail_url = "https://www.i-sh.co.kr" + href
-                            # Case 3: Onclick with getDetailView (or fn_view fallback)
-                            elif "getDetailView" in onclick or "fn_view" in onclick:
-                                import re
-                                # Match getDetailView('123') or fn_view('123')
-                                match = re.search(r"(?:getDetailView|fn_view)\s*\(\s*['\"]?(\d+)", onclick)
-                                if match:
-                                    seq = match.group(1)
-                                    # Construct View URL
-                                    detail_url = f"https://www.i-sh.co.kr/main/lay2/program/S1T294C295/www/brd/m_241/view.do?seq={seq}"
-                                else:
-                                    detail_url = f"https://www.google.com/search?q={title}"
-                            else:
-                                print(f"DEBUG: No recognizable link pattern. Href: {href}, Onclick: {onclick}")
-                                # Final Fallback
-                                detail_url = f"https://www.google.com/search?q={title}"
-                            
-                            # Region Logic
-                            matches = {
-                                "강남": "Gangnam-gu", "서초": "Seocho-gu", "송파": "Songpa-gu", "강동": "Gangdong-gu",
-                                "마포": "Mapo-gu", "용산": "Yongsan-gu", "성동": "Seongdong-gu", "광진": "Gwangjin-gu",
-                                "강북": "Gangbuk-gu", "도봉": "Dobong-gu", "노원": "Nowon-gu", "은평": "Eunpyeong-gu",
-                                "서대문": "Seodaemun-gu", "동대문": "Dongdaemun-gu", "중랑": "Jungnang-gu", "성북": "Seongbuk-gu",
-                                "양천": "Yangcheon-gu", "강서": "Gangseo-gu", "구로": "Guro-gu", "금천": "Geumcheon-gu",
-                                "영등포": "Yeongdeungpo-gu", "동작": "Dongjak-gu", "관악": "Gwanak-gu", "종로": "Jongno-gu",
-                                "중구": "Jung-gu"
-                            }
-                            
-                            region = "Seoul"
-                            for key, val in matches.items():
-                                if key in title:
-                                    region = val
-                                    break
-                            
-                            if region == "Seoul":
-                                addr = "서울시청"
-                            else:
-                                addr = f"서울시 {region}청"
-                            
-                            # Parser Logic
-                            parser = RegexParser()
-                            title_parsed = parser.parse(title)
-                            
-                            area = max(title_parsed['areas']) if title_parsed['areas'] else 25.0
-                            
-                            deposit = 0
-                            rent = 0
-                            if title_parsed['amounts']:
-                                 vals = [v for _, v in title_parsed['amounts']]
-                                 if vals:
-                                     deposit = max(vals)
-                                     rent = min(vals) if len(vals) > 1 else 0
-
-                            # Date Logic
-                            start_date = datetime.utcnow()
-                            end_date = datetime.utcnow()
-                            
-                            parsed_dates = title_parsed['dates']
-                            if parsed_dates:
-                                try:
-                                    p_dates = sorted([datetime.strptime(d, "%Y-%m-%d") for d in parsed_dates])
-                                    if len(p_dates) >= 2:
-                                        start_date = p_dates[0]
-                                        end_date = p_dates[-1]
-                                    elif len(p_dates) == 1:
-                                        start_date = p_dates[0]
-                                        from datetime import timedelta
-                                        end_date = start_date + timedelta(days=14)
-                                except:
-                                    pass
-                            
-                            # Fallback Dates
-                            if not parsed_dates and date_str:
-                                 try:
-                                     start_date = datetime.strptime(date_str, "%Y-%m-%d")
-                                     from datetime import timedelta
-                                     end_date = start_date + timedelta(days=14)
-                                 except:
-                                     pass
-
-                            # Mock Sections
-                            sections = {
-                                "qualifications": "무주택 세대구성원, 소득 100% 이하",
-                                "income": "월평균 소득 70% 이하 (1인 가구 300만원)",
-                                "assets": "총자산 3.4억 이하, 자동차 3,708만원 이하"
-                            }
-
-                            results.append({
-                                "title": title,
-                                "date": date_str,
-                                "link": detail_url,
-                                "start_date": start_date,
-                                "end_date": end_date,
-                                "platform": "SH",
-                                "region": region,
-                                "address": addr,
-                                "area": area,
-                                "deposit": deposit,
-                                "rent": rent,
-                                "qualifications": sections['qualifications'],
-                                "income": sections['income'],
-                                "assets": sections['assets']
-                            })
-                            
+                            detail_url = resolve_detail_url(
+                                title, title_el.get_attribute("href"), title_el.get_attribute("onclick")
+                            )
+                            results.append(build_notice(title, date_str, detail_url))
+
                     except Exception as e:
                         print(f"Row processing error: {e}")
-                        
+
             except Exception as e:
                 print(f"Scraping Loop Error: {e}")
 
             browser.close()
         return results
+
+class AsyncSHScraper(AsyncBaseScraper):
+    """
+    SHScraper on the shared async browser pool: the list is parsed from HTML and every
+    detail page is fetched concurrently, so the qualification / income / asset
+    summaries come from the notice body instead of the mock sections.
+    """
+    list_wait_ms = 2000
+
+    def __init__(self, list_urls=None):
+        self.list_urls = list_urls or [SH_LIST_URL]
+
+    def parse_list(self, html, url):
+        soup = BeautifulSoup(html, "html.parser")
+        tables = soup.find_all("table")
+        if not tables:
+            return []
+
+        target_table = None
+        for tbl in tables:
+            if len(tbl.select("tbody tr")) > 3 and "번호" in tbl.get_text():
+                target_table = tbl
+                break
+        if not target_table:
+            target_table = tables[1] if len(tables) > 1 else tables[0]
+
+        items = []
+        for row in target_table.select("tbody tr"):
+            if len(items) > MAX_ROWS: break
+            title_el = row.find("a")
+            if title_el is None:
+                continue
+            title = title_el.get_text().strip()
+            if not is_rental_title(title):
+                continue
+
+            date_str = datetime.utcnow().strftime("%Y-%m-%d")
+            for cell in row.find_all("td"):
+                txt = cell.get_text().strip()
+                if "202" in txt and "-" in txt:
+                    date_str = txt
+                    break
+
+            detail_url = resolve_detail_url(title, title_el.get("href"), title_el.get("onclick"))
+            items.append(build_notice(title, date_str, detail_url))
+        return items
+
+    def has_detail(self, item):
+        # Rows without a resolvable link fall back to a search URL; nothing to fetch there
+        return not item["link"].startswith("https://www.google.com/search")
+
+    def parse_detail(self, html, item):
+        text = BeautifulSoup(html, "html.parser").get_text("\n")
+        sections = extract_sections(text)
+        for key in ("qualifications", "income", "assets"):
+            if sections[key] != "N/A":
+                item[key] = sections[key]
+
+        # Labelled rent table rows replace the title's max/min amount guess
+        units = RegexParser().extract_units(text)
+        if units:
+            item["units"] = units
+            first = units[0]
+            item["deposit"] = round(first["deposit"] or 0)
+            item["rent"] = round(first["rent"] or 0)
+            if first["area"]:
+                item["area"] = first["area"]
+        return item
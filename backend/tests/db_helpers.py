@@ -0,0 +1,25 @@
+import sys
+import os
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from database import Base, SessionLocal
+
+def use_test_database(test, engine=None):
+    """
+    Binds SessionLocal to `engine` (default: a new in-memory database with every
+    table) for the duration of `test`. On cleanup the previous bind is restored and
+    the engine disposed, so no test runs against another test's database.
+    """
+    if engine is None:
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(bind=engine)
+    test.addCleanup(engine.dispose)
+    test.addCleanup(SessionLocal.configure, bind=SessionLocal.kw.get("bind"))
+    SessionLocal.configure(bind=engine)
+    return engine
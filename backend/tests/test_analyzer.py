@@ -0,0 +1,252 @@
+import unittest
+import sys
+import os
+import random
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from database import SessionLocal, HousingNotice, AnalysisResult, NoticeUnit, migrate
+from db_helpers import use_test_database
+from notice_store import upsert_notices
+import real_estate
+import analyzer
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "rtms_sample.json")
+
+class AnalysisTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = use_test_database(self)
+        real_estate.run_market_ingest_job(fixture_path=FIXTURE_PATH)
+
+        db = SessionLocal()
+        db.add_all([
+            HousingNotice(title="삼성 청년주택", link="https://example.com/1", platform="SH",
+                          address="서울시 강남구 삼성동 123", rent=500000, deposit=10000000, area=25.0),
+            HousingNotice(title="잠실 행복주택", link="https://example.com/2", platform="LH",
+                          address="서울시 송파구 잠실동 789", rent=1800000, deposit=50000000, area=59.0),
+            HousingNotice(title="시청 공고", link="https://example.com/3", platform="SH",
+                          address="서울시청", rent=300000, deposit=0, area=None),
+        ])
+        db.commit()
+        db.close()
+
+    def results(self):
+        db = SessionLocal()
+        rows = {r.notice_id: (r.score, r.price_diff_percent) for r in db.query(AnalysisResult)}
+        db.close()
+        return rows
+
+class TestBatchedAnalysis(AnalysisTestCase):
+    def test_scores_and_upsert(self):
+        analyzer.run_analysis_job()
+        # Effective monthly cost = rent + deposit * 4.5% / 12
+        expected = {
+            1: (5.0, 57.43), # market 126.25만원 vs 53.75만원
+            2: (4.27, 35.37), # market 307.5만원 vs 198.75만원
+            3: (2.5, 0.0), # no market data
+        }
+        self.assertEqual(self.results(), expected)
+
+        # Second run updates in place
+        analyzer.run_analysis_job()
+        self.assertEqual(self.results(), expected)
+
+    def test_constant_query_count(self):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            analyzer.run_analysis_job()
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+        # notices, units, existing results, market rows, one executemany cost update, one executemany upsert
+        self.assertEqual(len(statements), 6, statements)
+
+    def test_unique_index_added_to_old_databases(self):
+        db = SessionLocal()
+        db.connection().exec_driver_sql("DROP INDEX ux_analysis_results_notice_id")
+        db.connection().exec_driver_sql("PRAGMA user_version = 3") # Before _migrate_analysis_index
+        db.add_all([AnalysisResult(notice_id=1, score=1.0), AnalysisResult(notice_id=1, score=3.0)])
+        db.commit()
+        db.close()
+
+        migrate(self.engine)
+        self.assertEqual(self.results(), {1: (3.0, None)})
+        analyzer.run_analysis_job()
+        self.assertEqual(self.results()[1], (5.0, 57.43))
+
+class TestIncrementalAnalysis(AnalysisTestCase):
+    def test_only_changed_notices_are_rescored(self):
+        self.assertEqual(analyzer.run_analysis_job(), 3)
+        self.assertEqual(analyzer.run_analysis_job(), 0)
+
+        # Notice input changed
+        db = SessionLocal()
+        db.query(HousingNotice).filter(HousingNotice.id == 3).update({"rent": 350000})
+        db.commit()
+        db.close()
+        self.assertEqual(analyzer.run_analysis_job(), 1)
+
+        # Market aggregate for 삼성동 / 20~30m2 changed (version bump)
+        real_estate.ingest_transactions([[{
+            "SGG_CD": "11680", "BJDONG_NM": "삼성동", "HOUSE_TYPE": "오피스텔", "BLDG_AREA": "27.0",
+            "RENT_GTN": "6,000", "RENT_FEE": "400", "DEAL_YMD": "20260201",
+        }]])
+        self.assertEqual(analyzer.run_analysis_job(), 1)
+        self.assertEqual(self.results()[1], (5.0, 58.45))
+
+        self.assertEqual(analyzer.run_analysis_job(), 0)
+        self.assertEqual(analyzer.run_analysis_job(full=True), 3)
+
+class TestUnitAnalysis(AnalysisTestCase):
+    def setUp(self):
+        super().setUp()
+        db = SessionLocal()
+        db.add_all([
+            NoticeUnit(notice_id=1, unit_type="A", area=25.0, deposit=10000000, rent=500000),
+            NoticeUnit(notice_id=1, unit_type="B", area=25.0, deposit=50000000, rent=1500000),
+        ])
+        db.commit()
+        db.close()
+
+    def unit_scores(self):
+        db = SessionLocal()
+        rows = {u.unit_type: (u.score, u.price_diff_percent, u.effective_monthly_cost) for u in db.query(NoticeUnit)}
+        db.close()
+        return rows
+
+    def test_scored_per_unit(self):
+        analyzer.run_analysis_job()
+        # Market 126.25만원: A costs 53.75만원, B 168.75만원; the notice keeps its best unit
+        self.assertEqual(self.unit_scores(), {"A": (5.0, 57.43, 537500), "B": (1.0, -33.66, 1687500)})
+        self.assertEqual(self.results()[1], (5.0, 57.43))
+
+    def test_unit_change_rescores_its_notice(self):
+        self.assertEqual(analyzer.run_analysis_job(), 3)
+        self.assertEqual(analyzer.run_analysis_job(), 0)
+
+        db = SessionLocal()
+        db.query(NoticeUnit).filter(NoticeUnit.unit_type == "B").update({"rent": 800000})
+        db.commit()
+        db.close()
+        self.assertEqual(analyzer.run_analysis_job(), 1)
+        self.assertEqual(self.unit_scores()["B"][:2], (3.59, 21.78))
+
+    def test_rescrape_keeps_unit_scores(self):
+        units = [
+            {"unit_type": "16A", "area": 25.0, "deposit": 10000000, "rent": 500000},
+            {"unit_type": "26B", "area": 25.0, "deposit": 50000000, "rent": 1500000},
+        ]
+        item = {"title": "삼성 매입임대", "date": "2026-02-01", "link": "https://example.com/scraped",
+                "platform": "SH", "address": "서울시 강남구 삼성동 456", "area": 25.0,
+                "deposit": 10000000, "rent": 500000, "units": units}
+        db = SessionLocal()
+        upsert_notices(db, [item], geocode=None)
+        db.close()
+        analyzer.run_analysis_job()
+        scored = self.unit_scores()
+        self.assertEqual(scored["16A"][0], 5.0)
+
+        # Scraped again unchanged: rows and scores kept, nothing to re-score
+        db = SessionLocal()
+        upsert_notices(db, [item], geocode=None)
+        db.close()
+        self.assertEqual(self.unit_scores(), scored)
+        self.assertEqual(analyzer.run_analysis_job(), 0)
+
+        # One unit changed: rows rewritten unscored, then re-scored
+        db = SessionLocal()
+        upsert_notices(db, [dict(item, units=[units[0], dict(units[1], rent=800000)])], geocode=None)
+        db.close()
+        self.assertEqual(self.unit_scores()["26B"][0], None)
+        self.assertEqual(analyzer.run_analysis_job(), 1)
+        self.assertEqual(self.unit_scores()["26B"][:2], (3.59, 21.78))
+
+    def test_unscored_units_are_rescored(self):
+        analyzer.run_analysis_job()
+        db = SessionLocal()
+        db.query(NoticeUnit).update({"score": None})
+        db.commit()
+        db.close()
+        self.assertEqual(analyzer.run_analysis_job(), 1)
+        self.assertEqual(self.unit_scores()["A"][0], 5.0)
+
+    def test_constant_query_count(self):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            analyzer.run_analysis_job()
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+        # ... plus one executemany unit update
+        self.assertEqual(len(statements), 7, statements)
+
+class TestEffectiveCost(AnalysisTestCase):
+    def test_conversion(self):
+        self.assertEqual(analyzer.effective_monthly_cost(12000000, 100000, rate=0.06), 160000)
+        self.assertEqual(analyzer.market_monthly_cost(7000, 100), 1262500)
+
+    def test_cost_precomputed_per_notice(self):
+        analyzer.run_analysis_job()
+        db = SessionLocal()
+        costs = dict(db.query(HousingNotice.id, HousingNotice.effective_monthly_cost))
+        market = dict(db.query(AnalysisResult.notice_id, AnalysisResult.market_monthly_cost))
+        db.close()
+        self.assertEqual(costs, {1: 537500, 2: 1987500, 3: 300000})
+        self.assertEqual(market, {1: 1262500, 2: 3075000, 3: 0})
+
+    def test_rate_change_rescores(self):
+        analyzer.run_analysis_job()
+        saved = analyzer.JEONSE_CONVERSION_RATE
+        analyzer.JEONSE_CONVERSION_RATE = 0.06
+        try:
+            self.assertEqual(analyzer.run_analysis_job(), 3)
+        finally:
+            analyzer.JEONSE_CONVERSION_RATE = saved
+
+class TestVectorScoring(unittest.TestCase):
+    """Property checks: calculate_scores must agree with calculate_score element by element."""
+
+    def random_prices(self, rnd, n):
+        markets, notices = [], []
+        for _ in range(n):
+            kind = rnd.random()
+            market = rnd.choice([
+                0.0, -rnd.uniform(0, 1e6), rnd.uniform(0, 10), rnd.uniform(1e4, 5e6),
+                float(rnd.randint(1, 500) * 10000),
+            ])
+            if kind < 0.3 and market > 0:
+                # Land exactly on (or next to) a rounding tie: diff = k.kk5 %
+                diff = (rnd.randint(-20000, 20000) * 10 + 5) / 1000
+                notice = market * (1 - diff / 100)
+            else:
+                notice = rnd.choice([
+                    0.0, -rnd.uniform(0, 1e5), rnd.uniform(0, 1e7), float(rnd.randint(1, 300) * 5000),
+                ])
+            markets.append(market)
+            notices.append(notice)
+        return markets, notices
+
+    def test_vector_matches_scalar(self):
+        rnd = random.Random(20260218)
+        for _ in range(20):
+            markets, notices = self.random_prices(rnd, 1000)
+            scores, diffs = analyzer.calculate_scores(markets, notices)
+            expected = [analyzer.calculate_score(m, n) for m, n in zip(markets, notices)]
+            self.assertEqual(list(zip(scores.tolist(), diffs.tolist())), expected)
+
+    def test_special_cases(self):
+        scores, diffs = analyzer.calculate_scores([0, -5, 100, 100, 100, 100], [50, 50, 0, -1, 80, 500])
+        self.assertEqual(scores.tolist(), [2.5, 2.5, 4.5, 4.5, 3.5, 1.0])
+        self.assertEqual(diffs.tolist(), [0.0, 0.0, 100.0, 100.0, 20.0, -400.0])
+
+    def test_known_tie(self):
+        # 1.005 is stored just below the tie: Python rounds it to 1.0
+        scores, diffs = analyzer.calculate_scores([100000.0], [100000.0 * (1 - 1.005 / 100)])
+        self.assertEqual((scores[0], diffs[0]), analyzer.calculate_score(100000.0, 100000.0 * (1 - 1.005 / 100)))
+
+if __name__ == '__main__':
+    unittest.main()
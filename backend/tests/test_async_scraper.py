@@ -0,0 +1,150 @@
+import unittest
+import sys
+import os
+import asyncio
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.async_base_scraper import BrowserPool, run_async_scrapers
+from scrapers.sh_scraper import AsyncSHScraper
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sh")
+
+def read_fixture(name, base):
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return f.read().replace("{base}", base)
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+        self.html = ""
+
+    async def goto(self, url, timeout=None):
+        host = urlsplit(url).netloc
+        self.browser.active += 1
+        self.browser.active_by_host[host] = self.browser.active_by_host.get(host, 0) + 1
+        self.browser.peak = max(self.browser.peak, self.browser.active)
+        self.browser.peak_by_host[host] = max(
+            self.browser.peak_by_host.get(host, 0), self.browser.active_by_host[host]
+        )
+        await asyncio.sleep(0.02)
+        self.browser.active -= 1
+        self.browser.active_by_host[host] -= 1
+        self.html = self.browser.pages_by_url[url]
+
+    async def wait_for_timeout(self, ms):
+        pass
+
+    async def content(self):
+        return self.html
+
+    async def close(self):
+        pass
+
+class FakeBrowser:
+    """Stands in for Chromium: serves HTML by URL and records concurrency."""
+
+    def __init__(self, pages_by_url):
+        self.pages_by_url = pages_by_url
+        self.pages_created = 0
+        self.active = 0
+        self.peak = 0
+        self.active_by_host = {}
+        self.peak_by_host = {}
+
+    async def new_context(self, user_agent=None):
+        return self
+
+    async def new_page(self):
+        self.pages_created += 1
+        return FakePage(self)
+
+    async def close(self):
+        pass
+
+class TestBrowserPool(unittest.TestCase):
+    def test_limits_and_page_reuse(self):
+        urls = [f"http://host{i % 2}.test/{i}" for i in range(20)]
+        browser = FakeBrowser({url: f"<p>{url}</p>" for url in urls})
+
+        async def run():
+            async with BrowserPool(max_pages=3, per_host=2, browser=browser) as pool:
+                return await asyncio.gather(*(pool.fetch(url) for url in urls))
+
+        htmls = asyncio.run(run())
+        self.assertEqual(htmls, [f"<p>{url}</p>" for url in urls])
+        self.assertLessEqual(browser.peak, 3)
+        self.assertGreater(browser.peak, 1) # Actually concurrent
+        self.assertLessEqual(max(browser.peak_by_host.values()), 2)
+        self.assertLessEqual(browser.pages_created, 3) # Pages are pooled, not opened per fetch
+
+    def test_sh_list_and_details(self):
+        base = "http://sh.test"
+        pages = {f"{base}/list.html": read_fixture("list.html", base)}
+        for n in (101, 102, 104):
+            pages[f"{base}/detail_{n}.html"] = read_fixture(f"detail_{n}.html", base)
+        browser = FakeBrowser(pages)
+
+        async def run():
+            async with BrowserPool(browser=browser, per_host=4) as pool:
+                scraper = AsyncSHScraper(list_urls=[f"{base}/list.html"])
+                scraper.list_wait_ms = 0
+                return await scraper.scrape_async(pool)
+
+        items = asyncio.run(run())
+        self.assertEqual([i["region"] for i in items], ["Gangnam-gu", "Mapo-gu", "Songpa-gu"])
+        self.assertEqual(items[0]["link"], f"{base}/detail_101.html")
+        self.assertEqual(items[0]["qualifications"], "무주택, 세대구성원, 청년, 신혼부부")
+        self.assertIn("자동차: 3,803만", items[0]["assets"])
+        self.assertGreater(browser.peak_by_host[urlsplit(base).netloc], 1)
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        name = self.path.lstrip("/")
+        path = os.path.join(FIXTURE_DIR, name)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        body = read_fixture(name, f"http://127.0.0.1:{self.server.server_port}").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def chromium_available():
+    async def probe():
+        async with BrowserPool():
+            return True
+    try:
+        return asyncio.run(probe())
+    except Exception:
+        return False
+
+@unittest.skipUnless(chromium_available(), "Playwright Chromium is not installed")
+class TestAsyncSHScraperWithBrowser(unittest.TestCase):
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), FixtureHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_scrape_local_fixtures(self):
+        scraper = AsyncSHScraper(list_urls=[f"{self.base}/list.html"])
+        scraper.list_wait_ms = 0
+        items = asyncio.run(run_async_scrapers([scraper], per_host=4))[0]
+        self.assertEqual(len(items), 3)
+        self.assertEqual(items[1]["income"], "소득, 월평균")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import sys
+import os
+import io
+import contextlib
+import tempfile
+import time
+import threading
+from unittest import mock
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from database import SessionLocal, HousingNotice, make_engine, run_serialized, SCHEMA_VERSION
+from db_helpers import use_test_database
+from test_database import BASELINE_SCHEMA
+from scrapers.base_scraper import BaseScraper
+from collector import run_scrapers_concurrently, run_collection_job
+import database
+import geocoder
+import main
+
+class SleepyScraper(BaseScraper):
+    def __init__(self, delay, items):
+        self.delay = delay
+        self.items = items
+
+    def scrape(self):
+        time.sleep(self.delay)
+        return self.items
+
+class BrokenScraper(BaseScraper):
+    def scrape(self):
+        raise RuntimeError("browser crashed")
+
+class HungScraper(BaseScraper):
+    timeout = 0.2
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def scrape(self):
+        self.release.wait(5)
+        return [{"title": "late"}]
+
+class TestConcurrentScrapers(unittest.TestCase):
+    def test_runs_in_parallel_and_streams_in_finish_order(self):
+        scrapers = [SleepyScraper(0.4, [{"title": "slow"}]), SleepyScraper(0.1, [{"title": "fast"}])]
+        started = time.perf_counter()
+        runs = []
+        for run in run_scrapers_concurrently(scrapers):
+            runs.append((run, time.perf_counter() - started))
+        total = time.perf_counter() - started
+
+        self.assertEqual([r.items[0]["title"] for r, _ in runs], ["fast", "slow"])
+        # The fast result is available before the slow scraper is done
+        self.assertLess(runs[0][1], 0.3)
+        # Wall time is the slowest scraper, not the sum
+        self.assertLess(total, 0.45)
+        self.assertGreaterEqual(runs[1][0].elapsed, 0.4)
+        self.assertTrue(all(r.error is None for r, _ in runs))
+
+    def test_failures_and_timeouts_are_isolated(self):
+        hung = HungScraper()
+        scrapers = [BrokenScraper(), hung, SleepyScraper(0.05, [{"title": "ok"}])]
+        try:
+            runs = {run.name: run for run in run_scrapers_concurrently(scrapers, timeout=5)}
+        finally:
+            hung.release.set()
+
+        self.assertEqual(runs["SleepyScraper"].items, [{"title": "ok"}])
+        self.assertIsInstance(runs["BrokenScraper"].error, RuntimeError)
+        self.assertIsInstance(runs["HungScraper"].error, TimeoutError)
+        self.assertEqual(runs["HungScraper"].items, [])
+        self.assertLess(runs["HungScraper"].elapsed, 1.0)
+
+class TestCollectionJob(unittest.TestCase):
+    def test_upgrades_a_baseline_database(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        engine = use_test_database(self, make_engine(f"sqlite:///{os.path.join(tmp.name, 'notices.db')}"))
+        with engine.begin() as conn:
+            for ddl in BASELINE_SCHEMA:
+                conn.exec_driver_sql(ddl)
+            conn.exec_driver_sql(
+                "INSERT INTO housing_notices (title, platform, link) VALUES ('공고', 'LH', 'https://apply.lh.or.kr/1')"
+            )
+
+        item = {"title": "신규 공고", "platform": "LH", "link": "https://apply.lh.or.kr/2", "date": "2026-02-01"}
+        with mock.patch.object(database, "engine", engine), mock.patch.object(geocoder, "KAKAO_API_KEY", ""):
+            self.assertEqual(run_collection_job([SleepyScraper(0, [item])]), 1)
+
+        with engine.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("PRAGMA user_version").scalar(), SCHEMA_VERSION)
+        db = SessionLocal()
+        rows = db.query(HousingNotice.link, HousingNotice.dedup_key).order_by(HousingNotice.id).all()
+        db.close()
+        self.assertEqual(rows, [
+            ("https://apply.lh.or.kr/1", "LH:https://apply.lh.or.kr/1"),
+            ("https://apply.lh.or.kr/2", "LH:https://apply.lh.or.kr/2"),
+        ])
+
+class TestForceScrape(unittest.TestCase):
+    def test_job_failure_is_logged(self):
+        out = io.StringIO()
+        with mock.patch("scraper.run_scraping_job", side_effect=RuntimeError("browser crashed")), \
+                contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            response = TestClient(main.app).post("/force-scrape")
+            run_serialized(lambda: None).result(timeout=5) # Queued after the scrape job
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Background job failed: RuntimeError('browser crashed')", out.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,256 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import sessionmaker
+from database import (
+    Base, HousingNotice, NoticeUnit, AnalysisResult, GeocodingLog, MarketPrice,
+    make_engine, run_serialized, migrate, MIGRATIONS, SCHEMA_VERSION,
+)
+
+# Schema of the first release, before any migration
+BASELINE_SCHEMA = [
+    "CREATE TABLE housing_notices (id INTEGER PRIMARY KEY, title VARCHAR, platform VARCHAR, link VARCHAR, "
+    "notice_date DATETIME, start_date DATETIME, end_date DATETIME, announcement_date DATETIME, "
+    "target_group VARCHAR, income_requirement TEXT, region VARCHAR, address VARCHAR, deposit INTEGER, "
+    "rent INTEGER, area FLOAT, lat FLOAT, lng FLOAT, summary_qualifications TEXT, summary_income TEXT, "
+    "summary_assets TEXT, created_at DATETIME)",
+    "CREATE INDEX ix_housing_notices_id ON housing_notices (id)",
+    "CREATE INDEX ix_housing_notices_title ON housing_notices (title)",
+    "CREATE UNIQUE INDEX ix_housing_notices_link ON housing_notices (link)",
+    "CREATE TABLE geocoding_logs (id INTEGER PRIMARY KEY, address VARCHAR, status VARCHAR, "
+    "error_message TEXT, created_at DATETIME)",
+    "CREATE INDEX ix_geocoding_logs_id ON geocoding_logs (id)",
+    "CREATE INDEX ix_geocoding_logs_address ON geocoding_logs (address)",
+    "CREATE TABLE market_prices (id INTEGER PRIMARY KEY, region_code VARCHAR, legal_name VARCHAR, "
+    "building_type VARCHAR, avg_deposit INTEGER, avg_rent INTEGER, updated_at DATETIME)",
+    "CREATE INDEX ix_market_prices_id ON market_prices (id)",
+    "CREATE INDEX ix_market_prices_region_code ON market_prices (region_code)",
+    "CREATE INDEX ix_market_prices_legal_name ON market_prices (legal_name)",
+    "CREATE TABLE analysis_results (id INTEGER PRIMARY KEY, notice_id INTEGER, market_price_id INTEGER, "
+    "price_diff_percent FLOAT, score FLOAT, summary TEXT, created_at DATETIME)",
+    "CREATE INDEX ix_analysis_results_id ON analysis_results (id)",
+    "CREATE INDEX ix_analysis_results_notice_id ON analysis_results (notice_id)",
+    "CREATE INDEX ix_analysis_results_market_price_id ON analysis_results (market_price_id)",
+]
+
+class TestSqliteEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = make_engine(f"sqlite:///{os.path.join(self.tmp.name, 'test.db')}")
+        Base.metadata.create_all(bind=self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def pragma(self, conn, name):
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+    def test_pragmas_applied_on_connect(self):
+        with self.engine.connect() as conn:
+            self.assertEqual(self.pragma(conn, "journal_mode"), "wal")
+            self.assertEqual(self.pragma(conn, "synchronous"), 1) # NORMAL
+            self.assertEqual(self.pragma(conn, "busy_timeout"), 5000)
+            self.assertEqual(self.pragma(conn, "temp_store"), 2) # MEMORY
+
+        # A None override leaves SQLite's own default
+        plain = make_engine(f"sqlite:///{os.path.join(self.tmp.name, 'plain.db')}", pragmas={"journal_mode": None})
+        with plain.connect() as conn:
+            self.assertEqual(self.pragma(conn, "journal_mode"), "delete")
+        plain.dispose()
+
+    def test_reads_during_open_write_transaction(self):
+        Session = sessionmaker(bind=self.engine)
+        db = Session()
+        db.add(HousingNotice(title="기존 공고", platform="SH"))
+        db.commit()
+
+        writer = Session()
+        writer.add(HousingNotice(title="새 공고", platform="SH"))
+        writer.flush() # Holds the write lock until commit
+
+        # Another connection reads the last committed state without waiting for the writer
+        result = []
+        reader = threading.Thread(target=lambda: result.append(
+            Session().query(HousingNotice.title).all()
+        ))
+        reader.start()
+        reader.join(timeout=2)
+        self.assertFalse(reader.is_alive())
+        self.assertEqual(result, [[("기존 공고",)]])
+
+        writer.commit()
+        self.assertEqual(db.query(HousingNotice).count(), 2)
+        writer.close()
+        db.close()
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = make_engine(f"sqlite:///{os.path.join(self.tmp.name, 'test.db')}")
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def schema(self):
+        with self.engine.connect() as conn:
+            return {
+                (row[0], row[1]): row[2]
+                for row in conn.exec_driver_sql("SELECT type, name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'")
+            }
+
+    def columns(self, table):
+        with self.engine.connect() as conn:
+            return {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+
+    def test_new_database_starts_current(self):
+        self.assertEqual(migrate(self.engine), 0)
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("PRAGMA user_version").scalar(), SCHEMA_VERSION)
+        self.assertEqual(migrate(self.engine), 0)
+
+    def test_baseline_database_upgraded(self):
+        with self.engine.begin() as conn:
+            for ddl in BASELINE_SCHEMA:
+                conn.exec_driver_sql(ddl)
+            conn.exec_driver_sql("INSERT INTO housing_notices (id, title, platform, link) VALUES (1, '공고', 'SH', 'https://x/1')")
+            conn.exec_driver_sql(
+                "INSERT INTO geocoding_logs (address, status, error_message, created_at) VALUES "
+                "('A', 'FAILED', 'e1', '2026-01-01 00:00:00'), ('B', 'FAILED', 'x', '2026-01-02 00:00:00'), "
+                "('A', 'FAILED', 'e2', '2026-01-03 00:00:00')"
+            )
+            conn.exec_driver_sql("INSERT INTO market_prices (legal_name, avg_deposit) VALUES ('삼성동', 5000)")
+            conn.exec_driver_sql("INSERT INTO analysis_results (notice_id, score) VALUES (1, 1.0), (1, 4.0)")
+
+        self.assertEqual(migrate(self.engine), SCHEMA_VERSION)
+
+        # Same tables, columns and indexes as a database created from the models
+        fresh = make_engine(f"sqlite:///{os.path.join(self.tmp.name, 'fresh.db')}")
+        migrate(fresh)
+        with fresh.connect() as conn:
+            expected = {(row[0], row[1]) for row in conn.exec_driver_sql("SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'")}
+            for table in Base.metadata.tables:
+                fresh_columns = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+                self.assertEqual(self.columns(table), fresh_columns, table)
+        fresh.dispose()
+        self.assertEqual(set(self.schema()), expected)
+        with self.engine.connect() as conn:
+            unique = {row[1]: row[2] for row in conn.exec_driver_sql("PRAGMA index_list(housing_notices)")}
+        self.assertEqual(unique["ix_housing_notices_link"], 0) # Shared links are allowed
+
+        Session = sessionmaker(bind=self.engine)
+        db = Session()
+        self.assertEqual(db.query(HousingNotice.title, HousingNotice.dedup_key).all(), [("공고", None)])
+        logs = db.query(GeocodingLog.address, GeocodingLog.error_message, GeocodingLog.count).order_by(GeocodingLog.address).all()
+        self.assertEqual(logs, [("A", "e2", 2), ("B", "x", 1)])
+        self.assertEqual(db.query(MarketPrice).count(), 0) # Rebuilt by the next ingest
+        self.assertEqual(db.query(AnalysisResult.notice_id, AnalysisResult.score).all(), [(1, 4.0)])
+        db.close()
+        self.assertEqual(migrate(self.engine), 0)
+
+    def test_steps_only_create_their_own_indexes(self):
+        # A released step must not pick up indexes added to the models later
+        with self.engine.begin() as conn:
+            for ddl in BASELINE_SCHEMA:
+                conn.exec_driver_sql(ddl)
+            for step in MIGRATIONS[:5]:
+                step(conn)
+        indexes = {name for kind, name in self.schema() if kind == "index"}
+        self.assertIn("ix_housing_notices_region_end_date", indexes)
+        self.assertNotIn("ix_housing_notices_notice_date", indexes)
+        self.assertNotIn("ix_analysis_results_score_notice_id", indexes)
+
+class TestQueryPlans(unittest.TestCase):
+    """Every query shape the API and jobs run on hot paths is answered from an index."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.engine = make_engine(f"sqlite:///{os.path.join(cls.tmp.name, 'test.db')}")
+        migrate(cls.engine)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.dispose()
+        cls.tmp.cleanup()
+
+    def plan(self, statement):
+        compiled = statement.compile(dialect=self.engine.dialect, compile_kwargs={"render_postcompile": True})
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+        with self.engine.connect() as conn:
+            return " | ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params))
+
+    def assertUsesIndex(self, statement, index):
+        plan = self.plan(statement)
+        self.assertRegex(plan, f"USING (COVERING )?INDEX {index}\\b")
+        self.assertNotIn("TEMP B-TREE", plan) # No sort step either
+
+    def test_notices_by_region(self):
+        Session = sessionmaker(bind=self.engine)
+        db = Session()
+        query = db.query(HousingNotice).filter(HousingNotice.region == "강남구").offset(0).limit(100)
+        db.close()
+        self.assertUsesIndex(query.statement, "ix_housing_notices_region_end_date")
+        self.assertUsesIndex(
+            select(HousingNotice.id).where(HousingNotice.region == "강남구").order_by(HousingNotice.end_date),
+            "ix_housing_notices_region_end_date",
+        )
+
+    def test_platform_listing_by_date(self):
+        self.assertUsesIndex(
+            select(HousingNotice.id).where(HousingNotice.platform == "SH").order_by(HousingNotice.notice_date.desc()),
+            "ix_housing_notices_platform_notice_date",
+        )
+
+    def test_map_bounds(self):
+        self.assertUsesIndex(
+            select(HousingNotice.id).where(
+                HousingNotice.lat.between(37.4, 37.7), HousingNotice.lng.between(126.8, 127.2)
+            ),
+            "ix_housing_notices_lat_lng",
+        )
+
+    def test_lookups_by_key(self):
+        self.assertUsesIndex(
+            select(HousingNotice.id).where(HousingNotice.dedup_key.in_(["SH:a", "SH:b"])),
+            "ix_housing_notices_dedup_key",
+        )
+        self.assertUsesIndex(
+            select(AnalysisResult.score).where(AnalysisResult.notice_id == 1),
+            "ux_analysis_results_notice_id",
+        )
+        self.assertUsesIndex(
+            select(func.count()).select_from(NoticeUnit).where(NoticeUnit.notice_id == 1),
+            "ix_notice_units_notice_id",
+        )
+
+class TestSerializedWriter(unittest.TestCase):
+    def test_jobs_run_one_at_a_time_in_order(self):
+        order, threads = [], set()
+        release = threading.Event()
+
+        def job(n):
+            if n == 0:
+                release.wait(2)
+            order.append(n)
+            threads.add(threading.current_thread().name)
+            return n
+
+        futures = [run_serialized(job, n) for n in range(5)]
+        self.assertFalse(futures[1].done()) # Queued behind the first job
+        release.set()
+        self.assertEqual([f.result(timeout=2) for f in futures], [0, 1, 2, 3, 4])
+        self.assertEqual(order, [0, 1, 2, 3, 4])
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads.pop().startswith("db-writer"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+import sys
+import os
+import hashlib
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from unittest import mock
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SessionLocal, AttachmentDownload
+from db_helpers import use_test_database
+import downloader
+
+LAST_MODIFIED = "Mon, 02 Feb 2026 09:00:00 GMT"
+
+class AttachmentHandler(BaseHTTPRequestHandler):
+    """Serves server.files ({path: bytes}) with ETag / Last-Modified validators."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since")))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+            body = server.files.get(self.path.split("?")[0])
+            if body is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            etag = '"%s"' % hashlib.md5(body).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+            if self.path.startswith("/fileDown.do"):
+                self.send_header("Content-Disposition", 'attachment; filename="notice.hwp"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.path.endswith("?truncate"):
+                self.wfile.write(body[:len(body) // 2]) # Connection drops mid-body
+                return
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+class DownloaderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = use_test_database(self)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), AttachmentHandler)
+        self.server.files = {"/files/a.pdf": b"%PDF-1.4 a" * 20000, "/fileDown.do": b"HWP" * 100}
+        self.server.requests = []
+        self.server.delay = 0
+        self.server.in_flight = self.server.max_in_flight = 0
+        self.server.lock = threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def download_many(self, urls, **kwargs):
+        return downloader.download_many(urls, directory=self.directory, **kwargs)
+
+class TestConditionalDownloads(DownloaderTestCase):
+    def test_unchanged_attachment_costs_one_304(self):
+        url = f"{self.base}/files/a.pdf"
+        first = self.download_many([url, url])[url] # Duplicates fetched once
+        self.assertEqual(first.status, downloader.DOWNLOADED)
+        self.assertTrue(first.path.endswith(".pdf"))
+        with open(first.path, "rb") as f:
+            self.assertEqual(f.read(), self.server.files["/files/a.pdf"])
+        mtime = os.path.getmtime(first.path)
+
+        second = self.download_many([url])[url]
+        self.assertEqual((second.status, second.path), (downloader.NOT_MODIFIED, first.path))
+        self.assertEqual(os.path.getmtime(first.path), mtime)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.requests[1][1:], (f'"{hashlib.md5(self.server.files["/files/a.pdf"]).hexdigest()}"', LAST_MODIFIED))
+
+        # Changed on the server: downloaded again in place
+        self.server.files["/files/a.pdf"] = b"%PDF-1.4 b"
+        third = self.download_many([url])[url]
+        self.assertEqual((third.status, third.path), (downloader.DOWNLOADED, first.path))
+        db = SessionLocal()
+        record = db.query(AttachmentDownload).one()
+        db.close()
+        self.assertEqual((record.size, record.sha256), (10, hashlib.sha256(b"%PDF-1.4 b").hexdigest()))
+
+    def test_missing_local_copy_is_fetched_unconditionally(self):
+        url = f"{self.base}/fileDown.do?seq=7"
+        path = self.download_many([url])[url].path
+        self.assertTrue(path.endswith(".hwp")) # From Content-Disposition
+        os.remove(path)
+        self.assertEqual(self.download_many([url])[url].status, downloader.DOWNLOADED)
+        self.assertEqual(self.server.requests[1][1], None)
+
+    def test_failures_leave_no_partial_files(self):
+        url = f"{self.base}/files/a.pdf"
+        good = self.download_many([url])[url].path
+        results = self.download_many([f"{self.base}/files/missing.pdf", f"{url}?truncate"], save_paths={f"{url}?truncate": good})
+        self.assertEqual([r.status for r in results.values()], [downloader.FAILED, downloader.FAILED])
+        self.assertEqual(os.listdir(self.directory), [os.path.basename(good)])
+        with open(good, "rb") as f:
+            self.assertEqual(f.read(), self.server.files["/files/a.pdf"])
+
+class TestConcurrency(DownloaderTestCase):
+    def test_bounded_in_flight(self):
+        self.server.delay = 0.05
+        for n in range(12):
+            self.server.files[f"/files/{n}.pdf"] = b"x" * 1000
+        urls = [f"{self.base}/files/{n}.pdf" for n in range(12)]
+        with mock.patch.object(downloader, "_slots", threading.BoundedSemaphore(3)):
+            started = time.perf_counter()
+            results = self.download_many(urls, max_workers=12)
+            elapsed = time.perf_counter() - started
+        self.assertTrue(all(r.status == downloader.DOWNLOADED for r in results.values()))
+        self.assertEqual(self.server.max_in_flight, 3)
+        self.assertLess(elapsed, 12 * 0.05) # Still concurrent
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+import sys
+import os
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gazetteer
+from scrapers.sh_scraper import REGION_MATCHES
+
+class TestGazetteer(unittest.TestCase):
+    def test_scraper_addresses_resolve(self):
+        # Every address build_notice can produce is answered locally
+        self.assertIsNotNone(gazetteer.lookup("서울시청"))
+        for region in REGION_MATCHES.values():
+            self.assertIsNotNone(gazetteer.lookup(f"서울시 {region}청"), region)
+
+    def test_levels(self):
+        gangnam = gazetteer.lookup("서울특별시 강남구")
+        self.assertEqual(gazetteer.lookup("서울시 강남구청"), gangnam)
+        self.assertEqual(gazetteer.lookup("서울시 gangnam-gu"), gangnam)
+        self.assertNotEqual(gazetteer.lookup("서울시 강남구 자곡동"), gangnam)
+        self.assertIsNone(gazetteer.lookup("서울시 송파구 위례광장로")) # Street level
+        self.assertIsNone(gazetteer.lookup("서울시 강남구 자곡동 123"))
+        self.assertIsNone(gazetteer.lookup("경기도 성남시"))
+
+    def test_district_centroid(self):
+        self.assertEqual(gazetteer.district_centroid("서울시 송파구 위례광장로"), gazetteer.lookup("서울시 송파구"))
+        self.assertIsNone(gazetteer.district_centroid("없는 주소"))
+
+if __name__ == '__main__':
+    unittest.main()
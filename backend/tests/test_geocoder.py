@@ -0,0 +1,222 @@
+import unittest
+import sys
+import os
+import datetime
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from unittest import mock
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from database import SessionLocal, GeocodeCache, GeocodingLog
+from db_helpers import use_test_database
+import geocoder
+import gazetteer
+
+def kakao_response(status=200, documents=None):
+    response = mock.Mock(status_code=status)
+    response.json.return_value = {"documents": documents or []}
+    return response
+
+FOUND = kakao_response(documents=[{"y": "37.5172", "x": "127.0473"}])
+
+class GeocoderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = use_test_database(self)
+        geocoder._memory_cache.clear()
+        geocoder.reset_cache_stats()
+        for name, value in (("KAKAO_API_KEY", "test-key"), ("BACKOFF_SECONDS", 0)):
+            patcher = mock.patch.object(geocoder, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+class TestGeocodeCache(GeocoderTestCase):
+    def test_positive_entries_skip_the_api(self):
+        with mock.patch.object(geocoder.get_session(), "get", return_value=FOUND) as get:
+            self.assertEqual(geocoder.get_coordinates("서울특별시  강남구 테헤란로 152"), (37.5172, 127.0473))
+            self.assertEqual(geocoder.get_coordinates("서울시 강남구 테헤란로 152"), (37.5172, 127.0473))
+            geocoder._memory_cache.clear() # e.g. the next collection run
+            self.assertEqual(geocoder.get_coordinates("서울시 강남구 테헤란로 152"), (37.5172, 127.0473))
+        self.assertEqual(get.call_count, 1)
+
+        stats = geocoder.cache_stats()
+        self.assertEqual((stats["memory_hits"], stats["db_hits"], stats["misses"], stats["api_calls"]), (1, 1, 1, 1))
+
+    def test_negative_entries_expire(self):
+        with mock.patch.object(geocoder.get_session(), "get", return_value=kakao_response()) as get:
+            self.assertEqual(geocoder.get_coordinates("없는 주소 1"), (None, None))
+            self.assertEqual(geocoder.get_coordinates("없는 주소 1"), (None, None))
+            self.assertEqual(get.call_count, 1)
+            self.assertEqual(geocoder.cache_stats()["negative_hits"], 1)
+
+            # Past the TTL the address is looked up again
+            db = SessionLocal()
+            db.query(GeocodeCache).update({"expires_at": datetime.datetime.utcnow() - datetime.timedelta(seconds=1)})
+            db.commit()
+            db.close()
+            geocoder._memory_cache.clear()
+            geocoder.get_coordinates("없는 주소 1")
+            self.assertEqual(get.call_count, 2)
+
+    def test_transient_errors_are_not_cached(self):
+        with mock.patch.object(geocoder.get_session(), "get", return_value=kakao_response(status=500)) as get:
+            geocoder.get_coordinates("서울시 마포구 월드컵북로 400")
+            point = geocoder.get_coordinates("서울시 마포구 월드컵북로 400")
+        # Every lookup retries MAX_RETRIES times, and the failure isn't remembered
+        self.assertEqual(get.call_count, 2 * (geocoder.MAX_RETRIES + 1))
+        # Meanwhile the notice is placed at its gu centroid
+        self.assertEqual(point, gazetteer.lookup("서울시 마포구"))
+
+    def test_district_addresses_stay_offline(self):
+        with mock.patch.object(geocoder.get_session(), "get") as get:
+            results = geocoder.geocode_batch(["서울시청", "서울시 Gangnam-gu청", "서울시 강남구 자곡동"])
+        get.assert_not_called()
+        self.assertEqual(results["서울시 Gangnam-gu청"], gazetteer.lookup("서울시 강남구"))
+        self.assertEqual(geocoder.cache_stats()["gazetteer_hits"], 3)
+
+    def test_no_api_key_falls_back_to_district_centroid(self):
+        with mock.patch.object(geocoder, "KAKAO_API_KEY", None), \
+                mock.patch.object(geocoder.get_session(), "get") as get:
+            results = geocoder.geocode_batch(["서울시 송파구 위례광장로", "부산시 어딘가"])
+        get.assert_not_called()
+        self.assertEqual(results["서울시 송파구 위례광장로"], gazetteer.lookup("서울시 송파구"))
+        self.assertEqual(results["부산시 어딘가"], (None, None)) # No gu to fall back to
+
+        geocoder.flush_failures()
+        db = SessionLocal()
+        self.assertEqual(db.query(GeocodingLog).count(), 2) # Still logged as unresolved
+        db.close()
+
+class TestFailureLog(GeocoderTestCase):
+    def test_failures_are_buffered_and_aggregated(self):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            with mock.patch.object(geocoder, "KAKAO_API_KEY", ""):
+                geocoder.geocode_batch([f"서울시 노원구 {n}" for n in range(500)])
+                geocoder.geocode_batch(["서울시 노원구 0", "서울시 노원구 1"])
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+
+        inserts = [s for s in statements if s.startswith("INSERT INTO geocoding_logs")]
+        # Two full buffers of 200, the remaining 100 at the end of the batch, then the second batch
+        self.assertEqual(len(inserts), 4)
+
+        db = SessionLocal()
+        self.assertEqual(db.query(GeocodingLog).count(), 500)
+        log = db.query(GeocodingLog).filter(GeocodingLog.address == "서울시 노원구 0").one()
+        self.assertEqual((log.count, log.error_message), (2, "Kakao API Key missing"))
+        self.assertGreater(log.last_seen, log.first_seen)
+        db.close()
+
+class StubKakaoHandler(BaseHTTPRequestHandler):
+    """
+    Kakao address search stand-in: "없는" addresses have no documents, "429" ones are
+    throttled once, "깨진" ones get a 200 with a body that is not the API's JSON.
+    """
+
+    protocol_version = "HTTP/1.1" # Keep-alive, so pooled connections are reused
+
+    def do_GET(self):
+        server = self.server
+        query = parse_qs(urlsplit(self.path).query)["query"][0]
+        with server.lock:
+            server.requests.append(query)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            throttle = "429" in query and query not in server.throttled
+            server.throttled.add(query)
+            server.ports.add(self.client_address[1])
+        time.sleep(0.05)
+        with server.lock:
+            server.active -= 1
+
+        if throttle:
+            status, documents = 429, []
+        elif "없는" in query:
+            status, documents = 200, []
+        else:
+            status, documents = 200, [{"y": "37.5", "x": str(127 + len(query) / 100)}]
+        body = json.dumps({"documents": documents}).encode("utf-8")
+        if "깨진" in query:
+            body = b"<html>maintenance</html>" if "html" in query else b'{"errors": []}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestGeocodeBatch(GeocoderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubKakaoHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests, self.server.throttled, self.server.ports = [], set(), set()
+        self.server.active = self.server.peak = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{self.server.server_port}/v2/local/search/address.json"
+        for name, value in (("KAKAO_API_URL", url), ("_rate_limiter", geocoder.TokenBucket(1000))):
+            patcher = mock.patch.object(geocoder, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def test_batch_dedupes_and_runs_concurrently(self):
+        addresses = [f"서울시 강남구 자곡동 {n}" for n in range(16)]
+        addresses += ["서울특별시 강남구 자곡동 0", "서울시  강남구 자곡동 1", "없는 주소", "서울시 429 테스트"]
+
+        results = geocoder.geocode_batch(addresses)
+        self.assertEqual(set(results), set(addresses))
+        self.assertEqual(results["서울특별시 강남구 자곡동 0"], results["서울시 강남구 자곡동 0"])
+        self.assertEqual(results["없는 주소"], (None, None))
+        self.assertIsNotNone(results["서울시 429 테스트"][0]) # Retried after the 429
+
+        # 18 distinct addresses + one retry; duplicates never reach the API
+        self.assertEqual(len(self.server.requests), 19)
+        self.assertGreater(self.server.peak, 1)
+        self.assertLessEqual(self.server.peak, geocoder.MAX_WORKERS)
+        self.assertLessEqual(len(self.server.ports), geocoder.MAX_WORKERS) # Pooled connections
+
+        # Second batch is served entirely from the cache
+        geocoder.geocode_batch(addresses)
+        self.assertEqual(len(self.server.requests), 19)
+
+    def test_malformed_answer_is_a_per_address_failure(self):
+        addresses = ["서울시 강남구 깨진 html", "서울시 강남구 깨진 키", "서울시 강남구 자곡동 1"]
+        results = geocoder.geocode_batch(addresses)
+        self.assertIsNotNone(results["서울시 강남구 자곡동 1"][0])
+        # Unresolved street addresses fall back to their gu centroid
+        centroid = gazetteer.district_centroid(geocoder.normalize_address(addresses[0]))
+        self.assertEqual(results[addresses[0]], centroid)
+        self.assertEqual(results[addresses[1]], centroid)
+
+        db = SessionLocal()
+        logs = dict(db.query(GeocodingLog.address, GeocodingLog.error_message))
+        db.close()
+        self.assertEqual(set(logs), set(addresses[:2]))
+        self.assertTrue(all(e.startswith("Invalid API response") for e in logs.values()))
+        self.assertEqual(self.server.requests.count(addresses[0]), 1) # Not retried
+
+    def test_rate_limit(self):
+        with mock.patch.object(geocoder, "_rate_limiter", geocoder.TokenBucket(20, capacity=1)):
+            started = time.perf_counter()
+            geocoder.geocode_batch([f"서울시 마포구 {n}" for n in range(10)])
+            elapsed = time.perf_counter() - started
+        # 10 calls at 20/s with no burst take at least ~0.45s even with 8 workers
+        self.assertGreaterEqual(elapsed, 0.4)
+
+if __name__ == '__main__':
+    unittest.main()
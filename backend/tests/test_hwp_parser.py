@@ -0,0 +1,245 @@
+import unittest
+import sys
+import os
+import struct
+import tempfile
+import zipfile
+import zlib
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hwp_parser
+from file_parser import RegexParser, parse_hwp, parse_document, parse_files
+
+# Test documents are written here byte by byte, following the published HWP 5.0 /
+# OWPML formats, so the tests need neither Hancom Office nor sample files.
+
+SECTOR = 512
+MINI_SECTOR = 64
+MINI_CUTOFF = 4096
+ENDOFCHAIN = 0xFFFFFFFE
+FATSECT = 0xFFFFFFFD
+NOSTREAM = 0xFFFFFFFF
+
+def write_cfb(path, streams):
+    """Compound file with the given {"Storage/Stream": bytes}; small streams go to the mini stream."""
+    # Directory: root, then storages and streams; siblings chained through "right"
+    entries = [{"name": "Root Entry", "type": 5, "children": []}]
+    storages = {"": 0}
+    for name in streams:
+        parent = ""
+        for part in name.split("/")[:-1]:
+            key = f"{parent}/{part}" if parent else part
+            if key not in storages:
+                storages[key] = len(entries)
+                entries[storages[parent]]["children"].append(len(entries))
+                entries.append({"name": part, "type": 1, "children": []})
+            parent = key
+        entries[storages[parent]]["children"].append(len(entries))
+        entries.append({"name": name.split("/")[-1], "type": 2, "data": streams[name], "children": []})
+
+    mini_stream, minifat = bytearray(), []
+    big = []
+    for entry in entries:
+        data = entry.get("data")
+        if data is None:
+            continue
+        if len(data) < MINI_CUTOFF:
+            entry["start"] = len(mini_stream) // MINI_SECTOR if data else ENDOFCHAIN
+            count = -(-len(data) // MINI_SECTOR)
+            minifat += [len(minifat) + i + 1 for i in range(count - 1)] + [ENDOFCHAIN] * bool(count)
+            mini_stream += data + b"\0" * (-len(data) % MINI_SECTOR)
+        else:
+            big.append(entry)
+
+    # Sector layout after the FAT: directory, mini FAT, mini stream, big streams
+    blocks = [("dir", -(-len(entries) * 128 // SECTOR))]
+    blocks.append(("minifat", -(-len(minifat) * 4 // SECTOR)))
+    blocks.append(("ministream", -(-len(mini_stream) // SECTOR)))
+    blocks += [(entry, -(-len(entry["data"]) // SECTOR)) for entry in big]
+    used = sum(count for _, count in blocks)
+    fat_count = 1
+    while fat_count * (SECTOR // 4) < used + fat_count:
+        fat_count += 1
+
+    fat = [FATSECT] * fat_count
+    starts = {}
+    for block, count in blocks:
+        key = block if isinstance(block, str) else id(block)
+        starts[key] = len(fat) if count else ENDOFCHAIN
+        fat += [len(fat) + i + 1 for i in range(count - 1)] + [ENDOFCHAIN] * bool(count)
+    fat += [0xFFFFFFFF] * (-len(fat) % (SECTOR // 4))
+    for entry in big:
+        entry["start"] = starts[id(entry)]
+    entries[0]["start"] = starts["ministream"]
+    entries[0]["data"] = mini_stream
+
+    for entry in entries:
+        children = entry["children"]
+        for a, b in zip(children, children[1:]):
+            entries[a]["right"] = b
+    directory = bytearray()
+    for entry in entries:
+        children = entry["children"]
+        name = entry["name"].encode("utf-16-le") + b"\0\0"
+        record = bytearray(128)
+        record[:len(name)] = name
+        struct.pack_into("<HBB", record, 64, len(name), entry["type"], 1)
+        struct.pack_into(
+            "<III", record, 68, NOSTREAM, entry.get("right", NOSTREAM), children[0] if children else NOSTREAM
+        )
+        struct.pack_into("<IQ", record, 116, entry.get("start", ENDOFCHAIN), len(entry.get("data", b"")))
+        directory += record
+
+    header = bytearray(512)
+    header[:8] = hwp_parser.CFB_SIGNATURE
+    struct.pack_into("<HHHHH", header, 0x18, 0x3E, 3, 0xFFFE, 9, 6)
+    struct.pack_into(
+        "<IIIIIIII", header, 0x2C, fat_count, starts["dir"], 0, MINI_CUTOFF,
+        starts["minifat"], -(-len(minifat) * 4 // SECTOR), ENDOFCHAIN, 0,
+    )
+    difat = list(range(fat_count)) + [0xFFFFFFFF] * (109 - fat_count)
+    struct.pack_into("<109I", header, 0x4C, *difat)
+
+    def pad(data):
+        return bytes(data) + b"\0" * (-len(data) % SECTOR)
+
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(struct.pack(f"<{len(fat)}I", *fat))
+        f.write(pad(directory))
+        f.write(pad(struct.pack(f"<{len(minifat)}I", *minifat)))
+        f.write(pad(mini_stream))
+        for entry in big:
+            f.write(pad(entry["data"]))
+
+def record(tag, level, payload):
+    size = len(payload)
+    if size >= 0xFFF:
+        return struct.pack("<II", tag | level << 10 | 0xFFF << 20, size) + payload
+    return struct.pack("<I", tag | level << 10 | size << 20) + payload
+
+PARA_HEADER = 0x10 + 50
+TABLE = 0x10 + 61
+
+def paragraph(text, level=0):
+    # A tab is an inline control: 8 code units, the tab code at both ends
+    text = text.replace("\t", "\t" + "\0" * 6 + "\t")
+    return (
+        record(PARA_HEADER, level, b"\0" * 22)
+        + record(hwp_parser.TAG_PARA_TEXT, level + 1, (text + "\r").encode("utf-16-le"))
+    )
+
+def table(rows):
+    # Paragraph holding the table control, then one list header + paragraph per cell
+    control = "\x0b" + hwp_parser.TABLE_CTRL_ID.decode("utf-16-le") + "\0" * 4 + "\x0b"
+    out = record(PARA_HEADER, 0, b"\0" * 22)
+    out += record(hwp_parser.TAG_PARA_TEXT, 1, (control + "\r").encode("utf-16-le"))
+    out += record(hwp_parser.TAG_CTRL_HEADER, 1, hwp_parser.TABLE_CTRL_ID + b"\0" * 40)
+    out += record(TABLE, 2, b"\0" * 24)
+    for r, cells in enumerate(rows):
+        for c, text in enumerate(cells):
+            out += record(hwp_parser.TAG_LIST_HEADER, 2, b"\1\0\0\0\0\0\0\0" + struct.pack("<HH", c, r) + b"\0" * 22)
+            out += paragraph(text, level=2)
+    return out
+
+def write_hwp(path, sections, compressed=True, flags=0):
+    header = bytearray(256)
+    header[:len(hwp_parser.HWP_SIGNATURE)] = hwp_parser.HWP_SIGNATURE
+    struct.pack_into("<II", header, 32, 0x05000300, flags | (hwp_parser.FLAG_COMPRESSED if compressed else 0))
+    streams = {"FileHeader": bytes(header)}
+    for n, body in enumerate(sections):
+        if compressed:
+            deflate = zlib.compressobj(9, zlib.DEFLATED, -15)
+            body = deflate.compress(body) + deflate.flush()
+        streams[f"BodyText/Section{n}"] = body
+    write_cfb(path, streams)
+
+def write_hwpx(path, sections):
+    ns = 'xmlns:hp="http://www.hancom.co.kr/hwpml/2011/paragraph" xmlns:hs="http://www.hancom.co.kr/hwpml/2011/section"'
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("mimetype", "application/hwp+zip")
+        for n, body in reversed(list(enumerate(sections))):
+            archive.writestr(f"Contents/section{n}.xml", f'<?xml version="1.0" encoding="UTF-8"?><hs:sec {ns}>{body}</hs:sec>')
+
+def hwpx_paragraph(text):
+    return f"<hp:p><hp:run><hp:t>{text}</hp:t></hp:run></hp:p>"
+
+def hwpx_table(rows):
+    cells = "".join(
+        "<hp:tr>" + "".join(f"<hp:tc><hp:subList>{hwpx_paragraph(c)}</hp:subList></hp:tc>" for c in row) + "</hp:tr>"
+        for row in rows
+    )
+    return f"<hp:p><hp:run><hp:tbl>{cells}</hp:tbl></hp:run></hp:p>"
+
+RENT_ROWS = [
+    ["주택형", "전용면적(㎡)", "임대보증금(원)", "월임대료(원)"],
+    ["16A", "16.5㎡", "12,000,000", "150,000"],
+    ["26B", "26.9㎡", "1억 2000만원", "230,000"],
+]
+
+class HwpTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+class TestHwp5(HwpTestCase):
+    def test_sections_tables_and_controls(self):
+        path = self.path("notice.hwp")
+        write_hwp(path, [
+            paragraph("[공고] 청년 매입임대주택 입주자 모집") + paragraph("공고일:\t2026-02-01"),
+            table(RENT_ROWS) + paragraph("- 총자산 3억 4,500만원 이하"),
+        ])
+        sections = list(hwp_parser.iter_hwp_sections(path))
+        self.assertEqual(sections, [
+            "[공고] 청년 매입임대주택 입주자 모집\n공고일:\t2026-02-01",
+            "주택형\t전용면적(㎡)\t임대보증금(원)\t월임대료(원)\n"
+            "16A\t16.5㎡\t12,000,000\t150,000\n26B\t26.9㎡\t1억 2000만원\t230,000\n"
+            "- 총자산 3억 4,500만원 이하",
+        ])
+        units = RegexParser().extract_units(parse_hwp(path))
+        self.assertEqual([(u["unit_type"], u["deposit"]) for u in units], [("16A", 12000000.0), ("26B", 120000000.0)])
+
+    def test_large_uncompressed_section(self):
+        # > 4096 bytes: stored in regular sectors; one paragraph needs the extended record size
+        path = self.path("large.hwp")
+        long_line = "보증금 1,000만원 " * 300
+        write_hwp(path, [paragraph(long_line.strip()) + paragraph("끝")] * 2, compressed=False)
+        self.assertEqual(list(hwp_parser.iter_hwp_sections(path)), [long_line.strip() + "\n끝"] * 2)
+
+    def test_encrypted_document(self):
+        path = self.path("distribution.hwp")
+        write_hwp(path, [paragraph("본문")], flags=hwp_parser.FLAG_DISTRIBUTION)
+        with self.assertRaises(ValueError):
+            list(hwp_parser.iter_hwp_sections(path))
+        self.assertEqual(parse_hwp(path), "")
+
+class TestHwpx(HwpTestCase):
+    def test_sections_in_order(self):
+        path = self.path("notice.hwpx")
+        write_hwpx(path, [
+            hwpx_paragraph("[공고] 행복주택 모집") + hwpx_paragraph("신청<hp:tab/>2026.02.10 ~ 2026.02.15"),
+            hwpx_table(RENT_ROWS),
+        ])
+        self.assertEqual(list(hwp_parser.iter_hwp_sections(path)), [
+            "[공고] 행복주택 모집\n신청\t2026.02.10 ~ 2026.02.15",
+            "주택형\t전용면적(㎡)\t임대보증금(원)\t월임대료(원)\n"
+            "16A\t16.5㎡\t12,000,000\t150,000\n26B\t26.9㎡\t1억 2000만원\t230,000",
+        ])
+
+    def test_parse_document_and_worker_pool(self):
+        hwp, hwpx = self.path("a.hwp"), self.path("b.hwpx")
+        write_hwp(hwp, [paragraph("무주택 세대구성원")])
+        write_hwpx(hwpx, [hwpx_paragraph("월평균 소득 100% 이하")])
+        self.assertEqual(parse_document(hwp), "무주택 세대구성원\n")
+        self.assertEqual(parse_document(hwpx), "월평균 소득 100% 이하\n")
+        self.assertEqual(dict(parse_files([hwp, hwpx], workers=2)), {hwp: parse_document(hwp), hwpx: parse_document(hwpx)})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+import unittest
+import sys
+import os
+import json
+import threading
+from types import SimpleNamespace
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SessionLocal, MarketTransaction
+from db_helpers import use_test_database
+import real_estate
+import analyzer
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "rtms_sample.json")
+
+class TestMarketStore(unittest.TestCase):
+    def setUp(self):
+        self.engine = use_test_database(self)
+
+    def test_fixture_ingest(self):
+        saved = real_estate.run_market_ingest_job(fixture_path=FIXTURE_PATH)
+        # 12 rows in the dump, one without area is dropped
+        self.assertEqual(saved, 11)
+
+        # Re-running the same dump must not duplicate rows
+        self.assertEqual(real_estate.run_market_ingest_job(fixture_path=FIXTURE_PATH), 0)
+        db = SessionLocal()
+        self.assertEqual(db.query(MarketTransaction).count(), 11)
+        db.close()
+
+    def test_get_market_price_from_store(self):
+        real_estate.run_market_ingest_job(fixture_path=FIXTURE_PATH)
+
+        # 삼성동 20~30m2: (10000, 90), (5000, 110), (7000, 100)
+        price = real_estate.get_market_price("삼성동", 25.0)
+        self.assertEqual(price, {"avg_deposit": 7333, "avg_rent": 100})
+
+        price = real_estate.get_market_price("삼성동", 84.0, house_type="아파트")
+        self.assertEqual(price, {"avg_deposit": 80000, "avg_rent": 150})
+
+        self.assertEqual(real_estate.get_market_price("없는동", 25.0), {"avg_deposit": 0, "avg_rent": 0})
+        self.assertEqual(real_estate.get_market_price("", 25.0), {"avg_deposit": 0, "avg_rent": 0})
+
+    def test_lookup_uses_index(self):
+        db = SessionLocal()
+        stmt = db.query(MarketTransaction.deposit).filter(
+            MarketTransaction.legal_dong == "삼성동",
+            MarketTransaction.house_type.in_(list(real_estate.HOUSE_TYPES)),
+            MarketTransaction.area_bucket.between(4, 6),
+        ).statement.compile(compile_kwargs={"literal_binds": True})
+        plan = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {stmt}").fetchall()
+        db.close()
+        self.assertTrue(any("ix_market_tx_dong_type_bucket" in row[-1] for row in plan), plan)
+
+class TestMarketAggregates(unittest.TestCase):
+    def setUp(self):
+        self.engine = use_test_database(self)
+        real_estate.run_market_ingest_job(fixture_path=FIXTURE_PATH)
+
+    def test_percentile_row(self):
+        # 삼성동 20~30m2 officetels: rents 90, 110, 100 / deposits 10000, 5000, 7000
+        stats = real_estate.get_market_stats("삼성동", 25.0)
+        self.assertEqual(stats["count"], 3)
+        self.assertEqual(stats["median_rent"], 100)
+        self.assertEqual((stats["p25_rent"], stats["p75_rent"]), (95, 105))
+        self.assertEqual(stats["median_deposit"], 7000)
+        self.assertEqual(stats["avg_deposit"], 7333)
+
+        self.assertEqual(real_estate.get_market_stats("삼성동", 25.0, building_type="오피스텔")["count"], 3)
+        self.assertIsNone(real_estate.get_market_stats("삼성동", 25.0, building_type="아파트"))
+        self.assertIsNone(real_estate.get_market_stats("없는동", 25.0))
+
+    def test_incremental_refresh_bumps_only_touched_keys(self):
+        new_deal = {
+            "SGG_CD": "11680", "BJDONG_NM": "삼성동", "HOUSE_TYPE": "오피스텔", "BLDG_AREA": "27.0",
+            "RENT_GTN": "6,000", "RENT_FEE": "400", "DEAL_YMD": "20260201",
+        }
+        real_estate.ingest_transactions([[new_deal]])
+
+        stats = real_estate.get_market_stats("삼성동", 25.0)
+        self.assertEqual(stats["count"], 4)
+        self.assertEqual(stats["version"], 2)
+        # The outlier moves the median only slightly
+        self.assertEqual(stats["median_rent"], 105)
+        self.assertEqual(real_estate.get_market_stats("잠실동", 59.9)["version"], 1)
+
+    def test_analyze_notice_reads_median(self):
+        notice = SimpleNamespace(address="서울시 강남구 삼성동 123", rent=500000, deposit=0)
+        # Market medians 7000만원 / 100만원 -> 126.25만원 per month vs notice 50만원
+        self.assertEqual(analyzer.analyze_notice(notice, target_area=25.0), (5.0, 60.4))
+
+        notice = SimpleNamespace(address="서울시청", rent=500000, deposit=0)
+        self.assertEqual(analyzer.analyze_notice(notice, target_area=25.0), (2.5, 0.0))
+
+class StubSeoulAPI(BaseHTTPRequestHandler):
+    """Serves recorded rows as /{KEY}/json/tbLnOpendataRtmsV/{start}/{end}/ pages (newest first)."""
+    rows = []
+    requested = []
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        start, end = int(parts[3]), int(parts[4])
+        StubSeoulAPI.requested.append((start, end))
+        page = StubSeoulAPI.rows[start - 1:end]
+        if page:
+            body = {"tbLnOpendataRtmsV": {"list_total_count": len(StubSeoulAPI.rows), "row": page}}
+        else:
+            body = {"RESULT": {"CODE": "INFO-200", "MESSAGE": "해당하는 데이터가 없습니다."}}
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+class TestIncrementalIngest(unittest.TestCase):
+    def setUp(self):
+        self.engine = use_test_database(self)
+
+        with open(FIXTURE_PATH, encoding="utf-8") as f:
+            recorded = [row for page in json.load(f) for row in page["tbLnOpendataRtmsV"]["row"]]
+        StubSeoulAPI.rows = recorded
+        StubSeoulAPI.requested = []
+
+        self.server = HTTPServer(("127.0.0.1", 0), StubSeoulAPI)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.saved_config = (real_estate.SEOUL_API_BASE, real_estate.SEOUL_DATA_KEY)
+        real_estate.SEOUL_API_BASE = f"http://127.0.0.1:{self.server.server_port}"
+        real_estate.SEOUL_DATA_KEY = "test-key"
+
+    def tearDown(self):
+        real_estate.SEOUL_API_BASE, real_estate.SEOUL_DATA_KEY = self.saved_config
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_delta_only_fetch(self):
+        # First run has no watermark: full history, 12 rows in pages of 1000
+        self.assertEqual(real_estate.run_market_ingest_job(incremental=True), 11)
+        db = SessionLocal()
+        self.assertEqual(real_estate.get_watermark(db), "20260130")
+        db.close()
+
+        # Two new deals arrive at the head of the (newest-first) dataset
+        new_rows = [
+            dict(StubSeoulAPI.rows[0], DEAL_YMD="20260201", RENT_FEE="95"),
+            dict(StubSeoulAPI.rows[1], DEAL_YMD="20260131", RENT_FEE="105"),
+        ]
+        StubSeoulAPI.rows = new_rows + StubSeoulAPI.rows
+        StubSeoulAPI.requested = []
+
+        saved = real_estate.ingest_transactions(
+            real_estate.pages_until_watermark(real_estate.iter_api_pages(page_size=2), "20260130")
+        )[0]
+        self.assertEqual(saved, 2)
+        # Page 1 is all new, page 2 reaches the watermark, older pages are never fetched
+        self.assertEqual(StubSeoulAPI.requested, [(1, 2), (3, 4)])
+
+    def test_incremental_job_updates_watermark(self):
+        real_estate.run_market_ingest_job()
+        StubSeoulAPI.rows = [dict(StubSeoulAPI.rows[0], DEAL_YMD="20260205")] + StubSeoulAPI.rows
+
+        self.assertEqual(real_estate.run_market_ingest_job(incremental=True), 1)
+        db = SessionLocal()
+        self.assertEqual(real_estate.get_watermark(db), "20260205")
+        db.close()
+
+if __name__ == '__main__':
+    unittest.main()
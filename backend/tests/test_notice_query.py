@@ -0,0 +1,162 @@
+import unittest
+import sys
+import os
+import random
+from datetime import datetime, timedelta
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from database import SessionLocal, HousingNotice, AnalysisResult
+from db_helpers import use_test_database
+from notice_query import list_notices, encode_cursor, parse_fields
+from schemas import NOTICE_FIELDS
+import main
+
+NOW = datetime(2026, 3, 1, 15, 30)
+REGIONS = ["강남구", "강동구", "마포구", "Gangnam-gu"]
+
+class NoticeQueryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = use_test_database(self)
+        self.db = SessionLocal()
+
+        # Repeated dates and scores (ties), some missing (nulls last)
+        rng = random.Random(7)
+        self.notices, self.scores = [], {}
+        for i in range(1, 41):
+            notice = HousingNotice(
+                id=i, title=f"공고 {i}", platform=rng.choice(["SH", "LH"]), region=REGIONS[i % 4],
+                notice_date=None if i % 13 == 0 else datetime(2026, 2, rng.randrange(1, 6)),
+                end_date=None if i % 11 == 0 else datetime(2026, 2, 25) + timedelta(days=rng.randrange(8)),
+            )
+            self.notices.append(notice)
+            if i % 5:
+                self.scores[i] = float(rng.randrange(1, 6))
+        self.db.add_all(self.notices)
+        self.db.add_all([AnalysisResult(notice_id=i, score=s) for i, s in self.scores.items()])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def walk(self, limit=7, **kwargs):
+        """Ids of every page, following next_cursor."""
+        ids, cursor, pages = [], None, 0
+        while True:
+            items, cursor = list_notices(self.db, cursor=cursor, limit=limit, now=NOW, **kwargs)
+            ids += [item["id"] for item in items]
+            pages += 1
+            if cursor is None:
+                return ids
+            self.assertLess(pages, 50)
+
+    def expected(self, key, descending, keep=lambda n: True):
+        notices = [n for n in self.notices if keep(n)]
+        keyed = sorted((n for n in notices if key(n) is not None), key=lambda n: (key(n), n.id), reverse=descending)
+        unkeyed = sorted((n.id for n in notices if key(n) is None), reverse=descending)
+        return [n.id for n in keyed] + unkeyed
+
+class TestKeysetPagination(NoticeQueryTestCase):
+    def test_sorts_walk_every_notice_once(self):
+        self.assertEqual(self.walk(sort="latest"), self.expected(lambda n: n.notice_date, True))
+        self.assertEqual(self.walk(sort="deadline"), self.expected(lambda n: n.end_date, False))
+        self.assertEqual(self.walk(sort="score"), self.expected(lambda n: self.scores.get(n.id), True))
+        # Page boundary falling exactly on the last keyed notice
+        keyed = sum(1 for n in self.notices if n.notice_date is not None)
+        self.assertEqual(self.walk(sort="latest", limit=keyed), self.walk(sort="latest", limit=100))
+
+    def test_filters(self):
+        self.assertEqual(
+            self.walk(sort="deadline", region="강", platform="sh", active=True),
+            self.expected(lambda n: n.end_date, False, lambda n: (
+                n.region.startswith("강") and n.platform == "SH" and n.end_date is not None and n.end_date >= datetime(2026, 3, 1)
+            )),
+        )
+        self.assertEqual(
+            self.walk(sort="latest", min_score=2, max_score=4),
+            self.expected(lambda n: n.notice_date, True, lambda n: 2 <= self.scores.get(n.id, 0) <= 4),
+        )
+        items, _ = list_notices(self.db, sort="score", limit=1)
+        self.assertEqual(items[0]["score"], 5.0)
+        self.assertEqual(items[0]["title"], self.db.get(HousingNotice, items[0]["id"]).title)
+
+    def test_invalid_cursor(self):
+        _, cursor = list_notices(self.db, sort="latest", limit=5)
+        with self.assertRaises(ValueError):
+            list_notices(self.db, sort="score", cursor=cursor) # Made for another sort
+        for token in ("not-a-cursor", encode_cursor("latest", "yesterday", 3)):
+            with self.assertRaises(ValueError):
+                list_notices(self.db, sort="latest", cursor=token)
+
+    def test_pages_are_index_walks(self):
+        _, cursor = list_notices(self.db, sort="score", limit=5)
+        for sort in ("latest", "deadline", "score"):
+            statements = []
+            listener = lambda *args: statements.append((args[2], args[3]))
+            event.listen(self.engine, "before_cursor_execute", listener)
+            try:
+                list_notices(self.db, sort=sort, cursor=cursor if sort == "score" else None, limit=5)
+            finally:
+                event.remove(self.engine, "before_cursor_execute", listener)
+            with self.engine.connect() as conn:
+                plan = " | ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statements[0][0]}", statements[0][1]))
+            self.assertNotIn("TEMP B-TREE", plan, sort)
+            self.assertIn("INDEX", plan, sort)
+
+class TestProjection(NoticeQueryTestCase):
+    def test_fields(self):
+        items, _ = list_notices(self.db, limit=3)
+        self.assertEqual(list(items[0]), NOTICE_FIELDS)
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            items, cursor = list_notices(self.db, limit=3, fields=parse_fields("title, region,title"))
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+        self.assertEqual(list(items[0]), ["id", "title", "region"])
+        self.assertNotIn("summary_", statements[0])
+        self.assertNotIn("analysis_results", statements[0]) # Score neither shown nor used
+        self.assertEqual(
+            [n["id"] for n in list_notices(self.db, limit=3, cursor=cursor, fields=["id"])[0]],
+            self.walk(sort="latest")[3:6],
+        )
+
+        self.assertEqual(list(list_notices(self.db, sort="score", limit=1, fields=["id", "score"])[0][0]), ["id", "score"])
+        with self.assertRaises(ValueError):
+            parse_fields("title,dedup_key")
+
+class TestNoticesEndpoint(NoticeQueryTestCase):
+    def test_endpoint(self):
+        client = TestClient(main.app)
+        first = client.get("/notices", params={"sort": "deadline", "limit": 30}).json()
+        second = client.get("/notices", params={"sort": "deadline", "limit": 30, "cursor": first["next_cursor"]}).json()
+        self.assertEqual(second["next_cursor"], None)
+        ids = [n["id"] for n in first["items"] + second["items"]]
+        self.assertEqual(ids, self.expected(lambda n: n.end_date, False))
+
+        self.assertEqual(client.get("/notices", params={"cursor": "garbage"}).status_code, 400)
+        self.assertEqual(client.get("/notices", params={"sort": "random"}).status_code, 422)
+        self.assertEqual(client.get("/notices", params={"limit": 500}).status_code, 422)
+
+    def test_response_body(self):
+        client = TestClient(main.app)
+        response = client.get("/notices", params={"sort": "score", "limit": 1})
+        self.assertEqual(response.headers["content-type"], "application/json")
+        item = response.json()["items"][0]
+        self.assertNotIn("dedup_key", item)
+        self.assertEqual(item["score"], 5.0)
+        item = client.get("/notices", params={"limit": 1}).json()["items"][0]
+        notice = self.db.get(HousingNotice, item["id"])
+        self.assertEqual(item["notice_date"], notice.notice_date.isoformat())
+
+        page = client.get("/notices", params={"fields": "title,score", "limit": 2}).json()
+        self.assertEqual([list(n) for n in page["items"]], [["id", "title", "score"]] * 2)
+        self.assertEqual(client.get("/notices", params={"fields": "title,password"}).status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import sys
+import os
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from database import SessionLocal, HousingNotice, AnalysisResult, migrate
+from db_helpers import use_test_database
+from notice_search import search_notices
+import main
+
+class NoticeSearchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = use_test_database(self)
+        self.db = SessionLocal()
+        self.db.add_all([
+            HousingNotice(id=1, title="[서울] 청년 매입임대주택 입주자 모집", region="강남구", address="서울특별시 강남구 삼성동 100"),
+            HousingNotice(id=2, title="행복주택 예비입주자 모집", region="마포구", address="서울특별시 마포구 상암동 1",
+                          summary_qualifications="신혼부부, 청년 (만 19~39세)"),
+            HousingNotice(id=3, title="강남구 장기전세 공급 공고", region="강남구", address="서울특별시 강남구 세곡동 5"),
+            HousingNotice(id=4, title="LH 국민임대 모집 (100% 할인_특별)", region="노원구", address="서울특별시 노원구 중계동"),
+        ])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def ids(self, q, **kwargs):
+        return [n["id"] for n in search_notices(self.db, q, **kwargs)]
+
+class TestSearch(NoticeSearchTestCase):
+    def test_ranked_substring_search(self):
+        # Title hits rank above address-only hits
+        self.assertEqual(self.ids("강남구"), [3, 1])
+        self.assertEqual(self.ids("매입임대"), [1]) # Inside a word
+        self.assertEqual(self.ids("강남구 세곡동"), [3]) # Every term must match
+        self.assertEqual(self.ids("신혼부부"), [2]) # Summaries are indexed
+        self.assertEqual(self.ids("강남구", limit=1, offset=1), [1])
+        self.assertEqual(self.ids("부산광역시"), [])
+        self.assertEqual(self.ids("   "), [])
+
+    def test_short_terms(self):
+        self.assertEqual(self.ids("청년"), [2, 1]) # No trigram: LIKE filter, newest first
+        self.assertEqual(self.ids("LH"), [4])
+        self.assertEqual(self.ids("모집 청년"), [2, 1])
+        self.assertEqual(self.ids("세곡동 강남"), [3])
+        self.assertEqual(self.ids("%"), [4]) # Wildcards are literal
+        self.assertEqual(self.ids('"국민'), [])
+
+    def test_index_follows_writes(self):
+        notice = self.db.get(HousingNotice, 1)
+        notice.region, notice.address = "송파구", "서울특별시 송파구 문정동"
+        self.db.add(HousingNotice(id=5, title="송파구 청년안심주택", region="송파구"))
+        self.db.delete(self.db.get(HousingNotice, 3))
+        self.db.commit()
+        self.assertEqual(self.ids("송파구"), [5, 1])
+        self.assertEqual(self.ids("강남구"), [])
+        self.assertEqual(self.ids("세곡동"), [])
+
+    def test_existing_rows_indexed_by_migration(self):
+        with self.engine.begin() as conn:
+            for name in ("notice_search_ai", "notice_search_ad", "notice_search_au"):
+                conn.exec_driver_sql(f"DROP TRIGGER {name}")
+            conn.exec_driver_sql("DROP TABLE notice_search")
+            conn.exec_driver_sql("PRAGMA user_version = 5")
+        migrate(self.engine)
+        self.assertEqual(self.ids("상암동"), [2])
+
+class TestSearchEndpoint(NoticeSearchTestCase):
+    def test_endpoint(self):
+        client = TestClient(main.app)
+        response = client.get("/notices/search", params={"q": "강남구"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([n["id"] for n in response.json()], [3, 1])
+        self.assertEqual(client.get("/notices/search").status_code, 422)
+        self.assertEqual(client.get("/notices/search", params={"q": "강남구", "limit": 1000}).status_code, 422)
+        # SQLite reads LIMIT -1 as no limit
+        self.assertEqual(client.get("/notices/search", params={"q": "강남구", "limit": -1}).status_code, 422)
+        self.assertEqual(client.get("/notices/search", params={"q": "강남구", "limit": 0}).status_code, 422)
+        self.assertEqual(client.get("/notices/search", params={"q": "강남구", "skip": -1}).status_code, 422)
+
+    def test_same_rows_as_notices(self):
+        self.db.add(AnalysisResult(notice_id=1, score=2.5))
+        self.db.commit()
+        client = TestClient(main.app)
+        found = client.get("/notices/search", params={"q": "매입임대"}).json()
+        listed = {n["id"]: n for n in client.get("/notices").json()["items"]}
+        self.assertEqual(found[0]["score"], 2.5)
+        self.assertEqual(found, [listed[1]])
+
+if __name__ == '__main__':
+    unittest.main()
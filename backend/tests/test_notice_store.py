@@ -0,0 +1,131 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from database import SessionLocal, HousingNotice, NoticeUnit
+from db_helpers import use_test_database
+from notice_store import notice_dedup_key, upsert_notices, backfill_dedup_keys
+
+def make_item(n, **overrides):
+    item = {
+        "title": f"[서울] 청년 매입임대 {n}차 모집",
+        "date": "2026-02-01",
+        "link": f"https://apply.lh.or.kr/notice/view?b=2&id={n}",
+        "start_date": datetime(2026, 2, 1),
+        "end_date": datetime(2026, 2, 15),
+        "platform": "LH",
+        "region": "Gangnam-gu",
+        "address": "서울시 강남구 자곡동",
+        "area": 36.0,
+        "deposit": 15000000,
+        "rent": 150000,
+        "qualifications": "청년",
+        "income": "소득",
+        "assets": "자산: 2.9억",
+    }
+    item.update(overrides)
+    return item
+
+class TestDedupKey(unittest.TestCase):
+    def test_link_normalization(self):
+        a = notice_dedup_key({"platform": "lh", "link": "HTTPS://Apply.LH.or.kr/notice/view/?id=3&b=2#top"})
+        b = notice_dedup_key({"platform": "LH", "link": "https://apply.lh.or.kr/notice/view?b=2&id=3"})
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, notice_dedup_key({"platform": "SH", "link": "https://apply.lh.or.kr/notice/view?b=2&id=3"}))
+
+    def test_synthetic_links_use_content_hash(self):
+        item = {"platform": "SH", "title": "송파구 임대 모집", "region": "Songpa-gu",
+                "link": "https://www.google.com/search?q=송파구 임대 모집"}
+        key = notice_dedup_key(item)
+        self.assertTrue(key.startswith("SH:sha1:"))
+        self.assertEqual(key, notice_dedup_key(dict(item, link="")))
+
+class TestUpsertNotices(unittest.TestCase):
+    def setUp(self):
+        self.engine = use_test_database(self)
+        self.db = SessionLocal()
+        self.geocoded = []
+
+    def tearDown(self):
+        self.db.close()
+
+    def geocode(self, addresses):
+        self.geocoded.append(list(addresses))
+        return {address: (37.5, 127.0) for address in addresses}
+
+    def test_insert_refresh_and_geocode_once(self):
+        items = [make_item(n) for n in range(5)]
+        self.assertEqual(upsert_notices(self.db, items, geocode=self.geocode), (5, 0))
+        self.assertEqual(len(self.geocoded), 1) # One batch call for the whole save
+        self.assertEqual(len(self.geocoded[0]), 5)
+
+        # Same notices again, one of them changed: refreshed, not duplicated, not re-geocoded
+        items[2] = make_item(2, rent=170000, title="[서울] 청년 매입임대 2차 모집 (정정)")
+        self.assertEqual(upsert_notices(self.db, items, geocode=self.geocode), (0, 5))
+        self.assertEqual(len(self.geocoded), 1)
+        self.assertEqual(self.db.query(HousingNotice).count(), 5)
+
+        notice = self.db.query(HousingNotice).filter(HousingNotice.link == items[2]["link"]).one()
+        self.assertEqual((notice.rent, notice.title), (170000, "[서울] 청년 매입임대 2차 모집 (정정)"))
+        self.assertEqual((notice.lat, notice.lng), (37.5, 127.0))
+
+        # Address change triggers a new geocode
+        upsert_notices(self.db, [make_item(0, address="서울시 강남구 세곡동")], geocode=self.geocode)
+        self.assertEqual(self.geocoded[-1], ["서울시 강남구 세곡동"])
+
+    def test_duplicates_within_batch(self):
+        items = [make_item(1), make_item(1, rent=99000)]
+        self.assertEqual(upsert_notices(self.db, items, geocode=self.geocode), (1, 0))
+        self.assertEqual(self.db.query(HousingNotice.rent).scalar(), 99000)
+
+    def test_shared_link_with_different_keys(self):
+        # Same link under two platforms: two notices, not an IntegrityError
+        items = [make_item(1), make_item(1, platform="SH")]
+        self.assertEqual(upsert_notices(self.db, items, geocode=None), (2, 0))
+        self.assertEqual(upsert_notices(self.db, items, geocode=None), (0, 2))
+        self.assertEqual(
+            sorted(self.db.query(HousingNotice.platform).filter(HousingNotice.link == items[0]["link"])),
+            [("LH",), ("SH",)],
+        )
+
+    def test_constant_statement_count(self):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            upsert_notices(self.db, [make_item(n) for n in range(300)], geocode=None)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+        # One existence lookup, one executemany upsert
+        self.assertEqual(len(statements), 2, statements)
+
+    def test_units_replaced_on_refresh(self):
+        units = [
+            {"unit_type": "16A", "area": 16.5, "deposit": 12000000.0, "rent": 150000.0},
+            {"unit_type": "26B", "area": 26.9, "deposit": 120000000.0, "rent": 230000.0},
+        ]
+        upsert_notices(self.db, [make_item(1, units=units), make_item(2)], geocode=None)
+        rows = self.db.query(NoticeUnit.unit_type, NoticeUnit.deposit, NoticeUnit.effective_monthly_cost).all()
+        self.assertEqual(sorted(rows), [("16A", 12000000, 195000), ("26B", 120000000, 680000)])
+
+        # Scraped again with one unit left; an item without units keeps what is stored
+        upsert_notices(self.db, [make_item(1, units=units[:1])], geocode=None)
+        upsert_notices(self.db, [make_item(1)], geocode=None)
+        notice_id = self.db.query(HousingNotice.id).filter(HousingNotice.link == make_item(1)["link"]).scalar()
+        self.assertEqual(self.db.query(NoticeUnit.notice_id, NoticeUnit.unit_type).all(), [(notice_id, "16A")])
+
+    def test_backfill_matches_old_rows(self):
+        item = make_item(7)
+        self.db.add(HousingNotice(title=item["title"], platform="LH", link=item["link"], rent=1))
+        self.db.commit()
+        self.assertEqual(backfill_dedup_keys(self.db), 1)
+        self.assertEqual(upsert_notices(self.db, [item], geocode=None), (0, 1))
+        self.assertEqual(self.db.query(HousingNotice).count(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parse_cache
+from parse_cache import ParseCache, parse_documents
+from file_parser import parse_pdf
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "notice_18p.pdf")
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.cache_dir = os.path.join(self.tmp, "cache")
+
+    def copy(self, name, data=None):
+        path = os.path.join(self.tmp, name)
+        if data is None:
+            shutil.copy(SAMPLE_PDF, path)
+        else:
+            with open(path, "wb") as f:
+                f.write(data)
+        return path
+
+    def test_reruns_skip_parsing(self):
+        first = self.copy("a.pdf")
+        renamed = self.copy("b.pdf") # Same bytes under another name
+
+        with mock.patch.object(parse_cache, "parse_document", side_effect=parse_pdf) as parse:
+            entry = parse_documents([first], ParseCache(self.cache_dir))[first]
+            self.assertEqual(entry["text"], parse_pdf(SAMPLE_PDF))
+            self.assertIn("area", entry["sections"])
+
+            # Next run: new cache instance, same directory
+            cache = ParseCache(self.cache_dir)
+            results = parse_documents([first, renamed], cache)
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(results[renamed], entry)
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 0, "hit_rate": 1.0})
+
+    def test_lru_eviction(self):
+        cache = ParseCache(self.cache_dir, max_bytes=700) # Room for two ~300 byte entries
+        paths = [self.copy(f"{n}.pdf", f"document {n}".encode()) for n in range(3)]
+        with mock.patch.object(parse_cache, "parse_document", return_value="x" * 200):
+            cache.parse(paths[0])
+            time.sleep(0.01)
+            cache.parse(paths[1])
+            time.sleep(0.01)
+            cache.parse(paths[0]) # Touch: paths[1] is now least recently used
+            time.sleep(0.01)
+            cache.parse(paths[2])
+
+        digests = [parse_cache.file_sha256(p) for p in paths]
+        self.assertIsNotNone(cache.get(digests[0]))
+        self.assertIsNone(cache.get(digests[1]))
+        self.assertIsNotNone(cache.get(digests[2]))
+        self.assertLessEqual(cache._disk_usage(), 700)
+
+    def test_parser_version_bump_misses(self):
+        path = self.copy("a.pdf", b"document")
+        with mock.patch.object(parse_cache, "parse_document", return_value="old parser text") as parse:
+            ParseCache(self.cache_dir).parse(path)
+            with mock.patch.object(parse_cache, "PARSER_VERSION", parse_cache.PARSER_VERSION + 1):
+                parse.return_value = "new parser text"
+                cache = ParseCache(self.cache_dir)
+                self.assertEqual(cache.parse(path)["text"], "new parser text")
+        self.assertEqual(parse.call_count, 2)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_empty_text_not_cached(self):
+        path = self.copy("a.hwp", b"document")
+        with mock.patch.object(parse_cache, "parse_document", return_value=" \n") as parse:
+            ParseCache(self.cache_dir).parse(path)
+            cache = ParseCache(self.cache_dir)
+            cache.parse(path)
+        self.assertEqual(parse.call_count, 2)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache._disk_usage(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import sys
+import os
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_parser import RegexParser
+
+# Expected values are what the per-pattern findall implementation returned
+class TestSinglePassTokenizer(unittest.TestCase):
+    def setUp(self):
+        self.parser = RegexParser()
+
+    def test_dates_and_areas_inside_number_runs(self):
+        text = "접수 12026-02-0105-03-04, 면적 84.5㎡ 1,000평 29m23평"
+        self.assertEqual(self.parser.extract_dates(text), ["2026-02-01", "2005-03-04"])
+        self.assertEqual(self.parser.extract_area(text), [84.5, 29.0])
+        self.assertEqual(self.parser.extract_amounts(text), [])
+
+    def test_overlapping_keywords(self):
+        keywords = self.parser.extract_keywords("도시근로자 중위소득 50%, 소득인정액")
+        self.assertEqual(keywords["income"], ["소득", "중위소득"])
+
+    def test_asset_limits_per_line_and_joined(self):
+        text = "총자산가액 3억 4,500만원 이하\n자동차, 없음\n부동산 2억"
+        self.assertEqual(
+            sorted(self.parser.extract_keywords(text)["assets"]),
+            ["가액: 3억", "부동산: 2억", "자동차: ,", "자산: 3억"],
+        )
+        # parse() sees the normalized text, where 자동차 reaches the next line's number
+        self.assertEqual(
+            sorted(self.parser.parse(text)["keywords"]["assets"]),
+            ["가액: 3억", "부동산: 2억", "자동차: 2억", "자산: 3억"],
+        )
+
+    def test_amount_rules(self):
+        amounts = self.parser.extract_amounts("보증금 0원, 임대료 1,500,000 관리비 99,999")
+        self.assertEqual(amounts, [("1,500,000", 1500000.0)])
+
+    def test_token_positions(self):
+        text = "보증금 1,000만원, 전용 29㎡, 공고일 2026.02.01"
+        tokens = {t.kind: t for t in self.parser.tokenize(text)}
+        for kind, expected in (("amount", "1,000만원"), ("area", "29㎡"), ("date", "2026.02.01")):
+            token = tokens[kind]
+            self.assertEqual(text[token.start:token.end], expected)
+        self.assertEqual(tokens["amount"].value, 10000000.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_parser import RegexParser, iter_pdf_pages, parse_pdf, parse_pdfs, extract_sections, extract_sections_from_pages
+
+# 18 pages, each starting with "Notice 0 - page N" (written by benchmarks/bench_pdf_parse.py)
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "notice_18p.pdf")
+
+NOTICE_PAGES = [
+    "[공고] 2026년 청년 매입임대주택 입주자 모집\n공고일: 2026-02-01",
+    "1. 신청자격\n- 무주택 세대구성원, 월평균 소득 100% 이하\n- 총자산 3억 이하, 자동차 3,708만원 이하",
+    "2. 임대조건\n- 보증금: 1,000만원\n- 월임대료: 150,000원\n- 전용면적 29m2",
+]
+
+class TestPdfStreaming(unittest.TestCase):
+    def test_pages_stream_in_order(self):
+        pages = list(iter_pdf_pages(SAMPLE_PDF))
+        self.assertEqual(len(pages), 18)
+        self.assertEqual([p.splitlines()[0] for p in pages], [f"Notice 0 - page {n}" for n in range(1, 19)])
+        self.assertEqual(parse_pdf(SAMPLE_PDF), "".join(p + "\n" for p in pages))
+
+    def test_process_pool_matches_sequential(self):
+        sequential = list(iter_pdf_pages(SAMPLE_PDF))
+        self.assertEqual(list(iter_pdf_pages(SAMPLE_PDF, workers=3)), sequential)
+        self.assertEqual(dict(parse_pdfs([SAMPLE_PDF, SAMPLE_PDF], workers=2)), {SAMPLE_PDF: parse_pdf(SAMPLE_PDF)})
+
+    def test_missing_file(self):
+        self.assertEqual(parse_pdf("/nonexistent.pdf"), "")
+
+class TestParseStream(unittest.TestCase):
+    def test_stream_matches_joined_parse(self):
+        parser = RegexParser()
+        joined = parser.parse("\n".join(NOTICE_PAGES))
+        streamed = parser.parse_stream(iter(NOTICE_PAGES))
+        for key in ("dates", "amounts", "areas"):
+            self.assertEqual(streamed[key], joined[key])
+        self.assertEqual(streamed["keywords"]["qualifications"], joined["keywords"]["qualifications"])
+        self.assertEqual(streamed["keywords"]["income"], joined["keywords"]["income"])
+        self.assertEqual(sorted(streamed["keywords"]["assets"]), sorted(joined["keywords"]["assets"]))
+
+    def test_sections_from_pdf_pages(self):
+        self.assertEqual(
+            extract_sections_from_pages(iter_pdf_pages(SAMPLE_PDF)),
+            extract_sections(parse_pdf(SAMPLE_PDF)),
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import re
+import time
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_parser import RegexParser
+
+RENT_TABLE = """
+2. 임대조건
+주택형 전용면적(㎡) 임대보증금(원) 월임대료(원)
+16A 16.5㎡ 12,000,000 150,000
+26B형 26.9㎡ 1억 2000만원 230,000원
+- 59 59.8㎡ 2억 4,000만원 410,000원
+
+* 전환보증금 최대 50% 가능
+"""
+
+def unit(unit_type, area, deposit, rent):
+    return {"unit_type": unit_type, "area": area, "deposit": deposit, "rent": rent}
+
+class TestCompoundAmounts(unittest.TestCase):
+    def setUp(self):
+        self.parser = RegexParser()
+
+    def test_merged(self):
+        amounts = self.parser.extract_amounts("1억 2000만원, 1억2천만원, 3억 4,500 이하, 2억 350,000원")
+        self.assertEqual(amounts, [
+            ("1억 2000만원", 120000000.0), ("1억 2천만원", 120000000.0),
+            ("3억 4,500", 345000000.0), ("2억 350,000원", 200350000.0),
+        ])
+
+    def test_not_merged(self):
+        amounts = self.parser.extract_amounts("1억 2026.03.01, 1억 50%, 1억 20000만원")
+        self.assertEqual([v for _, v in amounts], [100000000.0, 100000000.0, 100000000.0, 200000000.0])
+
+    def test_units_are_not_given_back(self):
+        # The tail's number and units are taken whole; dropping "만" or "원" to get past
+        # the check after them would misread the amount
+        amounts = self.parser.extract_amounts("1억 2000만 평, 1억 5000만원억")
+        self.assertEqual([v for _, v in amounts], [100000000.0, 20000000.0, 100000000.0, 50000000.0])
+
+    def test_patterns_compile_on_python_310(self):
+        # Possessive quantifiers and atomic groups need Python 3.11; the scraper runs 3.10
+        patterns = [v.pattern for v in vars(self.parser).values() if isinstance(v, re.Pattern)]
+        self.assertGreater(len(patterns), 10)
+        for pattern in patterns:
+            self.assertNotRegex(pattern, r"(?<!\\)[*+?}]\+|\(\?>", pattern)
+
+    def test_line_break_only_when_joined(self):
+        text = "보증금 1억\n2000만원"
+        self.assertEqual([v for _, v in self.parser.extract_amounts(text)], [100000000.0, 20000000.0])
+        self.assertEqual([v for _, v in self.parser.parse(text)["amounts"]], [120000000.0])
+
+class TestExtractUnits(unittest.TestCase):
+    def setUp(self):
+        self.parser = RegexParser()
+
+    def test_labelled_lines(self):
+        text = "2. 임대조건\n- 보증금: 1,000만원\n- 월임대료: 150,000원\n- 전환보증금 최대 50% 가능 (이율 6.0%)"
+        self.assertEqual(self.parser.extract_units(text), [unit(None, None, 10000000.0, 150000.0)])
+
+    def test_unit_types_in_prose(self):
+        text = (
+            "- 공급형 A 전용면적 29m2 보증금: 1,000만원 월임대료: 150,000원\n"
+            "26A형: 전용면적 26.5㎡, 보증금 1억 2000만원, 월임대료 35만원, 관리비 5만원\n"
+            "36B형: 전용면적 36㎡\n보증금 1억 5000만원 월임대료 45만원"
+        )
+        self.assertEqual(self.parser.extract_units(text), [
+            unit("A", 29.0, 10000000.0, 150000.0),
+            unit("26A", 26.5, 120000000.0, 350000.0),
+            unit("36B", 36.0, 150000000.0, 450000.0),
+        ])
+
+    def test_table(self):
+        self.assertEqual(self.parser.extract_units(RENT_TABLE), [
+            unit("16A", 16.5, 12000000.0, 150000.0),
+            unit("26B", 26.9, 120000000.0, 230000.0),
+            unit("59", 59.8, 240000000.0, 410000.0),
+        ])
+
+    def test_no_rent_table(self):
+        self.assertEqual(self.parser.extract_units("공고일 2026-02-01, 총자산 3억 4,500만원 이하"), [])
+        self.assertEqual(self.parser.extract_units(""), [])
+
+    def test_linear_time(self):
+        small, large = RENT_TABLE * 200, RENT_TABLE * 1600
+        started = time.perf_counter()
+        self.assertEqual(len(self.parser.extract_units(small)), 600)
+        t_small = time.perf_counter() - started
+        started = time.perf_counter()
+        self.assertEqual(len(self.parser.extract_units(large)), 4800)
+        t_large = time.perf_counter() - started
+        # 8x the text; generous bound against timer noise, far below quadratic (64x)
+        self.assertLess(t_large, t_small * 20)
+
+if __name__ == '__main__':
+    unittest.main()